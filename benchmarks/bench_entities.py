@@ -0,0 +1,128 @@
+"""
+Ciclo de spawn/despawn das entidades em regime (partida longa): criar um objeto
+por spawn e descartá-lo ao sair da tela (antes) contra acquire/release num
+EntityPool com classes de __slots__ (depois).
+
+Para cada tipo (fruta do Fruit Ninja, obstáculo da Esquiva Facial) roda
+`--frames` passos com `--burst` spawns por passo e vida fixa de `--lifetime`
+passos, como no jogo: sempre ~burst*lifetime entidades vivas. Mede o tempo por
+passo, quantas entidades foram criadas (no pool, depois do aquecimento: o
+esperado é 0), o pico em uso e as coletas do GC com o tempo parado nelas
+(gc.callbacks). No CPython a contagem de geração 0 desconta cada objeto
+liberado pela contagem de referências, então só o ciclo de spawn quase não
+dispara coletas; o que ele soma é alocação (e __dict__) que, no jogo, se
+mistura à dos frames e das listas de cada passo.
+
+Uso: python -m benchmarks.bench_entities [--frames 20000] [--burst 2] [--lifetime 60]
+"""
+import argparse
+import gc
+import random
+import time
+
+from benchmarks.harness import ensure_qt_app
+
+class GCWatch:
+    """Conta coletas do GC por geração e soma o tempo parado nelas."""
+
+    def __init__(self):
+        self.collections = [0, 0, 0]
+        self.pause_s = 0.0
+        self._started = None
+
+    def __call__(self, phase, info):
+        if phase == "start":
+            self._started = time.perf_counter()
+        elif self._started is not None:
+            self.pause_s += time.perf_counter() - self._started
+            self.collections[info["generation"]] += 1
+            self._started = None
+
+    def __enter__(self):
+        gc.collect()
+        gc.callbacks.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self)
+
+def _kinds():
+    from game_objects import FallingObject
+    from game_objects_face import Obstacle
+
+    settings = {"min_vy": -12, "max_vy": -9}
+    fruit = "assets/ninja-game/apple.png"
+    # Subclasses sem __slots__ ganham __dict__ de novo: o objeto por spawn de antes
+    legacy_fruit = type("LegacyFallingObject", (FallingObject,), {})
+    legacy_obstacle = type("LegacyObstacle", (Obstacle,), {})
+    return {
+        "fruta": (FallingObject, legacy_fruit, (fruit, settings)),
+        "obstaculo": (Obstacle, legacy_obstacle, (1400, 900, None)),
+    }
+
+def run_cycle(make, release, frames, burst, lifetime):
+    """`frames` passos: cada um cria `burst` entidades e descarta as que já viveram `lifetime` passos."""
+    alive = []
+    born = []
+    with GCWatch() as watch:
+        started = time.perf_counter()
+        for frame in range(frames):
+            for _ in range(burst):
+                alive.append(make())
+                born.append(frame)
+            kept = 0
+            for entity, birth in zip(alive, born):
+                if frame - birth >= lifetime:
+                    release(entity)
+                    continue
+                alive[kept] = entity
+                born[kept] = birth
+                kept += 1
+            del alive[kept:]
+            del born[kept:]
+        elapsed = time.perf_counter() - started
+    for entity in alive:
+        release(entity)
+    return {
+        "us_per_frame": round(elapsed / frames * 1e6, 3),
+        "gc_collections": watch.collections,
+        "gc_pause_ms": round(watch.pause_s * 1000.0, 3),
+    }
+
+def run(frames=20000, burst=2, lifetime=60):
+    from entity_pool import EntityPool
+
+    ensure_qt_app()
+    results = {}
+    for name, (cls, legacy_cls, args) in _kinds().items():
+        random.seed(0)
+        before = run_cycle(lambda: legacy_cls(*args), lambda entity: None, frames, burst, lifetime)
+        before["created"] = frames * burst
+
+        random.seed(0)
+        pool = EntityPool(cls)
+        # Aquecimento: um ciclo curto até o pico de entidades vivas
+        run_cycle(lambda: pool.acquire(*args), pool.release, lifetime + 1, burst, lifetime)
+        warm = pool.allocated
+        after = run_cycle(lambda: pool.acquire(*args), pool.release, frames, burst, lifetime)
+        after["created"] = pool.allocated - warm
+        after["high_water"] = pool.high_water
+        results[name] = {"antes": before, "depois": after}
+    return results
+
+def print_entities(results):
+    print("\nSpawn/despawn em regime: objeto novo por spawn -> EntityPool")
+    for name, runs in results.items():
+        before, after = runs["antes"], runs["depois"]
+        print(f"  {name:<10} {before['us_per_frame']:8.2f} -> {after['us_per_frame']:8.2f} µs/passo   "
+              f"entidades criadas {before['created']:6d} -> {after['created']:d} (pico {after['high_water']})   "
+              f"GC {sum(before['gc_collections']):5d} -> {sum(after['gc_collections']):5d} coletas "
+              f"({before['gc_pause_ms']:.2f} -> {after['gc_pause_ms']:.2f} ms parado)")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_entities")
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--burst", type=int, default=2)
+    parser.add_argument("--lifetime", type=int, default=60)
+    args = parser.parse_args()
+    print_entities(run(args.frames, args.burst, args.lifetime))
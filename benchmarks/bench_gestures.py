@@ -0,0 +1,80 @@
+"""
+Classificação de gestos por frame: detectar_gesto lendo atributo por atributo
+dos protobufs (uma mão por vez) contra a conversão única para array +
+classificar_gestos em lote. Antes de medir, confere que os dois dão o mesmo
+gesto para todas as mãos.
+
+Uso: python -m benchmarks.bench_gestures [diretório de uma gravação de mãos]
+Sem gravação, usa mãos sintéticas.
+"""
+import sys
+
+import numpy as np
+
+from benchmarks.harness import measure, print_results
+
+def _recorded_hands(path):
+    from session_recording import ReplayCamera
+    replay = ReplayCamera(path, speed="max")
+    if replay.kind != "hand":
+        raise ValueError(f"'{path}' não é uma gravação de mãos.")
+    counts = replay.index["count"]
+    frames = [np.array(replay.landmarks[i, :counts[i]]) for i in range(len(counts)) if counts[i]]
+    replay.release()
+    return frames
+
+def _synthetic_hands(rng, frames=500, hands=2):
+    points = rng.uniform(0.0, 1.0, (frames, hands, 21, 3)).astype(np.float32)
+    # Parte das mãos com os dedos fechados, para cair em Pedra/Joinha
+    points[::3, :, [8, 12, 16, 20], 1] = points[::3, :, [6, 10, 14, 18], 1] + 0.05
+    return list(points)
+
+def check_equivalence(frames):
+    """Confere classificar_gestos contra detectar_gesto em todas as mãos; retorna quantas foram comparadas."""
+    from game_logic import classificar_gestos, detectar_gesto
+    from landmarks import array_to_landmark_lists
+
+    compared = 0
+    for points in frames:
+        expected = [detectar_gesto(hand) for hand in array_to_landmark_lists(points)]
+        got = classificar_gestos(points)
+        if expected != got:
+            raise AssertionError(f"Gestos diferentes: {expected} != {got}")
+        compared += len(points)
+    return compared
+
+def run(frames=None, repeat=500):
+    from game_logic import classificar_gestos, detectar_gesto
+    from landmarks import LandmarkResults, array_to_landmark_lists, hand_arrays
+
+    if frames is None:
+        frames = _synthetic_hands(np.random.default_rng(0))
+    compared = check_equivalence(frames)
+    print(f"{compared} mãos comparadas: classificar_gestos == detectar_gesto")
+
+    # Um frame com o maior número de mãos, no formato que o MediaPipe entrega
+    points = max(frames, key=len)
+    results = LandmarkResults(multi_hand_landmarks=array_to_landmark_lists(points))
+
+    def per_attribute():
+        return [detectar_gesto(hand) for hand in results.multi_hand_landmarks]
+
+    def batched():
+        hands, _handedness = hand_arrays(results)
+        return classificar_gestos(hands)
+
+    # Todas as mãos de uma vez (ex.: reclassificar uma gravação inteira)
+    everything = np.concatenate(frames)
+    all_hands = array_to_landmark_lists(everything)
+
+    return {
+        f"frame  antes  detectar_gesto x{len(points)}": measure(per_attribute, repeat),
+        "frame  depois hand_arrays + classificar_gestos": measure(batched, repeat),
+        "frame  depois só classificar_gestos": measure(lambda: classificar_gestos(points), repeat),
+        f"lote   antes  detectar_gesto x{len(everything)}": measure(lambda: [detectar_gesto(h) for h in all_hands], 20),
+        f"lote   depois classificar_gestos x{len(everything)}": measure(lambda: classificar_gestos(everything), 20),
+    }
+
+if __name__ == "__main__":
+    recorded = _recorded_hands(sys.argv[1]) if len(sys.argv) > 1 else None
+    print_results("Classificação de gestos (por frame)", run(recorded))
@@ -0,0 +1,118 @@
+"""
+CPU do processo por tela, com e sem o governador de inferência
+(VISION_GAMES_GOVERNOR=0 = câmera + modelo em taxa máxima o tempo todo, como antes).
+
+Cada jogo roda de verdade (plataforma offscreen, fonte sintética por padrão) e
+passa `--seconds` em cada tela: início, partida e fim de jogo. No
+Pedra-Papel-Tesoura a "partida" é a espera pelo 👍 (detector em taxa baixa).
+
+Cada jogo roda num processo próprio, para não herdar threads, modelos e
+imports de quem foi medido antes.
+
+Uso: python -m benchmarks.bench_idle [--seconds 3] [--source synthetic] [jogos...]
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.harness import ensure_qt_app
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# jogo -> (cria a janela, [(tela/fase, ação que leva até ela)])
+SCENARIOS = {
+    "ninja_game": (lambda m: m.MainWindow(), [
+        ("inicio", lambda w: None),
+        # Frenesi: sem vidas a perder, a partida não acaba sozinha sem mãos na câmera
+        ("jogo", lambda w: w.start_game(True)),
+        ("fim", lambda w: w.game_widget.end_game()),
+    ]),
+    "face_game": (lambda m: m.MainWindow(), [
+        ("inicio", lambda w: None),
+        ("jogo", lambda w: w.start_game_mode(1)),
+        ("fim", lambda w: w.game_widget.end_game()),
+    ]),
+    "rps_game": (lambda m: m.RPSGame(), [
+        ("inicio", lambda w: None),
+        ("aguardando_joinha", lambda w: w._start_game()),
+        ("fim", lambda w: w._end_match()),
+    ]),
+}
+
+def _wait(seconds):
+    from PySide6.QtCore import QEventLoop, QTimer
+    loop = QEventLoop()
+    QTimer.singleShot(int(seconds * 1000), loop.quit)
+    loop.exec()
+
+def measure_screens(game, seconds=3.0, governor=True, timeout=30.0):
+    """{tela: % de CPU (um núcleo)} passando `seconds` em cada tela do cenário do jogo."""
+    os.environ["VISION_GAMES_GOVERNOR"] = "1" if governor else "0"
+    make_window, steps = SCENARIOS[game]
+    window = make_window(importlib.import_module(game))
+    window.show()
+
+    # Espera câmera + modelo (e a primeira inferência) antes de medir
+    deadline = time.monotonic() + timeout
+    while window.governor.camera is None:
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{game}: a câmera não ficou pronta")
+        _wait(0.05)
+
+    results = {}
+    for name, action in steps:
+        action(window)
+        before = window.governor.report().get(name, {"seconds": 0.0, "cpu_seconds": 0.0})
+        _wait(seconds)
+        after = window.governor.report()[name]
+        elapsed = after["seconds"] - before["seconds"]
+        results[name] = 100.0 * (after["cpu_seconds"] - before["cpu_seconds"]) / elapsed
+    window.close()
+    # Destrói a janela (e a câmera) antes da próxima, em vez de deixar para o fim do interpretador
+    window.deleteLater()
+    _wait(0.1)
+    return results
+
+def measure_game(game, seconds=3.0, source="synthetic"):
+    """Sem e com o governador, no processo atual."""
+    os.chdir(ROOT)
+    os.environ["VISION_GAMES_SOURCE"] = source
+    os.environ["VISION_GAMES_LEADERBOARD"] = os.path.join(tempfile.mkdtemp(), "leaderboard.db")
+    ensure_qt_app()
+    return {"antes": measure_screens(game, seconds, governor=False),
+            "depois": measure_screens(game, seconds, governor=True)}
+
+def run(games=tuple(SCENARIOS), seconds=3.0, source="synthetic"):
+    results = {}
+    for game in games:
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_idle", "--json", "--seconds", str(seconds), "--source", source, game],
+            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True).stdout
+        line = next((l for l in output.splitlines() if l.startswith("{")), None)
+        if line is None:
+            raise RuntimeError(f"{game}: a medição não terminou")
+        results[game] = json.loads(line)
+    return results
+
+def print_idle(results):
+    print("\nCPU do processo por tela (% de um núcleo): sem governador -> com governador")
+    for game, runs in results.items():
+        for name, before in runs["antes"].items():
+            print(f"  {game:<11} {name:<18} {before:6.1f}% -> {runs['depois'][name]:6.1f}%")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_idle")
+    parser.add_argument("games", nargs="*", default=list(SCENARIOS))
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--source", default="synthetic")
+    parser.add_argument("--json", action="store_true", help="mede um jogo neste processo e imprime JSON")
+    args = parser.parse_args()
+    if args.json:
+        print(json.dumps(measure_game(args.games[0], args.seconds, args.source)), flush=True)
+    else:
+        print_idle(run(args.games, args.seconds, args.source))
@@ -0,0 +1,55 @@
+"""
+Tempo por frame do desenho dos landmarks: mp_drawing.draw_landmarks (como o
+face_game e o RPS faziam) contra o LandmarkOverlay em cada nível de detalhe.
+Uso: python -m benchmarks.bench_overlay
+"""
+import numpy as np
+
+from benchmarks.harness import measure, print_results
+
+def legacy_face(image, faces):
+    """Reprodução do antigo desenho do FaceGameWidget.update_game_state."""
+    import mediapipe as mp
+    mp_drawing = mp.solutions.drawing_utils
+    face_mesh = mp.solutions.face_mesh
+    contour = mp_drawing.DrawingSpec(color=(255, 255, 255), thickness=1, circle_radius=1)
+    tesselation = mp_drawing.DrawingSpec(color=(220, 220, 220), thickness=1, circle_radius=1)
+    iris = mp_drawing.DrawingSpec(color=(255, 255, 255), thickness=1, circle_radius=1)
+    for face in faces:
+        mp_drawing.draw_landmarks(image, face, face_mesh.FACEMESH_TESSELATION, None, tesselation)
+        mp_drawing.draw_landmarks(image, face, face_mesh.FACEMESH_CONTOURS, None, contour)
+        mp_drawing.draw_landmarks(image, face, face_mesh.FACEMESH_IRISES, None, iris)
+
+def legacy_hands(image, hands):
+    """Reprodução do antigo desenho do RPSGame._update_camera_feed."""
+    import mediapipe as mp
+    for hand in hands:
+        mp.solutions.drawing_utils.draw_landmarks(image, hand, mp.solutions.hands.HAND_CONNECTIONS)
+
+def _fake_landmarks(rng, count, num_landmarks):
+    from landmarks import array_to_landmark_lists
+    points = rng.uniform(0.2, 0.8, (count, num_landmarks, 3)).astype(np.float32)
+    return array_to_landmark_lists(points)
+
+def run(frame_shape=(480, 640, 3), repeat=200):
+    from landmark_overlay import LEVELS_OF_DETAIL, face_mesh_overlay, hand_overlay
+
+    rng = np.random.default_rng(0)
+    image = np.zeros(frame_shape, dtype=np.uint8)
+    faces = _fake_landmarks(rng, 2, 478)
+    hands = _fake_landmarks(rng, 2, 21)
+
+    results = {
+        "rosto antes (mp_drawing)": measure(lambda: legacy_face(image, faces), repeat),
+    }
+    for lod in LEVELS_OF_DETAIL:
+        overlay = face_mesh_overlay(lod)
+        results[f"rosto depois ({lod})"] = measure(lambda: overlay.draw(image, faces), repeat)
+    results["mãos antes (mp_drawing)"] = measure(lambda: legacy_hands(image, hands), repeat)
+    for lod in LEVELS_OF_DETAIL:
+        overlay = hand_overlay(lod)
+        results[f"mãos depois ({lod})"] = measure(lambda: overlay.draw(image, hands), repeat)
+    return results
+
+if __name__ == "__main__":
+    print_results("Desenho dos landmarks, 2 rostos / 2 mãos (por frame)", run())
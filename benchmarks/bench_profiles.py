@@ -0,0 +1,164 @@
+"""
+Latência e qualidade dos perfis de inferência (inference_profiles.py).
+
+Lê `--frames` frames de uma fonte (qualquer spec de VISION_GAMES_SOURCE: vídeo,
+pasta de imagens, webcam; de preferência uma gravação com as mãos/rostos reais
+dos jogos), prepara cada um como as câmeras (espelho + RGB) e roda todos os
+perfis de um tipo sobre a mesma sequência, em modo de rastreamento como no jogo.
+O perfil completo do tipo ("hand-full"/"face-full", a configuração de antes) é a
+referência de qualidade; para cada perfil:
+
+    p50/p95 ms       tempo de process() por frame
+    deteccao         % das mãos/rostos da referência que o perfil também achou
+    erro             distância média (e p95) nos pontos que o jogo lê
+                     (profile.landmarks), em % do tamanho da mão/rosto
+    gestos           (mãos) % das mãos casadas com o mesmo gesto de classificar_gestos
+
+As detecções do perfil e da referência são casadas pela menor distância total
+(face_tracker.hungarian). O "mais barato que joga bem" é o de menor p50 com
+deteccao >= --min-detection e erro p95 <= --max-error.
+
+Uso: python -m benchmarks.bench_profiles FONTE [--frames 150] [--kind hand|face] [--json] [perfis...]
+Com a fonte sintética não há mãos nem rostos: só a latência do detector vale.
+"""
+import argparse
+import json
+import time
+
+import cv2
+import numpy as np
+
+REFERENCE = {"hand": "hand-full", "face": "face-full"}
+
+def load_frames(spec, count):
+    from frame_sources import open_frame_source
+
+    source = open_frame_source(spec, pacing="max", loop=True)
+    frames = []
+    try:
+        while len(frames) < count:
+            ok, frame = source.read()
+            if not ok:
+                break
+            frames.append(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+    finally:
+        source.release()
+    if not frames:
+        raise RuntimeError(f"Nenhum frame lido de '{spec}'.")
+    return frames
+
+def run_profile(profile, frames):
+    """(ms por frame, [array (detecções, pontos, 3) por frame]) no modo de rastreamento."""
+    from landmarks import landmarks_to_array
+
+    model = profile.create_model()
+    attribute = "multi_hand_landmarks" if profile.kind == "hand" else "multi_face_landmarks"
+    times, detections = [], []
+    try:
+        for frame in frames:
+            started = time.perf_counter()
+            results = model.process(frame)
+            times.append((time.perf_counter() - started) * 1000.0)
+            detections.append(landmarks_to_array(getattr(results, attribute) or [], profile.num_landmarks))
+    finally:
+        model.close()
+    return np.array(times), detections
+
+def compare(profile, detections, reference):
+    """Detecção, erro nos pontos do jogo e (mãos) gestos iguais, contra a referência."""
+    from face_tracker import hungarian
+    from game_logic import classificar_gestos
+
+    indices = profile.landmark_indices()
+    expected = found = same_gesture = 0
+    errors = []
+    for points, ref_points in zip(detections, reference):
+        expected += len(ref_points)
+        if not len(points) or not len(ref_points):
+            continue
+        ours, theirs = points[:, indices, :2], ref_points[:, indices, :2]
+        cost = np.linalg.norm(ours.mean(axis=1)[:, None] - theirs.mean(axis=1)[None], axis=2)
+        rows, cols = hungarian(cost)
+        found += len(rows)
+        for row, col in zip(rows.tolist(), cols.tolist()):
+            # Tamanho da detecção de referência: diagonal da caixa de todos os pontos
+            ref_xy = ref_points[col, :, :2]
+            size = float(np.linalg.norm(ref_xy.max(axis=0) - ref_xy.min(axis=0))) or 1.0
+            errors.extend((np.linalg.norm(ours[row] - theirs[col], axis=1) / size).tolist())
+            if profile.kind == "hand":
+                same_gesture += classificar_gestos(points[row:row + 1]) == classificar_gestos(ref_points[col:col + 1])
+    errors = np.array(errors) * 100.0
+    quality = {
+        "detection_percent": round(100.0 * found / expected, 1) if expected else None,
+        "error_mean_percent": round(float(errors.mean()), 2) if len(errors) else None,
+        "error_p95_percent": round(float(np.percentile(errors, 95)), 2) if len(errors) else None,
+    }
+    if profile.kind == "hand":
+        quality["gesture_percent"] = round(100.0 * same_gesture / found, 1) if found else None
+    return quality
+
+def run(spec, frame_count=150, kind=None, names=None):
+    from inference_profiles import PROFILES
+
+    frames = load_frames(spec, frame_count)
+    selected = [PROFILES[name] for name in names] if names else list(PROFILES.values())
+    results = {}
+    for profile_kind in ("hand", "face"):
+        profiles = [p for p in selected if p.kind == profile_kind and kind in (None, profile_kind)]
+        if not profiles:
+            continue
+        reference = PROFILES[REFERENCE[profile_kind]]
+        _times, reference_detections = run_profile(reference, frames)
+        for profile in profiles:
+            times, detections = run_profile(profile, frames)
+            results[profile.name] = {
+                "kind": profile_kind,
+                "options": profile.describe(),
+                "frames": len(frames),
+                "p50_ms": round(float(np.percentile(times, 50)), 3),
+                "p95_ms": round(float(np.percentile(times, 95)), 3),
+                **compare(profile, detections, reference_detections),
+            }
+    return results
+
+def cheapest_playable(results, min_detection=95.0, max_error=5.0):
+    """{tipo: nome do perfil de menor p50 que passa nos limites de qualidade}."""
+    best = {}
+    for name, result in sorted(results.items(), key=lambda item: item[1]["p50_ms"]):
+        detection, error = result["detection_percent"], result["error_p95_percent"]
+        if detection is None or detection < min_detection or (error is not None and error > max_error):
+            continue
+        best.setdefault(result["kind"], name)
+    return best
+
+def _fmt(value, suffix="%"):
+    return "   -  " if value is None else f"{value:5.1f}{suffix}"
+
+def print_profiles(results, min_detection=95.0, max_error=5.0):
+    print("\nPerfis de inferência (qualidade contra hand-full/face-full)")
+    for name, r in results.items():
+        gestures = f"  gestos {_fmt(r['gesture_percent'])}" if "gesture_percent" in r else ""
+        print(f"  {name:<11} p50 {r['p50_ms']:7.2f} ms  p95 {r['p95_ms']:7.2f} ms  "
+              f"detecção {_fmt(r['detection_percent'])}  erro {_fmt(r['error_mean_percent'])} "
+              f"(p95 {_fmt(r['error_p95_percent'])}){gestures}")
+    best = cheapest_playable(results, min_detection, max_error)
+    for kind, name in best.items():
+        print(f"  Mais barato que joga bem ({kind}): {name}")
+    if not best:
+        print("  Nenhuma detecção na referência: a fonte não tem mãos/rostos.")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_profiles")
+    parser.add_argument("source", help="spec de fonte (vídeo, pasta de imagens, webcam, synthetic...)")
+    parser.add_argument("profiles", nargs="*")
+    parser.add_argument("--frames", type=int, default=150)
+    parser.add_argument("--kind", choices=("hand", "face"))
+    parser.add_argument("--min-detection", type=float, default=95.0)
+    parser.add_argument("--max-error", type=float, default=5.0)
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+    results = run(args.source, args.frames, args.kind, args.profiles)
+    if args.json:
+        print(json.dumps(results))
+    else:
+        print_profiles(results, args.min_detection, args.max_error)
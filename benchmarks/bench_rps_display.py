@@ -0,0 +1,70 @@
+"""
+Tempo por frame do caminho de exibição da câmera no RPS: o caminho antigo
+(QPixmap + scaled(Smooth) + pixmap arredondado novo a cada frame) contra o
+RoundedFrameView. Uso: python -m benchmarks.bench_rps_display
+"""
+import numpy as np
+
+from benchmarks.harness import ensure_qt_app, measure, print_results
+
+def legacy_display(label, frame, countdown_value=3, radius=27):
+    """Reprodução do antigo RPSGame._update_camera_feed (parte de exibição)."""
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QColor, QFont, QImage, QPainter, QPixmap
+
+    h, w, ch = frame.shape
+    pixmap = QPixmap.fromImage(QImage(frame.data, w, h, ch * w, QImage.Format_RGB888))
+    if countdown_value > 0:
+        painter = QPainter(pixmap)
+        painter.setFont(QFont("Arial", 150, QFont.Bold))
+        painter.setPen(QColor(255, 255, 0, 200))
+        painter.drawText(pixmap.rect(), Qt.AlignCenter, str(countdown_value))
+        painter.end()
+    scaled = pixmap.scaled(label.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+    label.setPixmap(legacy_rounded_pixmap(scaled, radius))
+    label.repaint()
+
+def legacy_rounded_pixmap(pixmap, radius=27):
+    """Reprodução do antigo RPSGame._create_rounded_pixmap."""
+    from PySide6.QtCore import Qt
+    from PySide6.QtGui import QBrush, QPainter, QPainterPath, QPixmap
+
+    rounded = QPixmap(pixmap.size())
+    rounded.fill(Qt.transparent)
+    painter = QPainter(rounded)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(QBrush(pixmap))
+    path = QPainterPath()
+    path.addRoundedRect(rounded.rect(), radius, radius)
+    painter.drawPath(path)
+    painter.end()
+    return rounded
+
+def run(label_size=(760, 520), frame_shapes=((480, 640, 3), (720, 1280, 3)), repeat=200):
+    ensure_qt_app()
+    from PySide6.QtWidgets import QLabel
+    from frame_view import RoundedFrameView
+
+    old_label = QLabel()
+    old_label.resize(*label_size)
+    view = RoundedFrameView(radius=27)
+    view.resize(*label_size)
+    view.overlay_text = "3"
+
+    def new_display(frame):
+        view.show_frame(frame)
+        # Inclui o custo de pintura (drawImage + texto), que antes era feito no pixmap
+        view.repaint()
+
+    results = {}
+    rng = np.random.default_rng(0)
+    for shape in frame_shapes:
+        frame = rng.integers(0, 255, shape, dtype=np.uint8)
+        tag = f"{shape[1]}x{shape[0]}"
+        results[f"antes  {tag}"] = measure(lambda: legacy_display(old_label, frame), repeat)
+        results[f"depois {tag}"] = measure(lambda: new_display(frame), repeat)
+    return results
+
+if __name__ == "__main__":
+    print_results("Exibição da câmera no RPS (por frame)", run())
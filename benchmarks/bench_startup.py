@@ -0,0 +1,68 @@
+"""
+Tempo de inicialização de cada jogo, medido de fora: o processo é criado com
+VISION_GAMES_STARTUP_REPORT=1 e imprime o time.monotonic() (relógio comum a
+todos os processos) de cada marco. Reporta, a partir da criação do processo:
+  primeira janela   - primeira volta do laço de eventos, com a tela inicial na tela
+  câmera pronta     - câmera aberta + modelo construído + inferência de aquecimento
+  1ª inferência     - primeiro frame real processado
+
+Uso: python -m benchmarks.bench_startup [--runs 3] [--source synthetic] [jogos...]
+Sem display, usa a plataforma offscreen do Qt; sem webcam, a fonte sintética.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GAMES = ("ninja_game", "face_game", "rps_game")
+MARKS = (("first_window", "primeira janela"), ("camera_ready", "câmera pronta"), ("first_inference", "1ª inferência"))
+PREFIX = "Inicialização: "
+
+def measure_startup(game, source="synthetic", timeout=60.0):
+    """Roda o jogo uma vez e retorna {marco: segundos desde a criação do processo}."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, VISION_GAMES_STARTUP_REPORT="1", VISION_GAMES_SOURCE=source,
+                   VISION_GAMES_LEADERBOARD=os.path.join(tmp, "leaderboard.db"))
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        started = time.monotonic()
+        process = subprocess.Popen([sys.executable, f"{game}.py"], cwd=ROOT, env=env,
+                                   stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+        try:
+            deadline = started + timeout
+            for line in process.stdout:
+                if line.startswith(PREFIX):
+                    marks = json.loads(line[len(PREFIX):])
+                    return {name: marks[name] - started for name, _label in MARKS if name in marks}
+                if time.monotonic() > deadline:
+                    break
+            raise RuntimeError(f"{game} não reportou a inicialização")
+        finally:
+            process.kill()
+            process.wait()
+
+def run(games=GAMES, runs=3, source="synthetic"):
+    results = {}
+    for game in games:
+        samples = [measure_startup(game, source) for _ in range(runs)]
+        results[game] = {name: [s[name] for s in samples] for name, _label in MARKS}
+    return results
+
+def print_startup(results):
+    print("\nInicialização (segundos desde a criação do processo; média e mínimo)")
+    for game, marks in results.items():
+        parts = [f"{label} {statistics.fmean(values):6.2f} / {min(values):5.2f}" for (name, label) in MARKS
+                 for values in [marks[name]]]
+        print(f"  {game:<11}  " + "   ".join(parts))
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.bench_startup")
+    parser.add_argument("games", nargs="*", default=list(GAMES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--source", default="synthetic")
+    args = parser.parse_args()
+    print_startup(run(args.games, args.runs, args.source))
@@ -0,0 +1,33 @@
+import os
+import statistics
+import time
+
+def ensure_qt_app():
+    """Cria (uma vez) um QApplication; sem display, usa a plataforma offscreen do Qt."""
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
+
+def measure(fn, repeat=200, warmup=10):
+    """Executa `fn` várias vezes e retorna estatísticas do tempo por chamada em milissegundos."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000.0)
+    samples.sort()
+    return {
+        "mean_ms": statistics.fmean(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "min_ms": samples[0],
+        "repeat": repeat,
+    }
+
+def print_results(title, results):
+    print(f"\n{title}")
+    width = max(len(name) for name in results)
+    for name, stats in results.items():
+        print(f"  {name:<{width}}  média {stats['mean_ms']:8.3f} ms   p50 {stats['p50_ms']:8.3f} ms   p95 {stats['p95_ms']:8.3f} ms")
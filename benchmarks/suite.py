@@ -0,0 +1,331 @@
+"""
+Suíte de microbenchmarks dos caminhos quentes dos jogos, com baselines em JSON.
+
+Roda sem câmera e sem display: landmarks sintéticos, frames NumPy e a
+plataforma offscreen do Qt. Cada benchmark registrado com @benchmark devolve
+{caso: estatísticas de harness.measure}; os casos são identificados como
+"benchmark/caso" nos arquivos de baseline.
+
+Uso:
+    python -m benchmarks.suite list
+    python -m benchmarks.suite run [nomes...] [--quick]
+    python -m benchmarks.suite save [nomes...] [--baseline ARQUIVO] [--quick]
+    python -m benchmarks.suite compare [nomes...] [--baseline ARQUIVO] [--threshold 0.25]
+
+`compare` mede de novo e marca como regressão todo caso cujo p50 ficou mais de
+`threshold` (fração) acima do baseline; nesse caso sai com código 1.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.harness import ensure_qt_app, measure, print_results
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(ROOT, "benchmarks", "baselines")
+DEFAULT_BASELINE = os.path.join(BASELINE_DIR, "reference.json")
+DEFAULT_THRESHOLD = 0.25
+# Casos muito rápidos oscilam mais que a tolerância só com ruído do sistema
+MIN_DELTA_MS = 0.002
+
+BENCHMARKS = {}
+
+def benchmark(name):
+    """Registra uma função `fn(scale)` na suíte; `scale` reduz as repetições no modo --quick."""
+    def register(fn):
+        BENCHMARKS[name] = fn
+        return fn
+    return register
+
+def _repeat(base, scale):
+    return max(5, int(base * scale))
+
+@benchmark("gestos")
+def bench_detectar_gesto(scale):
+    from benchmarks.bench_gestures import _synthetic_hands
+    from game_logic import classificar_gestos, detectar_gesto
+    from landmarks import array_to_landmark_lists
+
+    points = _synthetic_hands(np.random.default_rng(0), frames=1, hands=2)[0]
+    hands = array_to_landmark_lists(points)
+    return {
+        "detectar_gesto x2": measure(lambda: [detectar_gesto(hand) for hand in hands], _repeat(2000, scale)),
+        "classificar_gestos x2": measure(lambda: classificar_gestos(points), _repeat(2000, scale)),
+    }
+
+@benchmark("rodada")
+def bench_rodada(scale, calls=1000):
+    from game_logic import GameLogic, decidir_vencedor
+
+    rng = np.random.default_rng(0)
+    choices = ("Pedra", "Papel", "Tesoura")
+    pairs = [(choices[a], choices[b]) for a, b in rng.integers(0, 3, (calls, 2))]
+    logic = GameLogic()
+
+    def play_rounds():
+        for player, _computer in pairs:
+            logic.play_round(player)
+        logic.reset_scores()
+
+    # Cada amostra são `calls` chamadas: uma só fica abaixo da resolução do relógio
+    return {
+        f"decidir_vencedor x{calls}": measure(lambda: [decidir_vencedor(a, b) for a, b in pairs], _repeat(300, scale)),
+        f"GameLogic.play_round x{calls}": measure(play_rounds, _repeat(300, scale)),
+    }
+
+@benchmark("ninja_fisica")
+def bench_falling_objects(scale, counts=(50, 1000)):
+    ensure_qt_app()
+    from game_objects import FallingObject
+
+    settings = {"min_vy": -12, "max_vy": -9}
+    results = {}
+    for count in counts:
+        objects = [FallingObject("assets/ninja-game/apple.png", settings) for _ in range(count)]
+
+        def step():
+            for obj in objects:
+                obj.update()
+
+        results[f"FallingObject.update x{count}"] = measure(step, _repeat(500, scale))
+    return results
+
+@benchmark("face_colisao")
+def bench_face_collisions(scale, counts=(30, 500)):
+    ensure_qt_app()
+    from types import SimpleNamespace
+    from face_game import FaceGameWidget
+    from game_objects_face import Obstacle, Player
+
+    width, height = 1400, 900
+    players = {pid: Player(pid, width, height, {}) for pid in (1, 2)}
+    # Basta o que _update_and_collide usa do widget: jogadores e altura da tela
+    widget = SimpleNamespace(players=players, height=lambda: height)
+
+    results = {}
+    rng = np.random.default_rng(0)
+    for count in counts:
+        entities = [Obstacle(width, height) for _ in range(count)]
+        # Parados e espalhados pela tela: toda chamada vê o mesmo cenário
+        for entity, y in zip(entities, rng.integers(-120, height, count)):
+            entity.y = entity.prev_y = int(y)
+            entity.speed = 0
+
+        def collide():
+            FaceGameWidget._update_and_collide(widget, list(entities), lambda player_id, player: None)
+
+        results[f"_update_and_collide x{count}"] = measure(collide, _repeat(500, scale))
+    return results
+
+@benchmark("frame_pixmap")
+def bench_convert_frame(scale, frame_shapes=((480, 640, 3), (720, 1280, 3))):
+    ensure_qt_app()
+    from ninja_game import GameWidget
+
+    results = {}
+    rng = np.random.default_rng(0)
+    for shape in frame_shapes:
+        frame = rng.integers(0, 255, shape, dtype=np.uint8)
+        # O método não usa nada da instância; evita abrir câmera criando o widget
+        results[f"_convert_frame_to_pixmap {shape[1]}x{shape[0]}"] = measure(
+            lambda: GameWidget._convert_frame_to_pixmap(None, frame), _repeat(300, scale))
+    return results
+
+@benchmark("rps_exibicao")
+def bench_rounded_frame(scale, size=(760, 520)):
+    ensure_qt_app()
+    from PySide6.QtGui import QPixmap
+    from benchmarks.bench_rps_display import legacy_rounded_pixmap
+    from frame_view import RoundedFrameView
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, (size[1], size[0], 3), dtype=np.uint8)
+    pixmap = QPixmap(*size)
+    view = RoundedFrameView(radius=27)
+    view.resize(*size)
+
+    def rounded_view():
+        view.show_frame(frame)
+        view.repaint()
+
+    # _create_rounded_pixmap saiu do RPS; o caso antigo mede a reprodução dele
+    return {
+        f"_create_rounded_pixmap {size[0]}x{size[1]}": measure(lambda: legacy_rounded_pixmap(pixmap), _repeat(300, scale)),
+        f"RoundedFrameView {size[0]}x{size[1]}": measure(rounded_view, _repeat(300, scale)),
+    }
+
+@benchmark("face_sprites")
+def bench_face_sprites(scale, count=20):
+    ensure_qt_app()
+    from game_objects_face import Collectible, Obstacle
+    from sprite_cache import sprite_cache
+
+    path = "assets/face-game/meteor.png"
+
+    def construct():
+        for _ in range(count):
+            Obstacle(1400, 900, path)
+            Collectible(1400, 900)
+
+    def construct_cold():
+        # Sem cache cada sprite decodifica o PNG inteiro (dezenas de ms): só um par
+        sprite_cache.clear()
+        Obstacle(1400, 900, path)
+        Collectible(1400, 900)
+
+    return {
+        "Obstacle+Collectible x1 cache frio": measure(construct_cold, _repeat(20, scale), warmup=1),
+        f"Obstacle+Collectible x{count} cache quente": measure(construct, _repeat(300, scale)),
+    }
+
+@benchmark("spawn")
+def bench_spawn(scale, count=1000):
+    import random
+    from ninja_game import GameWidget
+    from spawn_scheduler import SpawnScheduler
+
+    # As mesmas specs de FaceGameWidget.obstacle_specs (definidas no __init__ do widget)
+    specs = [
+        ("assets/face-game/rock.png", 10), ("assets/face-game/meteor.png", 8), ("assets/face-game/pedra.png", 7),
+        ("assets/face-game/pedra2.png", 7), ("assets/face-game/pedra3.png", 6), ("assets/face-game/pedra4.png", 6),
+        ("assets/face-game/alien.png", 3), ("assets/face-game/sofa.png", 1), ("assets/face-game/bota.png", 1)]
+    spawner = SpawnScheduler(0)
+    table = spawner.table(specs)
+    rng = random.Random(0)
+
+    def choices_per_spawn():
+        # Como era: listas de caminhos e pesos montadas a cada spawn + random.choices
+        for _ in range(count):
+            rng.choices([spec[0] for spec in specs], weights=[spec[1] for spec in specs], k=1)[0]
+
+    def alias_per_spawn():
+        for _ in range(count):
+            spawner.pick(table)
+
+    schedule = spawner.stages(GameWidget.DIFFICULTY_STAGES)
+    fruits = spawner.uniform_table(["apple", "banana", "uva", "melancia"])
+    return {
+        f"random.choices x{count}": measure(choices_per_spawn, _repeat(300, scale)),
+        f"AliasTable x{count}": measure(alias_per_spawn, _repeat(300, scale)),
+        "timeline 10 min (Fruit Ninja)": measure(lambda: spawner.timeline(schedule, 600, fruits), _repeat(300, scale)),
+    }
+
+@benchmark("rastreio_rostos")
+def bench_face_tracker(scale, counts=(2, 6)):
+    from face_tracker import FaceTracker
+
+    results = {}
+    rng = np.random.default_rng(0)
+    for count in counts:
+        tracker = FaceTracker(count)
+        start = rng.uniform(0.1, 0.9, (count, 2))
+        # Rostos andando devagar: todo frame casa com as mesmas vagas
+        frames = [start + 0.003 * i * rng.standard_normal((count, 2)) for i in range(64)]
+        state = {"frame": 0}
+
+        def update():
+            state["frame"] += 1
+            tracker.update(frames[state["frame"] % len(frames)], state["frame"] / 30.0)
+
+        results[f"FaceTracker.update x{count}"] = measure(update, _repeat(2000, scale))
+    return results
+
+def run_suite(names=None, scale=1.0):
+    """Roda os benchmarks escolhidos (todos por padrão) e devolve {"benchmark/caso": estatísticas}."""
+    ensure_qt_app()
+    # Os caminhos dos assets são relativos à raiz do repositório, como nos jogos
+    os.chdir(ROOT)
+    results = {}
+    for name in names or BENCHMARKS:
+        cases = BENCHMARKS[name](scale)
+        print_results(name, cases)
+        results.update({f"{name}/{case}": stats for case, stats in cases.items()})
+    return results
+
+def save_baseline(results, path=DEFAULT_BASELINE):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    data = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "numpy": np.__version__,
+        },
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+    return path
+
+def load_baseline(path=DEFAULT_BASELINE):
+    with open(path) as f:
+        return json.load(f)["results"]
+
+def compare(current, baseline, threshold=DEFAULT_THRESHOLD, metric="p50_ms"):
+    """
+    Compara o `metric` de cada caso com o baseline. Retorna linhas
+    (caso, baseline ms, atual ms, razão, regrediu) para os casos presentes nos dois.
+    """
+    rows = []
+    for case, stats in current.items():
+        if case not in baseline:
+            continue
+        before, after = baseline[case][metric], stats[metric]
+        ratio = after / before if before > 0 else float("inf")
+        regressed = ratio > 1.0 + threshold and after - before > MIN_DELTA_MS
+        rows.append((case, before, after, ratio, regressed))
+    return rows
+
+def print_comparison(rows, threshold):
+    width = max(len(row[0]) for row in rows)
+    print(f"\nComparação com o baseline (p50, tolerância {threshold:.0%})")
+    for case, before, after, ratio, regressed in rows:
+        flag = "  REGRESSÃO" if regressed else ""
+        print(f"  {case:<{width}}  {before:8.3f} -> {after:8.3f} ms  ({ratio:5.2f}x){flag}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description="Microbenchmarks dos jogos.")
+    parser.add_argument("command", choices=("list", "run", "save", "compare"))
+    parser.add_argument("names", nargs="*", help="benchmarks a rodar (padrão: todos)")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="arquivo JSON do baseline")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="aumento relativo do p50 considerado regressão (0.25 = 25%%)")
+    parser.add_argument("--quick", action="store_true", help="menos repetições (mais ruído)")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name in BENCHMARKS:
+            print(name)
+        return 0
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        print(f"Benchmarks desconhecidos: {', '.join(unknown)} (disponíveis: {', '.join(BENCHMARKS)})")
+        return 2
+    if args.command == "compare" and not os.path.exists(args.baseline):
+        print(f"Baseline '{args.baseline}' não encontrado; gere um com 'save'.")
+        return 2
+
+    results = run_suite(args.names, scale=0.2 if args.quick else 1.0)
+    if args.command == "save":
+        print(f"\nBaseline salvo em {save_baseline(results, args.baseline)}")
+    elif args.command == "compare":
+        rows = compare(results, load_baseline(args.baseline), args.threshold)
+        if not rows:
+            print("\nNenhum caso em comum com o baseline.")
+            return 0
+        print_comparison(rows, args.threshold)
+        regressions = sum(row[4] for row in rows)
+        if regressions:
+            print(f"\n{regressions} regressão(ões) acima de {args.threshold:.0%}.")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,48 +1,190 @@
+import time
+
 import cv2
-import mediapipe as mp
 
-# Inicializa os objetos do MediaPipe fora da classe para serem usados globalmente
-mp_hands = mp.solutions.hands
-mp_drawing = mp.solutions.drawing_utils
+from frame_sources import frame_source_from_env
+from frame_pipeline import CaptureThread
+from landmarks import hand_arrays
+from landmark_history import LandmarkHistory
+from frame_profiler import profiler
+from inference_profiles import PROFILES
+
+def create_hands(profile=None):
+    """Detector de mãos do MediaPipe, já aquecido, no perfil dado (padrão: o completo, de antes)."""
+    return (profile or PROFILES["hand-full"]).create_model()
 
 class Camera:
-    def __init__(self):
+    def __init__(self, threaded=False, inference_region=None, frame_skip=None, source=None, model_pool=None,
+                 profile=None):
         """
         Inicializa a captura de vídeo e o modelo de detecção de mãos do MediaPipe.
+        Com `threaded=True`, captura e inferência rodam numa thread própria e
+        get_frame() passa a apenas ler o resultado mais recente.
+        `inference_region` (InferenceRegion) reduz/recorta a imagem enviada ao modelo.
+        `frame_skip` (FrameSkipper) roda o modelo só em parte dos frames e prevê os demais.
+        `source` (SharedSource) e `model_pool` (ModelPool) vêm do launcher: fonte e
+        modelo continuam abertos no release(), para o próximo jogo reaproveitar.
+        `profile` (InferenceProfile) escolhe o modelo; ver inference_profiles.py.
         """
-        # Inicia a captura de vídeo da webcam padrão (índice 0)
-        self.cap = cv2.VideoCapture(0)
+        # Inicia a captura de vídeo da webcam padrão (índice 0), ou da fonte
+        # escolhida em VISION_GAMES_SOURCE (vídeo, imagens, sintética, serviço de captura)
+        self.cap = frame_source_from_env(0) if source is None else source
         if not self.cap.isOpened():
-            raise IOError("Não foi possível abrir a webcam.")
+            raise IOError("Não foi possível abrir a fonte de vídeo.")
 
-        # Configura o detector de mãos do MediaPipe
-        self.hands = mp_hands.Hands(
-            max_num_hands=2,
-            min_detection_confidence=0.7,
-            min_tracking_confidence=0.5
-        )
+        self.model_pool = model_pool
+        self.profile = profile or PROFILES["hand-full"]
+        self.hands = model_pool.acquire(self.profile) if model_pool is not None else create_hands(self.profile)
 
-    def get_frame(self):
+        self.inference_region = inference_region
+        self.frame_skip = frame_skip
+        self.recorder = None
+        self.pipeline = None
+        self._last_results = None
+        self.last_frame = (0, None)  # (nº do frame, horário da captura) do último get_frame()
+        self.history = LandmarkHistory()  # últimos ~3 s de landmarks, com horário de captura
+        self._arrays = (None, hand_arrays(None))  # (resultados convertidos, arrays)
+        if threaded:
+            self.start_pipeline()
+
+    def attach_recorder(self, recorder):
+        """Grava horários e landmarks de cada frame processado (ver session_recording.py)."""
+        self.recorder = recorder
+
+    def begin_session(self):
         """
-        Lê um frame da câmera, processa-o com o MediaPipe e o retorna.
+        Marca o início de uma partida. Retorna a semente do RNG que o jogo deve
+        usar (a da gravação em andamento) ou None.
+        """
+        if self.recorder is None:
+            return None
+        self.recorder.start()
+        return self.recorder.seed
+
+    def game_clock(self):
+        """Relógio dos passos e timers do jogo: o de parede (o replay usa o da gravação)."""
+        return time.monotonic()
+
+    def start_pipeline(self):
+        """Inicia a thread que captura e processa frames continuamente."""
+        if self.pipeline is None:
+            self.pipeline = CaptureThread(self._capture_and_process, name="camera-maos")
+            self.pipeline.start()
+
+    def set_capture_rate(self, hz):
+        """
+        Limita captura + inferência a `hz` frames/s (None = sem limite, 0 = pausa).
+        Só vale no modo com thread; ver inference_governor.py.
         """
-        success, frame = self.cap.read()
+        if self.pipeline is not None:
+            self.pipeline.set_rate(hz)
+
+    def _capture_and_process(self):
+        with profiler.span("cap.read"):
+            success, frame = self.cap.read()
         if not success:
-            return None, None
+            return None, None, None
+        captured_at = time.monotonic()
 
         # 1. Inverte a imagem (efeito espelho) e converte a cor de BGR para RGB
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        with profiler.span("flip+cvtColor"):
+            frame = cv2.flip(frame, 1)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
 
         # 2. Processa o frame com o MediaPipe para encontrar mãos
-        results = self.hands.process(rgb_frame)
+        #    (ou, nos frames pulados, usa os landmarks previstos)
+        now = time.monotonic()
+        if self.frame_skip is None or self.frame_skip.should_infer(now):
+            with profiler.span("hands.process"):
+                results = self._infer(rgb_frame)
+            if self.frame_skip is not None:
+                self.frame_skip.observe(results, now, time.monotonic() - now)
+            # Histórico (votos do RPS) e gravação só com detecções reais, nunca com previsões
+            points, handedness = hand_arrays(results)
+            self.history.push(now, points, handedness)
+            if self.recorder is not None:
+                self.recorder.record(time.monotonic(), rgb_frame, results)
+        else:
+            results = self.frame_skip.skip(now)
+
+        # Retorna o frame em RGB (para o PySide6), os resultados da detecção e o horário da captura
+        return rgb_frame, results, captured_at
 
-        # Retorna o frame em RGB (para o PySide6) e os resultados da detecção
+    def _infer(self, rgb_frame):
+        if self.inference_region is None:
+            return self.hands.process(rgb_frame)
+        model_input, crop = self.inference_region.prepare(rgb_frame)
+        results = self.hands.process(model_input)
+        self.inference_region.finish(results.multi_hand_landmarks, crop, rgb_frame.shape)
+        return results
+
+    def get_frame(self):
+        """
+        Lê um frame da câmera, processa-o com o MediaPipe e o retorna.
+        No modo com thread não bloqueia: retorna o último resultado publicado
+        (o mesmo frame pode voltar em várias chamadas; `last_frame` diz qual é).
+        """
+        rgb_frame, results = self._read_frame()
+        self._last_results = results
         return rgb_frame, results
 
+    def _read_frame(self):
+        if self.pipeline is None:
+            rgb_frame, results, captured_at = self._capture_and_process()
+            if rgb_frame is not None:
+                self.last_frame = (self.last_frame[0] + 1, captured_at)
+            return rgb_frame, results
+
+        packet = self.pipeline.slot.latest()
+        if packet is None:
+            return None, None
+        self.last_frame = (packet.seq, packet.captured_at)
+        if self.frame_skip is not None:
+            # Extrapola os landmarks até agora: o cursor anda a cada tick do jogo,
+            # mesmo com a inferência rodando bem abaixo da taxa de quadros
+            return packet.rgb_frame, self.frame_skip.predict(time.monotonic())
+        return packet.rgb_frame, packet.results
+
+    def get_landmarks(self):
+        """
+        Mãos do último get_frame() como arrays NumPy: pontos (mãos, 21, 3) float32
+        e lateralidade (mãos,) int8 (ver landmarks.HANDEDNESS_LABELS).
+        A conversão dos protobufs acontece uma vez por frame, mesmo com várias chamadas.
+        """
+        results = self._last_results
+        if self._arrays[0] is not results:
+            self._arrays = (results, hand_arrays(results))
+        return self._arrays[1]
+
+    @property
+    def capture_error(self):
+        """Última exceção da thread de captura (None se ela está lendo frames normalmente)."""
+        return self.pipeline.error if self.pipeline is not None else None
+
+    def pipeline_stats(self):
+        """Frames publicados, consumidos e descartados pela thread de captura."""
+        if self.pipeline is None:
+            return None
+        stats = self.pipeline.stats()
+        if self.frame_skip is not None:
+            stats.update(self.frame_skip.stats())
+        return stats
+
     def release(self):
         """
         Libera os recursos da câmera e fecha as janelas ao final.
+        Com thread, câmera e modelo só fecham depois que ela sai do process().
         """
+        if self.pipeline is None:
+            self._release_resources()
+        elif not self.pipeline.stop(on_exit=self._release_resources):
+            print("Aviso: a thread de captura ainda está processando; câmera e modelo fecham quando ela terminar.")
+
+    def _release_resources(self):
+        if self.recorder is not None:
+            self.recorder.close()
         self.cap.release()
-        self.hands.close()
\ No newline at end of file
+        if self.model_pool is not None:
+            self.model_pool.release(self.profile, self.hands)
+        else:
+            self.hands.close()
@@ -1,35 +1,206 @@
+import time
+
 import cv2
-import mediapipe as mp
+
+from frame_sources import frame_source_from_env
+from frame_pipeline import CaptureThread
+from face_worker import FaceMeshWorker
+from landmarks import LandmarkResults, array_to_landmark_lists
+from frame_profiler import profiler
+from inference_profiles import PROFILES
+
+def create_face_mesh(profile=None):
+    """FaceMesh já aquecido no perfil dado (padrão: com íris, como antes); ver inference_profiles.py."""
+    # Import adiado até o create_model (leva ~1 s); os jogos criam a câmera numa thread (camera_loader.py)
+    return (profile or PROFILES["face-full"]).create_model()
 
 class FaceCamera:
-    def __init__(self):
-        self.cap = cv2.VideoCapture(0)
+    def __init__(self, threaded=False, out_of_process=False, inference_region=None, frame_skip=None,
+                 source=None, model_pool=None, profile=None):
+        # `source`/`model_pool` vêm do launcher: continuam abertos no release()
+        if out_of_process and (source is not None or model_pool is not None):
+            raise ValueError("O processo do FaceMesh abre a própria câmera e o próprio modelo.")
+
+        self.pipeline = None
+        self.worker = None
+        self.recorder = None
+        self.inference_region = inference_region # só no modo dentro do processo
+        self.frame_skip = frame_skip # idem
+        self._worker_seq = 0
+        self._worker_frame = (None, None)
+        self.last_frame = (0, None)  # (nº do frame, horário da captura) do último get_frame()
+        self.model_pool = model_pool
+        self.profile = profile or PROFILES["face-full"]
+        self._requested_profile = self.profile  # ver set_profile()
+
+        if out_of_process:
+            # Captura + FaceMesh em outro processo; aqui só lemos a memória compartilhada
+            self.cap = None
+            self.face_mesh = None
+            self.worker = FaceMeshWorker(camera_index=0, **self.profile.model_options())
+            return
+
+        # webcam ou a fonte de VISION_GAMES_SOURCE
+        self.cap = frame_source_from_env(0) if source is None else source
         if not self.cap.isOpened():
-            print("Erro: Não foi possível abrir a câmera.")
-            exit()
-
-        self.mp_face_mesh = mp.solutions.face_mesh
-        self.face_mesh = self.mp_face_mesh.FaceMesh(
-            static_image_mode=False,
-            max_num_faces=2, # AGORA SUPORTA ATÉ 2 FACES
-            refine_landmarks=True,
-            min_detection_confidence=0.5,
-            min_tracking_confidence=0.5
-        )
+            raise IOError("Não foi possível abrir a fonte de vídeo.")
+
+        self.face_mesh = model_pool.acquire(self.profile) if model_pool is not None else create_face_mesh(self.profile)
+
+        # Com thread, captura + FaceMesh rodam fora do timer do jogo
+        if threaded:
+            self.start_pipeline()
+
+    def attach_recorder(self, recorder):
+        self.recorder = recorder
+
+    def begin_session(self):
+        if self.recorder is None:
+            return None
+        self.recorder.start()
+        return self.recorder.seed
+
+    def game_clock(self):
+        """Relógio dos passos e timers do jogo: o de parede (o replay usa o da gravação)."""
+        return time.monotonic()
+
+    def start_pipeline(self):
+        if self.pipeline is None and self.worker is None:
+            self.pipeline = CaptureThread(self._capture_and_process, name="camera-rosto")
+            self.pipeline.start()
+
+    def set_profile(self, profile):
+        """
+        Troca o FaceMesh pelo de outro perfil (ex.: o limite de rostos da partida).
+        A troca acontece no próximo frame, na thread que chama o process(), para
+        nunca fechar um modelo no meio de uma inferência. No worker (outro
+        processo) o perfil é fixo: a chamada é ignorada.
+        """
+        if self.worker is None:
+            self._requested_profile = profile
+
+    def _swap_model(self, profile):
+        with profiler.span("face_mesh.swap"):
+            if self.model_pool is not None:
+                face_mesh = self.model_pool.acquire(profile)
+                self.model_pool.release(self.profile, self.face_mesh)
+            else:
+                face_mesh = create_face_mesh(profile)
+                self.face_mesh.close()
+        self.face_mesh, self.profile = face_mesh, profile
+
+    def set_capture_rate(self, hz):
+        """Captura + FaceMesh a no máximo `hz` frames/s (None = sem limite, 0 = pausa), na thread ou no worker."""
+        if self.worker is not None:
+            self.worker.set_rate(hz)
+        elif self.pipeline is not None:
+            self.pipeline.set_rate(hz)
+
+    def _capture_and_process(self):
+        requested = self._requested_profile
+        if requested is not self.profile:
+            self._swap_model(requested)
+
+        with profiler.span("cap.read"):
+            ret, frame = self.cap.read()
+        if not ret: return None, None, None
+        captured_at = time.monotonic()
+
+        with profiler.span("flip+cvtColor"):
+            frame = cv2.flip(frame, 1)
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+
+        # Nos frames pulados, os landmarks vêm do preditor
+        now = time.monotonic()
+        if self.frame_skip is None or self.frame_skip.should_infer(now):
+            with profiler.span("face_mesh.process"):
+                results = self._infer(rgb_frame)
+            if self.frame_skip is not None:
+                self.frame_skip.observe(results, now, time.monotonic() - now)
+            # A gravação guarda só detecções reais, nunca landmarks previstos
+            if self.recorder is not None:
+                self.recorder.record(time.monotonic(), rgb_frame, results)
+        else:
+            results = self.frame_skip.skip(now)
+
+        return rgb_frame, results, captured_at
+
+    def _infer(self, rgb_frame):
+        if self.inference_region is None:
+            return self.face_mesh.process(rgb_frame)
+        model_input, crop = self.inference_region.prepare(rgb_frame)
+        results = self.face_mesh.process(model_input)
+        self.inference_region.finish(results.multi_face_landmarks, crop, rgb_frame.shape)
+        return results
+
+    def _read_worker(self):
+        if self.worker.latest_seq() == self._worker_seq:
+            self.worker.ensure_alive()
+            return self._worker_frame
+
+        with profiler.span("worker.read"):
+            data = self.worker.read()
+        if data is None: return None, None
+
+        seq, timestamp, rgb_frame, landmarks = data
+        if seq != self._worker_seq:
+            # Só reconstrói os landmarks quando chega um frame novo do worker
+            faces = array_to_landmark_lists(landmarks) if len(landmarks) else None
+            self._worker_seq = seq
+            self.last_frame = (seq, timestamp)  # fim do FaceMesh no worker, no mesmo relógio monotônico
+            self._worker_frame = (rgb_frame, LandmarkResults(multi_face_landmarks=faces))
+            if self.recorder is not None:
+                self.recorder.record(timestamp, *self._worker_frame)
+        return self._worker_frame
 
     def get_frame(self):
-        ret, frame = self.cap.read()
-        if not ret: return None, None
+        if self.worker is not None:
+            return self._read_worker()
+
+        if self.pipeline is None:
+            rgb_frame, results, captured_at = self._capture_and_process()
+            if rgb_frame is not None:
+                self.last_frame = (self.last_frame[0] + 1, captured_at)
+            return rgb_frame, results
 
-        frame = cv2.flip(frame, 1)
+        packet = self.pipeline.slot.latest()
+        if packet is None: return None, None
+        self.last_frame = (packet.seq, packet.captured_at)
+        if self.frame_skip is not None:
+            # Landmarks extrapolados até agora: o jogador se move a cada tick
+            return packet.rgb_frame, self.frame_skip.predict(time.monotonic())
+        return packet.rgb_frame, packet.results
 
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        results = self.face_mesh.process(rgb_frame)
+    @property
+    def capture_error(self):
+        """Última exceção da thread de captura (None se ela está lendo frames normalmente)."""
+        return self.pipeline.error if self.pipeline is not None else None
 
-        return rgb_frame, results
+    def pipeline_stats(self):
+        if self.pipeline is None:
+            return None
+        stats = self.pipeline.stats()
+        if self.frame_skip is not None:
+            stats.update(self.frame_skip.stats())
+        return stats
 
     def release(self):
-        if self.cap.isOpened():
+        if self.worker is not None:
+            self.worker.close()
+        elif self.pipeline is not None:
+            # Câmera e FaceMesh só fecham depois que a thread sai do process()
+            if not self.pipeline.stop(on_exit=self._release_resources):
+                print("Aviso: a thread de captura ainda está processando; câmera e modelo fecham quando ela terminar.")
+            return
+        self._release_resources()
+
+    def _release_resources(self):
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.cap is not None and self.cap.isOpened():
             self.cap.release()
-        self.face_mesh.close()
\ No newline at end of file
+        if self.face_mesh is not None:
+            if self.model_pool is not None:
+                self.model_pool.release(self.profile, self.face_mesh)
+            else:
+                self.face_mesh.close()
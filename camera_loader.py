@@ -0,0 +1,120 @@
+import json
+import os
+import threading
+import time
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+class CameraLoader(QObject):
+    """
+    Abre a câmera e constrói o modelo (import do MediaPipe incluído) numa thread,
+    para a tela inicial aparecer antes de qualquer coisa pesada.
+
+    `make_camera` roda na thread; as câmeras já fazem uma inferência de
+    aquecimento num frame preto antes de começar a capturar. Quando a câmera
+    fica pronta, `ready(camera)` é emitido (entregue na thread da interface);
+    depois, `first_inference` avisa quando o primeiro frame real foi processado.
+    `timings` guarda o time.monotonic() de cada marco.
+
+    Câmeras sem thread de captura nem worker (ReplayCamera, Camera sem thread) só
+    processam um frame quando o jogo chama get_frame(): nelas o marco é o primeiro
+    get_frame() com frame, e o sinal sai da thread da interface.
+    """
+
+    ready = Signal(object)
+    failed = Signal(str)
+    first_inference = Signal()
+
+    FIRST_INFERENCE_TIMEOUT = 10.0
+
+    def __init__(self, make_camera, parent=None):
+        super().__init__(parent)
+        self._make_camera = make_camera
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self.camera = None
+        self.timings = {}
+        self._thread = threading.Thread(target=self._run, name="carregar-camera", daemon=True)
+
+    def start(self):
+        self.timings["loader_start"] = time.monotonic()
+        self._thread.start()
+
+    def _run(self):
+        try:
+            camera = self._make_camera()
+        except Exception as e:
+            print(f"Erro ao abrir a câmera: {e}")
+            self.failed.emit(str(e))
+            return
+        self.timings["camera_ready"] = time.monotonic()
+
+        with self._lock:
+            if self._cancelled:
+                # A janela fechou enquanto a câmera abria
+                camera.release()
+                return
+            self.camera = camera
+        waits_for_game = getattr(camera, "pipeline", None) is None and getattr(camera, "worker", None) is None
+        if waits_for_game:
+            # Antes do ready: o jogo pode chamar get_frame() logo em seguida
+            self._watch_first_frame(camera)
+        self.ready.emit(camera)
+        if waits_for_game:
+            return
+
+        self._wait_first_inference(camera)
+        self._mark_first_inference()
+
+    def _mark_first_inference(self):
+        self.timings["first_inference"] = time.monotonic()
+        self.first_inference.emit()
+
+    def _watch_first_frame(self, camera):
+        """Marca a 1ª inferência no primeiro get_frame() que entregar um frame."""
+        get_frame = camera.get_frame
+
+        def watched_get_frame():
+            rgb_frame, results = get_frame()
+            if rgb_frame is not None and "get_frame" in vars(camera):
+                del camera.get_frame  # volta ao método da classe
+                self._mark_first_inference()
+            return rgb_frame, results
+
+        camera.get_frame = watched_get_frame
+
+    def _wait_first_inference(self, camera):
+        deadline = time.monotonic() + self.FIRST_INFERENCE_TIMEOUT
+        pipeline = getattr(camera, "pipeline", None)
+        worker = getattr(camera, "worker", None)
+        if pipeline is not None:
+            pipeline.slot.wait_newer(0, self.FIRST_INFERENCE_TIMEOUT)
+        elif worker is not None:
+            while worker.latest_seq() == 0 and time.monotonic() < deadline:
+                time.sleep(0.005)
+
+    def cancel(self):
+        """
+        Ao fechar a janela: se a câmera ainda estiver abrindo, ela é liberada
+        assim que terminar. Retorna a câmera já pronta (ou None), que fica a cargo de quem chamou.
+        """
+        with self._lock:
+            self._cancelled = True
+            return self.camera
+
+def report_startup(loader):
+    """
+    Com VISION_GAMES_STARTUP_REPORT=1, imprime uma linha JSON com o time.monotonic()
+    da primeira volta do laço de eventos (janela na tela), da câmera pronta e da
+    primeira inferência. Usado por benchmarks/bench_startup.py.
+    """
+    if os.environ.get("VISION_GAMES_STARTUP_REPORT") != "1":
+        return
+    marks = {}
+    QTimer.singleShot(0, lambda: marks.setdefault("first_window", time.monotonic()))
+
+    def done():
+        marks.update(loader.timings)
+        print("Inicialização: " + json.dumps(marks), flush=True)
+
+    loader.first_inference.connect(done)
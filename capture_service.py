@@ -0,0 +1,286 @@
+"""
+Serviço de captura compartilhado: um processo abre a webcam (ou um vídeo, ou
+uma fonte sintética) uma única vez e publica os frames em memória compartilhada
+para quantos processos locais quiserem ler (jogos, gravador, tela de espectador).
+
+    python -m capture_service --source webcam
+    VISION_GAMES_CAPTURE=shared python ninja_game.py
+
+Com VISION_GAMES_CAPTURE definido (ou VISION_GAMES_SOURCE=shm), Camera e
+FaceCamera leem pelo SharedCaptureClient (ver frame_sources).
+"""
+import argparse
+import signal
+import sys
+import time
+from multiprocessing import resource_tracker, shared_memory
+
+import cv2
+import numpy as np
+
+from frame_sources import FrameSource, open_frame_source
+
+DEFAULT_NAME = "vision_games_capture"
+_MAGIC = 0x56474341505431  # "VGCAPT1"
+
+# Cabeçalho (int64) no início do bloco compartilhado
+_H_MAGIC = 0
+_H_STATUS = 1        # 1 = publicando, 2 = encerrado
+_H_HEARTBEAT = 2     # time.monotonic_ns() da última volta do loop do serviço
+_H_WRITE_SEQ = 3     # número do último frame publicado (0 = nenhum ainda)
+_H_SLOTS = 4
+_H_MAX_HEIGHT = 5
+_H_MAX_WIDTH = 6
+_H_FPS_MILLI = 7     # taxa nominal da fonte x1000 (0 = desconhecida)
+_HEADER_BASE = 8
+# Campos de cada slot do anel, a partir de _HEADER_BASE + slot * _FIELDS_PER_SLOT
+_SEQLOCK, _SLOT_SEQ, _TIMESTAMP, _HEIGHT, _WIDTH = range(5)
+_FIELDS_PER_SLOT = 5
+
+_STATUS_RUNNING = 1
+_STATUS_STOPPED = 2
+STALE_AFTER = 2.0      # segundos sem heartbeat até o cliente considerar o serviço morto
+POLL_INTERVAL = 0.002  # espera entre consultas do cliente por um frame novo
+
+def _header_size(slots):
+    size = (_HEADER_BASE + slots * _FIELDS_PER_SLOT) * 8
+    return (size + 63) // 64 * 64  # frames alinhados em 64 bytes
+
+class FrameRing:
+    """
+    Anel de `slots` frames BGR em um bloco de memória compartilhada.
+
+    Um único escritor publica o frame `seq` no slot (seq - 1) % slots, protegido
+    por um seqlock (ímpar = escrita em andamento), e só então avança
+    _H_WRITE_SEQ. Um leitor que pegou o slot do frame `seq` tem slots - 1
+    frames de folga antes de o escritor voltar a ele.
+    """
+
+    def __init__(self, name, slots=8, max_shape=(720, 1280, 3), create=False):
+        if create:
+            height, width, channels = max_shape
+            size = _header_size(slots) + slots * height * width * channels
+            try:
+                self.block = shared_memory.SharedMemory(name=name, create=True, size=size)
+            except FileExistsError:
+                # Sobrou de um serviço que não encerrou direito: descarta e recria
+                stale = shared_memory.SharedMemory(name=name)
+                stale.close()
+                stale.unlink()
+                self.block = shared_memory.SharedMemory(name=name, create=True, size=size)
+            header = np.ndarray((_HEADER_BASE + slots * _FIELDS_PER_SLOT,), dtype=np.int64, buffer=self.block.buf)
+            header[:] = 0
+            header[_H_SLOTS], header[_H_MAX_HEIGHT], header[_H_MAX_WIDTH] = slots, height, width
+            header[_H_MAGIC] = _MAGIC
+        else:
+            # Quem só lê não é dono do bloco: se o resource_tracker o registrar,
+            # apaga o anel do serviço quando este processo terminar
+            if sys.version_info >= (3, 13):
+                self.block = shared_memory.SharedMemory(name=name, track=False)
+            else:
+                self.block = shared_memory.SharedMemory(name=name)
+                resource_tracker.unregister(self.block._name, "shared_memory")
+            probe = np.ndarray((_HEADER_BASE,), dtype=np.int64, buffer=self.block.buf)
+            if probe[_H_MAGIC] != _MAGIC:
+                del probe
+                self.block.close()
+                raise ValueError(f"'{name}' não é um bloco do serviço de captura.")
+            slots, height, width = int(probe[_H_SLOTS]), int(probe[_H_MAX_HEIGHT]), int(probe[_H_MAX_WIDTH])
+            del probe
+            header = np.ndarray((_HEADER_BASE + slots * _FIELDS_PER_SLOT,), dtype=np.int64, buffer=self.block.buf)
+
+        self.name = name
+        self.slots = slots
+        self.max_shape = (height, width, 3)
+        self.header = header
+        self.frames = np.ndarray((slots,) + self.max_shape, dtype=np.uint8,
+                                 buffer=self.block.buf, offset=_header_size(slots))
+        if not create:
+            self.frames.flags.writeable = False  # leitores não podem estragar o frame dos outros
+
+    def _slot_base(self, slot):
+        return _HEADER_BASE + slot * _FIELDS_PER_SLOT
+
+    def publish(self, frame, timestamp_ns):
+        """Escreve o frame (reduzido se passar do tamanho máximo) no próximo slot."""
+        max_h, max_w = self.max_shape[:2]
+        if frame.shape[0] > max_h or frame.shape[1] > max_w:
+            scale = min(max_h / frame.shape[0], max_w / frame.shape[1])
+            frame = cv2.resize(frame, (int(frame.shape[1] * scale), int(frame.shape[0] * scale)))
+        h, w = frame.shape[:2]
+        header = self.header
+        seq = int(header[_H_WRITE_SEQ]) + 1
+        slot = (seq - 1) % self.slots
+        base = self._slot_base(slot)
+        header[base + _SEQLOCK] += 1
+        self.frames[slot, :h, :w] = frame
+        header[base + _SLOT_SEQ] = seq
+        header[base + _TIMESTAMP] = timestamp_ns
+        header[base + _HEIGHT] = h
+        header[base + _WIDTH] = w
+        header[base + _SEQLOCK] += 1
+        header[_H_WRITE_SEQ] = seq
+        return seq
+
+    def latest(self):
+        """(seq, timestamp em s, view do frame) do último frame publicado, ou None."""
+        header = self.header
+        for _attempt in range(3):
+            seq = int(header[_H_WRITE_SEQ])
+            if seq == 0:
+                return None
+            slot = (seq - 1) % self.slots
+            base = self._slot_base(slot)
+            lock_before = header[base + _SEQLOCK]
+            if lock_before % 2 or header[base + _SLOT_SEQ] != seq:
+                continue
+            h, w = int(header[base + _HEIGHT]), int(header[base + _WIDTH])
+            timestamp = header[base + _TIMESTAMP] / 1e9
+            if header[base + _SEQLOCK] == lock_before:
+                return seq, timestamp, self.frames[slot, :h, :w]
+        return None
+
+    def close(self, unlink=False):
+        # As views precisam sair de escopo antes de fechar o bloco
+        del self.header, self.frames
+        self.block.close()
+        if unlink:
+            try:
+                self.block.unlink()
+            except FileNotFoundError:
+                pass
+
+class SharedCaptureClient(FrameSource):
+    """
+    Leitor do serviço de captura como fonte de frames das câmeras (ver frame_sources).
+
+    read() espera um frame mais novo que o último lido e devolve uma view direto
+    da memória compartilhada, sem cópia; ela continua válida enquanto o serviço
+    não der a volta no anel (slots - 1 frames), tempo de sobra para o flip/cvtColor
+    que as câmeras fazem logo em seguida. Frames que o cliente não chegou a ler
+    são pulados e contados em `skipped`.
+    """
+
+    def __init__(self, name=DEFAULT_NAME, timeout=1.0):
+        super().__init__(pacing="max")  # o ritmo é o do serviço
+        self.name = name
+        self.timeout = timeout
+        self.ring = None
+        self.last_seq = 0
+        self.timestamp = 0.0
+        self.skipped = 0
+        try:
+            self.ring = FrameRing(name)
+            self.fps = self.ring.header[_H_FPS_MILLI] / 1000.0 or self.fps
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Erro: serviço de captura '{name}' indisponível ({e}). Rode 'python -m capture_service'.")
+
+    def isOpened(self):
+        return self.ring is not None
+
+    def service_alive(self):
+        header = self.ring.header
+        if header[_H_STATUS] != _STATUS_RUNNING:
+            return False
+        return (time.monotonic_ns() - header[_H_HEARTBEAT]) / 1e9 < STALE_AFTER
+
+    def _read(self):
+        if self.ring is None:
+            return False, None
+        deadline = time.monotonic() + self.timeout
+        while self.ring.header[_H_WRITE_SEQ] <= self.last_seq:
+            if time.monotonic() > deadline or not self.service_alive():
+                return False, None
+            time.sleep(POLL_INTERVAL)
+
+        latest = self.ring.latest()
+        if latest is None:
+            return False, None
+        seq, self.timestamp, frame = latest
+        if self.last_seq:
+            self.skipped += seq - self.last_seq - 1
+        self.last_seq = seq
+        return True, frame
+
+    def stats(self):
+        return {"frames_read": self.frames_read, "skipped": self.skipped, "latest_seq": self.last_seq}
+
+    def release(self):
+        if self.ring is not None:
+            self.ring.close()
+            self.ring = None
+
+class CaptureService:
+    """
+    Dono da fonte de frames: lê sem parar e publica cada frame no FrameRing.
+    O anel é dimensionado pelo primeiro frame (ou por `max_shape`).
+    """
+
+    def __init__(self, capture, name=DEFAULT_NAME, slots=8, max_shape=None, fps=0.0):
+        self.capture = capture
+        self.name = name
+        self.slots = slots
+        self.max_shape = max_shape
+        self.fps = fps
+        self.ring = None
+        self.published = 0
+        self.failures = 0
+
+    def run(self, stop_event=None, max_frames=None):
+        ok, frame = self.capture.read()
+        if not ok:
+            print("Erro: a fonte do serviço de captura não entregou nenhum frame.")
+            return
+        self.ring = FrameRing(self.name, self.slots, self.max_shape or frame.shape, create=True)
+        header = self.ring.header
+        header[_H_FPS_MILLI] = int(self.fps * 1000)
+        header[_H_STATUS] = _STATUS_RUNNING
+        try:
+            while stop_event is None or not stop_event.is_set():
+                header[_H_HEARTBEAT] = time.monotonic_ns()
+                if ok:
+                    self.ring.publish(frame, time.monotonic_ns())
+                    self.published += 1
+                    if max_frames is not None and self.published >= max_frames:
+                        break
+                else:
+                    # Fonte sem frame: continua esperando ela voltar
+                    self.failures += 1
+                    time.sleep(0.01)
+                ok, frame = self.capture.read()
+        finally:
+            header[_H_STATUS] = _STATUS_STOPPED
+            del header
+            self.ring.close(unlink=True)
+            self.capture.release()
+
+def _parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m capture_service",
+                                     description="Publica os frames de uma câmera para vários processos.")
+    parser.add_argument("--source", default="webcam", help="fonte de frames, como em VISION_GAMES_SOURCE (ver frame_sources)")
+    parser.add_argument("--size", type=_parse_size, help="resolução pedida à fonte, ex.: 1280x720")
+    parser.add_argument("--name", default=DEFAULT_NAME, help="nome do bloco de memória compartilhada")
+    parser.add_argument("--slots", type=int, default=8, help="frames no anel")
+    args = parser.parse_args(argv)
+
+    capture = open_frame_source(args.source, size=args.size)
+    if not capture.isOpened():
+        print(f"Erro: não foi possível abrir a fonte '{args.source}'.")
+        return 1
+    service = CaptureService(capture, args.name, args.slots, fps=capture.fps)
+    print(f"Serviço de captura '{args.name}' publicando '{args.source}' (Ctrl+C encerra).")
+    # kill/SIGTERM também passa pelo encerramento normal (apaga a memória compartilhada)
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        pass
+    print(f"{service.published} frames publicados.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+import numpy as np
+
+# A partir de quantos pares (n * m) vale a pena usar a grade uniforme
+GRID_MIN_PAIRS = 4096
+
+def entity_bounds(entities):
+    """Array (n, 4) com (esquerda, topo, direita, base) de entidades quadradas com x, y e size."""
+    if not entities:
+        return np.empty((0, 4), dtype=np.float64)
+    return np.array([(e.x, e.y, e.x + e.size, e.y + e.size) for e in entities], dtype=np.float64)
+
+def _overlaps(a, b):
+    # Mesma regra de QRectF.intersects: sobreposição estrita (bordas encostadas não colidem)
+    return (a[..., 0] < b[..., 2]) & (b[..., 0] < a[..., 2]) & (a[..., 1] < b[..., 3]) & (b[..., 1] < a[..., 3])
+
+def _dense_pairs(a, b):
+    hits = _overlaps(a[:, None, :], b[None, :, :])
+    return np.nonzero(hits)
+
+def _cells(bounds, cell_size, origin):
+    """Expande cada caixa para a lista de células da grade que ela cobre: (índice da caixa, id da célula)."""
+    first = np.floor((bounds[:, :2] - origin) / cell_size).astype(np.int64)
+    last = np.floor((bounds[:, 2:] - origin) / cell_size).astype(np.int64)
+    spans = last - first + 1
+    per_box = spans[:, 0] * spans[:, 1]
+    owner = np.repeat(np.arange(len(bounds)), per_box)
+    # Posição de cada célula dentro do retângulo de células da sua caixa
+    offset = np.arange(per_box.sum()) - np.repeat(np.cumsum(per_box) - per_box, per_box)
+    cx = first[owner, 0] + offset // spans[owner, 1]
+    cy = first[owner, 1] + offset % spans[owner, 1]
+    return owner, (cx << 32) + cy
+
+def _grid_pairs(a, b):
+    everything = np.concatenate((a, b))
+    origin = everything[:, :2].min(axis=0)
+    cell_size = max(float((everything[:, 2:] - everything[:, :2]).max()), 1.0)
+
+    a_owner, a_cell = _cells(a, cell_size, origin)
+    b_owner, b_cell = _cells(b, cell_size, origin)
+    order = np.argsort(b_cell, kind="stable")
+    b_cell, b_owner = b_cell[order], b_owner[order]
+
+    # Para cada célula de `a`, o intervalo de caixas de `b` na mesma célula
+    start = np.searchsorted(b_cell, a_cell, side="left")
+    counts = np.searchsorted(b_cell, a_cell, side="right") - start
+    candidate_i = np.repeat(a_owner, counts)
+    positions = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts) + np.repeat(start, counts)
+    candidate_j = b_owner[positions]
+
+    # Um par pode dividir várias células: remove duplicados (e já ordena por i, depois j)
+    keys = np.unique(candidate_i * len(b) + candidate_j)
+    i, j = keys // len(b), keys % len(b)
+    hit = _overlaps(a[i], b[j])
+    return i[hit], j[hit]
+
+def overlap_pairs(a, b, use_grid=None):
+    """
+    Todos os pares (i, j) em que a caixa a[i] intersecta b[j], ordenados por i e depois j.
+
+    Para poucos pares testa a matriz completa de uma vez; acima de GRID_MIN_PAIRS
+    usa uma grade uniforme (células do tamanho da maior caixa) como broadphase.
+    """
+    if len(a) == 0 or len(b) == 0:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    if use_grid is None:
+        use_grid = len(a) * len(b) >= GRID_MIN_PAIRS
+    if use_grid:
+        return _grid_pairs(a, b)
+    return _dense_pairs(a, b)
+
+def group_pairs(i, j):
+    """Agrupa os pares por i: lista de (i, [j, ...]) na ordem de i."""
+    if len(i) == 0:
+        return []
+    rows, starts = np.unique(i, return_index=True)
+    return list(zip(rows.tolist(), (group.tolist() for group in np.split(j, starts[1:]))))
@@ -0,0 +1,77 @@
+"""
+Pools das entidades que nascem e somem o tempo todo (frutas, obstáculos, coletáveis).
+
+Em vez de criar um objeto a cada spawn e jogá-lo fora quando sai da tela, o jogo
+pede um ao pool (acquire) e o devolve (release); o objeto é reinicializado por
+reset(). Depois do aquecimento (ou de um reserve() no início da partida) uma
+partida longa não cria mais nenhuma entidade, o que tira esse lixo do coletor
+de ciclos. `allocated` conta os objetos criados de fato e `high_water` o maior
+número simultâneo em uso; pool_stats() junta os pools vivos (relatório headless).
+"""
+import weakref
+
+_pools = weakref.WeakSet()
+
+class EntityPool:
+    """
+    Pool de um tipo de entidade. `cls` precisa de __slots__ e de um reset(*args)
+    que reinicialize todos os campos; acquire(*args) repassa os argumentos a ele.
+    """
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.name = cls.__name__
+        self._free = []
+        self.allocated = 0   # objetos criados (sem contar os reaproveitados)
+        self.acquired = 0
+        self.in_use = 0
+        self.high_water = 0
+        _pools.add(self)
+
+    def _new(self):
+        self.allocated += 1
+        # Sem __init__: o reset() do acquire preenche todos os campos
+        return self.cls.__new__(self.cls)
+
+    def reserve(self, count):
+        """Garante `count` objetos livres (ex.: no início da partida, fora do laço do jogo)."""
+        while len(self._free) < count:
+            self._free.append(self._new())
+
+    def acquire(self, *args):
+        entity = self._free.pop() if self._free else self._new()
+        entity.reset(*args)
+        self.acquired += 1
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return entity
+
+    def release(self, entity):
+        self.in_use -= 1
+        self._free.append(entity)
+
+    def release_all(self, entities):
+        """Devolve todas as entidades da lista e a esvazia."""
+        for entity in entities:
+            self.release(entity)
+        entities.clear()
+
+    def stats(self):
+        return {
+            "allocated": self.allocated,
+            "acquired": self.acquired,
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "free": len(self._free),
+        }
+
+def pool_stats():
+    """Estatísticas dos pools vivos, somadas por tipo (high_water: o maior entre eles)."""
+    totals = {}
+    for pool in list(_pools):
+        stats = pool.stats()
+        total = totals.setdefault(pool.name, dict.fromkeys(stats, 0))
+        for key, value in stats.items():
+            total[key] = max(total[key], value) if key == "high_water" else total[key] + value
+    return totals
@@ -1,32 +1,80 @@
+import os
 import sys
-import random
 import math 
+import time
+import numpy as np
 from PySide6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QStackedWidget
 from PySide6.QtCore import Qt, QTimer, QPoint, Signal, QRectF # Removida a importação de Signal, não será usada
 from PySide6.QtGui import QPixmap, QPainter, QPen, QFont, QImage, QColor
 
-import mediapipe as mp 
 
 from camera_face import FaceCamera
-from game_objects_face import Obstacle, Player, Collectible 
-
-mp_drawing = mp.solutions.drawing_utils
-mp_drawing_styles = mp.solutions.drawing_styles
+from game_objects_face import Obstacle, Player, Collectible, preload_sprites
+from entity_pool import EntityPool
+from spawn_scheduler import SpawnScheduler
+from face_tracker import FaceTracker, face_reference_point
+from landmarks import MAX_FACES
+from session_recording import camera_from_env
+from inference_roi import inference_region_from_env
+from landmark_filters import frame_skipper_from_env
+from frame_sources import parse_source_args
+from headless import run_headless
+from leaderboard import shared_leaderboard
+from inference_profiles import profile_for
+from camera_loader import CameraLoader, report_startup
+from inference_governor import InferenceGovernor, OFF, FULL
+from collision import entity_bounds, overlap_pairs, group_pairs
+from game_loop import FixedStepLoop, SimulationTimer
+from frame_profiler import profiler
+from landmark_overlay import face_mesh_overlay
+
+
+# VISION_GAMES_FACE_WORKER=1 roda câmera + FaceMesh em um processo separado
+FACE_WORKER_ENABLED = os.environ.get("VISION_GAMES_FACE_WORKER") == "1"
+
+def final_scores_message(scores, num_players):
+    """Texto do placar final: "Pontuação Final: X" com 1 jogador, "P1: X | P2: Y | ..." com mais."""
+    if num_players == 1:
+        return f"Pontuação Final: {scores.get(1, 0)}"
+    return "Pontuações Finais: " + " | ".join(f"P{pid}: {scores.get(pid, 0)}" for pid in range(1, num_players + 1))
 
 class FaceGameWidget(QWidget):
     # REMOVIDO: game_finished = Signal(dict) -- Não usaremos mais este sinal
 
-    def __init__(self, colors, parent=None): # Adicionado parent para boas práticas
+    def __init__(self, colors, parent=None, camera_kwargs=None): # Adicionado parent para boas práticas
         super().__init__(parent)
         self.colors = colors
-        self.camera = FaceCamera()
+        # Câmera + FaceMesh abrem numa thread depois que a janela aparece (ver camera_loader.py).
+        # Com `camera_kwargs` (launcher: fonte e pool compartilhados), sempre dentro do processo
+        self.camera = None
+        self.overlay = None
+        camera_kwargs = camera_kwargs or {}
+        # FaceMesh do perfil do jogo (sem íris por padrão; VISION_GAMES_PROFILE_FACE, ver inference_profiles.py).
+        # A câmera abre no perfil solo e troca pelo da partida em start_game(); o worker em
+        # outro processo não troca de modelo, então já abre com o limite de rostos do modo grupo
+        out_of_process = FACE_WORKER_ENABLED and not camera_kwargs
+        self.inference_profile = profile_for("face", MAX_FACES) if out_of_process else profile_for("face")
+        self.camera_loader = CameraLoader(lambda: camera_from_env("face", lambda: FaceCamera(
+            threaded=True, out_of_process=out_of_process,
+            inference_region=inference_region_from_env(self.inference_profile.max_items),
+            frame_skip=frame_skipper_from_env("face"), profile=self.inference_profile, **camera_kwargs)), self)
+        self.camera_loader.ready.connect(self._on_camera_ready)
+        QTimer.singleShot(0, self.camera_loader.start)
         self.camera_pixmap = QPixmap()
         
         self.players = {} 
         self.num_players_current_game = 0 
+        # Rosto -> jogador (ID estável entre frames; ver face_tracker.py)
+        self.face_tracker = FaceTracker()
+        self._tracked_frame = None  # nº do último frame visto pelo rastreador
+        self._face_ids = []         # ID de jogador de cada rosto desse frame
+        self._drawn_frame = (None, None)  # (nº do frame, landmarks) já desenhados em camera_pixmap
 
         self.obstacles = []
         self.collectibles = [] 
+        # Obstáculos/coletáveis reaproveitados entre spawns (ver entity_pool.py)
+        self.obstacle_pool = EntityPool(Obstacle)
+        self.collectible_pool = EntityPool(Collectible)
         
         self.scores = {}
         self.lives = {}
@@ -35,20 +83,17 @@ class FaceGameWidget(QWidget):
         self.game_paused_by_face_count = False 
         self.warning_message = "" 
 
-        self.game_timer = QTimer(self)
-        self.game_timer.timeout.connect(self.update_game_state)
+        # Entrada (câmera) uma vez por tick, simulação em passos fixos de 1/60 s, desenho interpolado
+        self.game_loop = FixedStepLoop(self, step=self._step_simulation, render=lambda alpha: self.update(),
+                                       before_steps=self.update_game_state)
         
-        self.spawn_timer = QTimer(self)
-        self.spawn_timer.timeout.connect(self.spawn_game_object) 
+        # Spawn e escudos contam passos da simulação (iguais em todo replay), não o relógio de parede
+        self.spawn_timer = SimulationTimer(self.game_loop, self.spawn_game_object)
         
-        self.shield_timers = {
-            1: QTimer(self),
-            2: QTimer(self)
-        }
-        self.shield_timers[1].setSingleShot(True)
-        self.shield_timers[1].timeout.connect(lambda: self._deactivate_shield(1))
-        self.shield_timers[2].setSingleShot(True)
-        self.shield_timers[2].timeout.connect(lambda: self._deactivate_shield(2))
+        self.shield_timers = {}
+        for player_id in range(1, MAX_FACES + 1):
+            self.shield_timers[player_id] = SimulationTimer(
+                self.game_loop, lambda player_id=player_id: self._deactivate_shield(player_id), single_shot=True)
 
         self.current_spawn_rate = 800 
         self.min_obstacle_speed = 5   
@@ -73,27 +118,49 @@ class FaceGameWidget(QWidget):
         ]
         self.collectible_spawn_chance = 0.2 
 
+        # RNG próprio dos spawns e tabelas de sorteio montadas uma vez (ver spawn_scheduler.py)
+        self.spawner = SpawnScheduler()
+        self.obstacle_table = self.spawner.table(self.obstacle_specs)
+        self.collectible_table = self.spawner.table(self.collectible_specs) if self.collectible_specs else None
+
         # NOVO: Callback para notificar a MainWindow sobre o fim do jogo
         self.game_finished_callback = None 
 
+    def _on_camera_ready(self, camera):
+        self.camera = camera
+        # O MediaPipe já foi importado pela thread do loader: aqui só monta as tabelas da malha
+        self.overlay = face_mesh_overlay(irises=self.inference_profile.refine_landmarks)
+
     def set_game_finished_callback(self, callback):
         self.game_finished_callback = callback
 
     def start_game(self, num_players):
         print(f"DEBUG: Iniciando jogo para {num_players} jogadores.")
         self.num_players_current_game = num_players
-        self.scores = {1: 0}
-        self.lives = {1: 3}
-        self.players = {1: Player(1, self.width(), self.height(), self.colors, image_path="assets/face-game/player.png")}
-
-        if num_players == 2:
-            self.scores[2] = 0
-            self.lives[2] = 3
-            self.players[2] = Player(2, self.width(), self.height(), self.colors, image_path="assets/face-game/player.png")
+        preload_sprites([spec[0] for spec in self.obstacle_specs + self.collectible_specs], "assets/face-game/player.png")
+        # Ao gravar/reproduzir uma sessão, o RNG usa a semente da gravação
+        self.spawner.seed(self.camera.begin_session())
+        player_ids = range(1, num_players + 1)
+        self.scores = {player_id: 0 for player_id in player_ids}
+        self.lives = {player_id: 3 for player_id in player_ids}
+        self.players = {player_id: Player(player_id, self.width(), self.height(), self.colors,
+                                          image_path="assets/face-game/player.png", num_players=num_players)
+                        for player_id in player_ids}
+        self.face_tracker.reset(num_players)
+        self._tracked_frame, self._face_ids = None, []
+        # FaceMesh com o limite de rostos da partida: solo/dupla não procuram nem
+        # processam rostos de quem está atrás (ver inference_profiles.py)
+        self.camera.set_profile(profile_for("face", num_players))
+        if getattr(self.camera, "inference_region", None) is not None:
+            # Recorte da inferência: volta ao frame inteiro enquanto faltar rosto de algum jogador
+            self.camera.inference_region.max_items = num_players
 
         self.game_over = False
-        self.obstacles.clear()
-        self.collectibles.clear() 
+        self.obstacle_pool.release_all(self.obstacles)
+        self.collectible_pool.release_all(self.collectibles)
+        # Com o spawn mais rápido (200 ms) e a queda mais lenta cabem ~30 obstáculos na tela
+        self.obstacle_pool.reserve(32)
+        self.collectible_pool.reserve(8)
         
         for player_id in self.players:
             self.players[player_id].invincible = False
@@ -107,14 +174,18 @@ class FaceGameWidget(QWidget):
         self.current_spawn_rate = 800 
         self.min_obstacle_speed = 5   
         self.max_obstacle_speed = 10  
-        self.game_timer.start(16)
+        self.session_start = time.monotonic()
+        self.session_duration = 0.0
+        self.game_loop.clock = self.camera.game_clock
+        self.game_loop.start()
         print(f"DEBUG: Pontuações iniciais: {self.scores}")
 
 
     def end_game(self):
         print("DEBUG: end_game chamado.")
         self.game_over = True
-        self.game_timer.stop()
+        self.session_duration = time.monotonic() - self.session_start
+        self.game_loop.stop()
         self.spawn_timer.stop()
         for timer in self.shield_timers.values(): timer.stop()
         
@@ -132,20 +203,17 @@ class FaceGameWidget(QWidget):
     def spawn_game_object(self):
         if self.game_over or self.game_paused_by_face_count: return 
 
-        if random.random() < self.collectible_spawn_chance and self.collectible_specs:
-            images_paths = [spec[0] for spec in self.collectible_specs]
-            weights = [spec[1] for spec in self.collectible_specs]
-            selected_image_path = random.choices(images_paths, weights=weights, k=1)[0]
-            collectible = Collectible(self.width(), self.height(), image_path=selected_image_path)
-            collectible.speed = random.randint(self.min_obstacle_speed + 1, self.max_obstacle_speed + 2) 
+        spawner = self.spawner
+        rng = spawner.rng
+        if spawner.chance(self.collectible_spawn_chance) and self.collectible_table:
+            selected_image_path = spawner.pick(self.collectible_table)
+            collectible = self.collectible_pool.acquire(self.width(), self.height(), selected_image_path, rng)
+            collectible.speed = rng.randint(self.min_obstacle_speed + 1, self.max_obstacle_speed + 2) 
             self.collectibles.append(collectible)
         else:
-            if not self.obstacle_specs: return 
-            images_paths = [spec[0] for spec in self.obstacle_specs]
-            weights = [spec[1] for spec in self.obstacle_specs]
-            selected_image_path = random.choices(images_paths, weights=weights, k=1)[0]
-            obstacle = Obstacle(self.width(), self.height(), image_path=selected_image_path)
-            obstacle.speed = random.randint(self.min_obstacle_speed, self.max_obstacle_speed)
+            selected_image_path = spawner.pick(self.obstacle_table)
+            obstacle = self.obstacle_pool.acquire(self.width(), self.height(), selected_image_path, rng)
+            obstacle.speed = rng.randint(self.min_obstacle_speed, self.max_obstacle_speed)
             self.obstacles.append(obstacle)
 
     def _calculate_mouth_distance(self, landmarks):
@@ -169,123 +237,79 @@ class FaceGameWidget(QWidget):
         if self.game_over: return
 
         rgb_frame, results = self.camera.get_frame()
+        if self.camera.capture_error is not None:
+            # O frame é o último bom da thread de captura: pausa como se faltasse rosto
+            self.game_paused_by_face_count = True
+            self.spawn_timer.stop()
+            self.warning_message = "Falha na Câmera"
+            return
         if rgb_frame is None: return
 
-        white_drawing_spec_contour = mp_drawing.DrawingSpec(color=(255, 255, 255), thickness=1, circle_radius=1)
-        white_drawing_spec_tesselation = mp_drawing.DrawingSpec(color=(220, 220, 220), thickness=1, circle_radius=1)
-        white_drawing_spec_iris = mp_drawing.DrawingSpec(color=(255, 255, 255), thickness=1, circle_radius=1)
-
-
-        if results.multi_face_landmarks:
-            for face_landmarks in results.multi_face_landmarks:
-                mp_drawing.draw_landmarks(
-                    image=rgb_frame,
-                    landmark_list=face_landmarks,
-                    connections=self.camera.mp_face_mesh.FACEMESH_TESSELATION, 
-                    landmark_drawing_spec=None, 
-                    connection_drawing_spec=white_drawing_spec_tesselation 
-                )
-                mp_drawing.draw_landmarks(
-                    image=rgb_frame,
-                    landmark_list=face_landmarks,
-                    connections=self.camera.mp_face_mesh.FACEMESH_CONTOURS, 
-                    landmark_drawing_spec=None, 
-                    connection_drawing_spec=white_drawing_spec_contour 
-                )
-                mp_drawing.draw_landmarks(
-                    image=rgb_frame,
-                    landmark_list=face_landmarks,
-                    connections=self.camera.mp_face_mesh.FACEMESH_IRISES, 
-                    landmark_drawing_spec=None, 
-                    connection_drawing_spec=white_drawing_spec_iris 
-                )
-
-
-        self.camera_pixmap = self._convert_frame_to_pixmap(rgb_frame)
-
-        num_faces_detected = 0
-        if results.multi_face_landmarks:
-            num_faces_detected = len(results.multi_face_landmarks)
-
-        required_faces = self.num_players_current_game
-
-        if num_faces_detected == required_faces: 
+        frame_seq, captured_at = self.camera.last_frame
+        if (frame_seq, results) != self._drawn_frame:
+            # O mesmo array da câmera volta em vários ticks (e, com landmarks previstos, com
+            # outra malha a cada tick): desenha numa cópia, e só quando frame ou landmarks mudam
+            self._drawn_frame = (frame_seq, results)
+            frame = rgb_frame.copy()
+            # Malha, contornos e íris de todos os rostos: um cv2.polylines por camada
+            with profiler.span("mesh_drawing"):
+                self.overlay.draw(frame, results.multi_face_landmarks)
+
+            with profiler.span("convert_frame_to_pixmap"):
+                self.camera_pixmap = self._convert_frame_to_pixmap(frame)
+
+        # Cada rosto vai para o jogador que o rastreador manteve (e não para a ordem do nariz no frame).
+        # Com thread/worker o mesmo frame volta em vários ticks: o rastreador só vê frames
+        # novos, com o horário da captura, para os IDs não dependerem da taxa de ticks
+        faces = results.multi_face_landmarks or []
+        if frame_seq != self._tracked_frame:
+            self._tracked_frame = frame_seq
+            points = [face_reference_point(face) for face in faces]
+            self._face_ids = self.face_tracker.update(points, captured_at).tolist()
+        now = self.camera.game_clock()  # mesmo relógio de captured_at (no replay, o da gravação)
+        # Landmarks previstos entre inferências mantêm a ordem dos rostos do frame
+        for landmarks, player_id in zip(faces, self._face_ids):
+            player = self.players.get(player_id)
+            if player is None or player.is_out: continue # rosto sem vaga (a mais) ou jogador fora
+            nose_tip = landmarks.landmark[1]
+            player.update_position(int(nose_tip.x * self.width()))
+
+            mouth_distance = self._calculate_mouth_distance(landmarks)
+            if mouth_distance > self.MOUTH_OPEN_THRESHOLD:
+                self._activate_shield(player_id)
+
+        # Só pausa quando um jogador ainda em jogo some por mais que a tolerância do rastreador
+        missing = [pid for pid in self.face_tracker.missing(now) if not self.players[pid].is_out]
+        if not missing:
             self.game_paused_by_face_count = False 
             if not self.spawn_timer.isActive(): 
                 self.spawn_timer.start(self.current_spawn_rate)
-
-            sorted_faces = sorted(results.multi_face_landmarks, key=lambda f: f.landmark[1].x)
-
-            for i in range(required_faces):
-                player_id = i + 1 
-                if player_id in self.players and not self.players[player_id].is_out:
-                    landmarks = sorted_faces[i] 
-                    nose_tip = landmarks.landmark[1]
-                    target_x_player = int(nose_tip.x * self.width())
-                    self.players[player_id].update_position(target_x_player)
-                    
-                    mouth_distance = self._calculate_mouth_distance(landmarks)
-                    if mouth_distance > self.MOUTH_OPEN_THRESHOLD:
-                        self._activate_shield(player_id)
-            
             self.warning_message = "" 
         else: 
             self.game_paused_by_face_count = True 
             self.spawn_timer.stop() 
-            self.obstacles.clear() 
-            self.collectibles.clear() 
+            self.obstacle_pool.release_all(self.obstacles)
+            self.collectible_pool.release_all(self.collectibles)
 
-            self.warning_message = f"Mínimo de {required_faces} rosto(s) na câmera para jogar!"
-            
+            if self.num_players_current_game == 1:
+                self.warning_message = "Mínimo de 1 rosto(s) na câmera para jogar!"
+            else:
+                self.warning_message = "Aguardando na câmera: " + ", ".join(f"P{pid}" for pid in missing)
+
+    def _step_simulation(self):
+        """Um passo fixo de pulo, movimento e colisões (a entrada vem de update_game_state)."""
+        if self.game_over: return
         for player_id in self.players:
             self.players[player_id].update_jump()
         
         if not self.game_paused_by_face_count:
             
-            for obstacle in list(self.obstacles):
-                obstacle.update()
-                if obstacle.y > self.height():
-                    self.obstacles.remove(obstacle)
-                else:
-                    for player_id in list(self.players.keys()): 
-                        player = self.players[player_id]
-                        if player.is_out: continue 
-
-                        if player.get_rect().intersects(obstacle.get_rect()):
-                            if player.invincible:
-                                self.obstacles.remove(obstacle)
-                                self.scores[player_id] = max(0, self.scores[player_id] - 5) 
-                                print(f"DEBUG: P{player_id} Score (colisão com escudo): {self.scores[player_id]}")
-                                break 
-                            else:
-                                self.lives[player_id] -= 1
-                                if self.lives[player_id] <= 0:
-                                    player.is_out = True 
-                                    player.invincible = False 
-                                    if player_id in self.shield_timers:
-                                        self.shield_timers[player_id].stop() 
-                                    
-                                self.obstacles.remove(obstacle)
-                                print(f"DEBUG: P{player_id} Vida perdida. Vidas restantes: {self.lives[player_id]}. Pontuações atuais: {self.scores}")
-                                break 
+            self.obstacles = self._update_and_collide(self.obstacles, self._on_obstacle_hit, self.obstacle_pool)
             
             if all(player.is_out for player in self.players.values()):
                 self.end_game()
 
-            for collectible in list(self.collectibles):
-                collectible.update()
-                if collectible.y > self.height():
-                    self.collectibles.remove(collectible)
-                else:
-                    for player_id in list(self.players.keys()):
-                        player = self.players[player_id]
-                        if player.is_out: continue 
-
-                        if player.get_rect().intersects(collectible.get_rect()):
-                            self.collectibles.remove(collectible)
-                            self.scores[player_id] += 10 
-                            print(f"DEBUG: P{player_id} Coletou! Score: {self.scores[player_id]}")
-                            break 
+            self.collectibles = self._update_and_collide(self.collectibles, self._on_collectible_hit, self.collectible_pool)
 
             total_score = sum(self.scores.values())
             if total_score > 0 and total_score % 40 == 0 and self.spawn_timer.interval() > 200: 
@@ -296,35 +320,106 @@ class FaceGameWidget(QWidget):
                 self.max_obstacle_speed = min(self.max_obstacle_speed + 2, 25) 
                 active_players = [pid for pid, p in self.players.items() if not p.is_out]
                 if active_players:
-                    chosen_player = random.choice(active_players)
+                    chosen_player = self.spawner.rng.choice(active_players)
                     self.scores[chosen_player] += 1 
                     print(f"DEBUG: P{chosen_player} Ponto extra por dificuldade! Score: {self.scores[chosen_player]}")
-                
-        self.update() 
+
+    def _update_and_collide(self, entities, on_hit, pool=None):
+        """
+        Move as entidades, descarta as que saíram da tela e resolve as colisões com os
+        jogadores de uma vez por frame: todas as caixas são testadas juntas em NumPy
+        (com grade uniforme quando há muitas) e as remoções saem num único filtro.
+        O resultado é o mesmo do laço par a par: cada entidade colide no máximo com um
+        jogador, o primeiro na ordem do dicionário que ainda não estiver fora.
+        As removidas voltam ao `pool` (se houver) e a lista é compactada no lugar;
+        retorna a própria lista.
+        """
+        if not entities: return entities
+        for entity in entities:
+            entity.update()
+
+        bounds = entity_bounds(entities)
+        removed = bounds[:, 1] > self.height()
+
+        active_ids = [pid for pid, player in self.players.items() if not player.is_out]
+        player_bounds = np.array([self.players[pid].get_bounds() for pid in active_ids], dtype=np.float64).reshape(-1, 4)
+        rows, cols = overlap_pairs(bounds, player_bounds)
+        on_screen = ~removed[rows]
+
+        for i, hit_players in group_pairs(rows[on_screen], cols[on_screen]):
+            for j in hit_players:
+                player_id = active_ids[j]
+                player = self.players[player_id]
+                if player.is_out: continue # pode ter saído com uma colisão anterior neste mesmo frame
+                on_hit(player_id, player)
+                removed[i] = True
+                break
+
+        if not removed.any(): return entities
+        kept = 0
+        for entity, gone in zip(entities, removed.tolist()):
+            if gone:
+                if pool is not None: pool.release(entity)
+                continue
+            entities[kept] = entity
+            kept += 1
+        del entities[kept:]
+        return entities
+
+    def _on_obstacle_hit(self, player_id, player):
+        if player.invincible:
+            self.scores[player_id] = max(0, self.scores[player_id] - 5) 
+            print(f"DEBUG: P{player_id} Score (colisão com escudo): {self.scores[player_id]}")
+        else:
+            self.lives[player_id] -= 1
+            if self.lives[player_id] <= 0:
+                player.is_out = True 
+                player.invincible = False 
+                if player_id in self.shield_timers:
+                    self.shield_timers[player_id].stop() 
+            print(f"DEBUG: P{player_id} Vida perdida. Vidas restantes: {self.lives[player_id]}. Pontuações atuais: {self.scores}")
+
+    def _on_collectible_hit(self, player_id, player):
+        self.scores[player_id] += 10 
+        print(f"DEBUG: P{player_id} Coletou! Score: {self.scores[player_id]}")
 
     def paintEvent(self, event):
+        with profiler.span("paintEvent"):
+            self._paint_scene()
+
+    def _paint_scene(self):
         painter = QPainter(self)
         if not self.camera_pixmap.isNull(): painter.drawPixmap(self.rect(), self.camera_pixmap)
         
+        alpha = self.game_loop.alpha
         for player_id in self.players:
-            self.players[player_id].draw(painter) 
+            self.players[player_id].draw(painter, alpha) 
             
         if not self.game_paused_by_face_count:
             for obstacle in self.obstacles:
-                obstacle.draw(painter, color=self.colors["accent_red"])
+                obstacle.draw(painter, color=self.colors["accent_red"], alpha=alpha)
             for collectible in self.collectibles:
-                collectible.draw(painter) 
+                collectible.draw(painter, alpha) 
 
         painter.setFont(QFont("Arial", 24, QFont.Bold))
         painter.setPen(QColor(self.colors["text_light"]))
 
-        if 1 in self.players:
-            painter.drawText(20, 40, f"P1 Score: {self.scores.get(1, 0)}")
-            painter.drawText(20, 70, f"P1 Vidas: {self.lives.get(1, 0) if self.lives.get(1,0) > 0 else 'FORA'}")
-        
-        if 2 in self.players: 
-            painter.drawText(self.width() - 200, 40, f"P2 Score: {self.scores.get(2, 0)}")
-            painter.drawText(self.width() - 200, 70, f"P2 Vidas: {self.lives.get(2, 0) if self.lives.get(2,0) > 0 else 'FORA'}")
+        if len(self.players) <= 2:
+            if 1 in self.players:
+                painter.drawText(20, 40, f"P1 Score: {self.scores.get(1, 0)}")
+                painter.drawText(20, 70, f"P1 Vidas: {self.lives.get(1, 0) if self.lives.get(1,0) > 0 else 'FORA'}")
+            
+            if 2 in self.players: 
+                painter.drawText(self.width() - 200, 40, f"P2 Score: {self.scores.get(2, 0)}")
+                painter.drawText(self.width() - 200, 70, f"P2 Vidas: {self.lives.get(2, 0) if self.lives.get(2,0) > 0 else 'FORA'}")
+        else:
+            # Grupo: uma coluna por jogador no topo da tela
+            painter.setFont(QFont("Arial", 18, QFont.Bold))
+            column_width = self.width() // len(self.players)
+            for i, player_id in enumerate(self.players):
+                lives = self.lives.get(player_id, 0)
+                painter.drawText(i * column_width + 20, 35, f"P{player_id} Score: {self.scores.get(player_id, 0)}")
+                painter.drawText(i * column_width + 20, 62, f"P{player_id} Vidas: {lives if lives > 0 else 'FORA'}")
         
         if self.warning_message: 
             painter.setFont(QFont("Arial", 28, QFont.Bold)) 
@@ -338,15 +433,12 @@ class FaceGameWidget(QWidget):
             
             print(f"DEBUG: Pontuações no paintEvent (Game Over): {self.scores}")
             
-            final_scores_text = ""
-            if self.num_players_current_game == 1:
-                final_scores_text = f"Pontuação Final: {self.scores.get(1, 0)}"
-            else: # 2 jogadores
-                final_scores_text = f"Pontuações Finais: P1: {self.scores.get(1, 0)} | P2: {self.scores.get(2, 0)}"
+            final_scores_text = final_scores_message(self.scores, self.num_players_current_game)
 
             painter.setFont(QFont("Arial", 30))
             painter.drawText(self.rect().adjusted(0, 80, 0, 0), Qt.AlignCenter, final_scores_text)
 
+        profiler.draw_hud(painter)
         painter.end() 
 
     def _convert_frame_to_pixmap(self, frame):
@@ -355,7 +447,7 @@ class FaceGameWidget(QWidget):
         return QPixmap.fromImage(qt_image)
 
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, camera_kwargs=None):
         super().__init__()
         self.setWindowTitle("Esquiva Facial Multiplayer")
         self.setGeometry(100, 100, 1400, 900)
@@ -373,12 +465,14 @@ class MainWindow(QWidget):
         }
         self.setStyleSheet(f"background-color: {self.colors['bg_dark']}; color: {self.colors['text_dark']};")
 
-        self.highscore = self._load_highscore() 
+        # Recorde vem do placar SQLite (consulta indexada; migra o highscore_face.txt antigo)
+        self.leaderboard = shared_leaderboard()
+        self.highscore = self.leaderboard.best_score("face")
 
         self.stack = QStackedWidget()
         self.home_screen = self._create_home_screen()
         # Garante que game_widget é criado apenas uma vez
-        self.game_widget = FaceGameWidget(self.colors) 
+        self.game_widget = FaceGameWidget(self.colors, camera_kwargs=camera_kwargs)
         self.game_over_screen = self._create_game_over_screen()
         
         self.stack.addWidget(self.home_screen)
@@ -387,6 +481,15 @@ class MainWindow(QWidget):
         
         # Conecta o callback APENAS UMA VEZ
         self.game_widget.set_game_finished_callback(self.show_game_over_screen)
+        self.game_widget.camera_loader.ready.connect(self._on_camera_ready)
+        self.game_widget.camera_loader.failed.connect(self._on_camera_failed)
+        # Início e fim de jogo são telas estáticas: captura pausada fora da partida
+        self.governor = InferenceGovernor(self.stack, {
+            self.home_screen: ("inicio", OFF),
+            self.game_widget: ("jogo", FULL),
+            self.game_over_screen: ("fim", OFF),
+        }, parent=self)
+        self.governor.watch(self.game_widget.camera_loader)
 
 
         layout = QVBoxLayout()
@@ -394,15 +497,6 @@ class MainWindow(QWidget):
         layout.addWidget(self.stack)
         self.setLayout(layout)
 
-    def _load_highscore(self):
-        try:
-            with open("highscore_face.txt", "r") as f:
-                return int(f.read())
-        except (FileNotFoundError, ValueError): return 0
-
-    def _save_highscore(self):
-        with open("highscore_face.txt", "w") as f: f.write(str(self.highscore))
-
     def _create_home_screen(self):
         widget = QWidget()
         layout = QVBoxLayout(widget, alignment=Qt.AlignCenter, spacing=20)
@@ -432,13 +526,45 @@ class MainWindow(QWidget):
         start_2p_btn.setFont(QFont("Arial", 20))
         start_2p_btn.setStyleSheet(f"background-color: {self.colors['primary']}; border-radius: 15px; color: {self.colors['text_light']};")
         start_2p_btn.clicked.connect(lambda: self.start_game_mode(2)) 
+
+        # Grupo: de 3 a MAX_FACES jogadores, cada um com o ID que o rastreador mantém
+        group_layout = QHBoxLayout()
+        group_layout.addStretch()
+        group_label = QLabel("▶ Grupo:")
+        group_label.setFont(QFont("Arial", 20))
+        group_layout.addWidget(group_label)
+        group_buttons = []
+        for num_players in range(3, MAX_FACES + 1):
+            btn = QPushButton(f"{num_players}")
+            btn.setFixedSize(70, 70)
+            btn.setFont(QFont("Arial", 20))
+            btn.setStyleSheet(f"background-color: {self.colors['primary']}; border-radius: 15px; color: {self.colors['text_light']};")
+            btn.clicked.connect(lambda _checked=False, num_players=num_players: self.start_game_mode(num_players))
+            group_layout.addWidget(btn)
+            group_buttons.append(btn)
+        group_layout.addStretch()
         
+        # Os botões só liberam quando a câmera e o FaceMesh estiverem prontos
+        self.start_buttons = [start_1p_btn, start_2p_btn] + group_buttons
+        for btn in self.start_buttons: btn.setEnabled(False)
+        self.camera_status_label = QLabel("Preparando a câmera...", alignment=Qt.AlignCenter)
+        self.camera_status_label.setFont(QFont("Arial", 16))
+
         layout.addWidget(title)
         layout.addWidget(image_label)
         layout.addWidget(self.highscore_label)
         layout.addWidget(start_1p_btn, alignment=Qt.AlignCenter)
         layout.addWidget(start_2p_btn, alignment=Qt.AlignCenter)
+        layout.addLayout(group_layout)
+        layout.addWidget(self.camera_status_label)
         return widget
+
+    def _on_camera_ready(self, camera):
+        for btn in self.start_buttons: btn.setEnabled(True)
+        self.camera_status_label.setText("")
+
+    def _on_camera_failed(self, message):
+        self.camera_status_label.setText(f"Câmera indisponível: {message}")
         
     def _create_game_over_screen(self):
         widget = QWidget()
@@ -488,17 +614,12 @@ class MainWindow(QWidget):
     def show_game_over_screen(self, final_scores):
         print(f"DEBUG: show_game_over_screen recebendo scores via CALLBACK: {final_scores}")
         
-        p1_score = final_scores.get(1, 0) 
-        p2_score = final_scores.get(2, 0)
-        
-        score_text = ""
-        # Verifica se o jogo foi para 1 ou 2 jogadores para formatar a mensagem
-        if self.game_widget.num_players_current_game == 1:
-            score_text = f"Pontuação Final: {p1_score}"
-        else: # 2 jogadores
-            score_text = f"Pontuações Finais: P1: {p1_score} | P2: {p2_score}"
+        score_text = final_scores_message(final_scores, self.game_widget.num_players_current_game)
 
         self.final_scores_label.setText(score_text)
+        # Só enfileira: a gravação acontece na thread do placar
+        self.leaderboard.record_session("face", {f"P{pid}": score for pid, score in final_scores.items()},
+                                        self.game_widget.session_duration)
         
         new_record_achieved = False
         for score in final_scores.values():
@@ -507,7 +628,6 @@ class MainWindow(QWidget):
                 new_record_achieved = True
         
         if new_record_achieved:
-            self._save_highscore()
             self.new_highscore_label.setText(f"NOVO RECORDE INDIVIDUAL: {self.highscore}!")
         else:
             self.new_highscore_label.setText("") 
@@ -521,12 +641,34 @@ class MainWindow(QWidget):
 
         self.stack.setCurrentWidget(self.game_over_screen)
 
+    def keyPressEvent(self, event):
+        # F3: HUD do profiler por etapa; F4: exporta o trace (ver frame_profiler.py)
+        if not profiler.handle_key(event):
+            super().keyPressEvent(event)
+
+    def shutdown(self):
+        """Para o jogo e libera a câmera (ao fechar, ou quando o launcher troca de jogo)."""
+        # Para os timers antes de liberar a câmera (e encerrar o processo do FaceMesh, se houver)
+        self.game_widget.game_loop.stop()
+        self.game_widget.spawn_timer.stop()
+        self.governor.print_report()
+        camera = self.game_widget.camera_loader.cancel()
+        if camera is not None: camera.release()
+
     def closeEvent(self, event):
-        self.game_widget.camera.release()
+        self.shutdown()
+        self.leaderboard.close()
         event.accept()
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # --source/--pacing escolhem a fonte de frames; --headless [--duration s] mede a vazão sem display
+    options, qt_argv = parse_source_args(sys.argv)
+    app = QApplication(qt_argv)
     window = MainWindow()
     window.show()
+    report_startup(window.game_widget.camera_loader)
+    if options.headless:
+        widget = window.game_widget
+        sys.exit(run_headless(app, window, lambda: window.start_game_mode(1), options.duration,
+                              widget.camera_loader, widget.game_loop))
     sys.exit(app.exec())
\ No newline at end of file
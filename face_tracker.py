@@ -0,0 +1,179 @@
+"""
+Identidade estável dos jogadores da Esquiva Facial entre frames.
+
+Antes, a cada frame os rostos eram ordenados pelo x do nariz e o 1º virava P1,
+o 2º P2: quem cruzava a frente do outro trocava de jogador, e qualquer rosto a
+mais ou a menos pausava a partida. O FaceTracker guarda uma vaga por jogador
+(IDs 1..N, os mesmos de Player/scores/lives) com a última posição do rosto:
+
+- a cada frame, os rostos são casados com as vagas vivas pela atribuição de
+  menor distância total (Húngaro) entre os pontos de referência dos rostos e as
+  posições previstas (última posição + velocidade), descartando pares mais
+  longe que `max_distance`;
+- uma vaga sem rosto continua viva por `max_missed_s` segundos (o jogador fica
+  parado onde estava); depois disso fica livre;
+- rostos que sobraram ocupam as vagas livres, também pela menor distância: a
+  posição de uma vaga que nunca teve rosto é a "casa" dela (P1 à esquerda, ...),
+  então no começo da partida a ordem é a mesma da ordenação pelo nariz, e quem
+  sai e volta recupera a própria vaga;
+- rostos além do número de jogadores são ignorados.
+
+Com no máximo MAX_FACES rostos e vagas, a matriz de custos tem até 6x6 e é
+montada de uma vez em NumPy; o Húngaro é O(n³) sobre ela, em listas Python
+(dezenas de µs por frame).
+"""
+import numpy as np
+
+from landmarks import MAX_FACES
+
+DEFAULT_MAX_MISSED_S = 0.5
+DEFAULT_MAX_DISTANCE = 0.25  # fração da largura/altura do frame, já descontado o movimento previsto
+VELOCITY_SMOOTHING = 0.5
+
+# Nariz e cantos externos dos olhos: não se mexem quando a boca abre (escudo)
+REFERENCE_LANDMARKS = (1, 33, 263)
+
+def face_reference_point(face_landmarks):
+    """(x, y) normalizados do ponto de referência de um rosto (média de REFERENCE_LANDMARKS)."""
+    points = face_landmarks.landmark
+    x = sum(points[i].x for i in REFERENCE_LANDMARKS) / len(REFERENCE_LANDMARKS)
+    y = sum(points[i].y for i in REFERENCE_LANDMARKS) / len(REFERENCE_LANDMARKS)
+    return x, y
+
+def hungarian(cost):
+    """
+    Atribuição de custo mínimo numa matriz n x m (algoritmo Húngaro com potenciais).
+    Retorna (linhas, colunas) com min(n, m) pares, ordenados por linha.
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    transposed = cost.shape[0] > cost.shape[1]
+    if transposed:
+        cost = cost.T
+    n, m = cost.shape
+    if n == 0:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # Listas em vez de arrays: com até 6x6, o custo por operação do NumPy dominaria
+    rows_cost = cost.tolist()
+    inf = float("inf")
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)  # coluna -> linha, a partir de 1 (0 = livre); a coluna 0 é a raiz
+    way = [0] * (m + 1)
+    for row in range(1, n + 1):
+        match[0] = row
+        column = 0
+        min_slack = [inf] * (m + 1)
+        used = [False] * (m + 1)
+        while True:
+            used[column] = True
+            current = match[column]
+            current_cost = rows_cost[current - 1]
+            delta, next_column = inf, 0
+            for j in range(1, m + 1):
+                if not used[j]:
+                    slack = current_cost[j - 1] - u[current] - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j], way[j] = slack, column
+                    if min_slack[j] < delta:
+                        delta, next_column = min_slack[j], j
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            column = next_column
+            if match[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            match[column] = match[previous]
+            column = previous
+
+    pairs = [(match[j] - 1, j - 1) for j in range(1, m + 1) if match[j]]
+    if transposed:
+        pairs = [(column, row) for row, column in pairs]
+    pairs.sort()
+    rows = np.array([p[0] for p in pairs], dtype=np.int64)
+    columns = np.array([p[1] for p in pairs], dtype=np.int64)
+    return rows, columns
+
+class FaceTracker:
+    """
+    Vagas de jogador com posição persistente. update() recebe os pontos de
+    referência dos rostos do frame e devolve o ID (1..N) de cada um, ou 0 para
+    rostos sem vaga. Deve ser chamado uma vez por frame novo, com o horário em que
+    o frame foi capturado (não o do tick do jogo): a velocidade prevista vem da
+    diferença entre esses horários.
+    """
+
+    def __init__(self, num_slots=1, max_missed_s=DEFAULT_MAX_MISSED_S, max_distance=DEFAULT_MAX_DISTANCE):
+        self.max_missed_s = max_missed_s
+        self.max_distance = max_distance
+        self.reset(num_slots)
+
+    def reset(self, num_slots):
+        if not 1 <= num_slots <= MAX_FACES:
+            raise ValueError(f"O rastreador aceita de 1 a {MAX_FACES} jogadores.")
+        self.num_slots = num_slots
+        # Casa de cada vaga: colunas igualmente espaçadas (com 1 ou 2, os mesmos x do Player)
+        columns = max(num_slots, 2)
+        self.positions = np.column_stack([(np.arange(num_slots) + 0.5) / columns, np.full(num_slots, 0.5)])
+        self.velocities = np.zeros((num_slots, 2))  # por segundo, suavizada
+        self.last_seen = np.full(num_slots, -np.inf)  # -inf = vaga ainda sem rosto
+
+    def alive(self, now):
+        return now - self.last_seen <= self.max_missed_s
+
+    def present(self, player_id, now):
+        """A vaga tem rosto agora ou está dentro da tolerância de ausência."""
+        return bool(now - self.last_seen[player_id - 1] <= self.max_missed_s)
+
+    def missing(self, now):
+        """IDs das vagas sem rosto além da tolerância."""
+        return [int(i) + 1 for i in np.nonzero(~self.alive(now))[0]]
+
+    def update(self, points, now):
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        ids = np.zeros(len(points), dtype=np.int64)
+        if not len(points):
+            return ids
+
+        alive = self.alive(now)
+        # Vagas vivas andam com a própria velocidade desde o último rosto: dois jogadores
+        # que se cruzam continuam cada um na sua direção
+        elapsed = np.where(alive, now - self.last_seen, 0.0)
+        predicted = self.positions + self.velocities * elapsed[:, None]
+        # Distância de todo rosto a toda vaga de uma vez (no máximo MAX_FACES x MAX_FACES)
+        distances = np.linalg.norm(points[:, None, :] - predicted[None, :, :], axis=2)
+        unmatched = np.ones(len(points), dtype=bool)
+
+        live = np.nonzero(alive)[0]
+        if len(live):
+            rows, cols = hungarian(distances[:, live])
+            close = distances[rows, live[cols]] <= self.max_distance
+            rows, slots = rows[close], live[cols[close]]
+            ids[rows] = slots + 1
+            unmatched[rows] = False
+        faces = np.nonzero(unmatched)[0]
+        free = np.nonzero(~alive)[0]
+        if len(faces) and len(free):
+            rows, cols = hungarian(distances[faces][:, free])
+            ids[faces[rows]] = free[cols] + 1
+
+        assigned = ids > 0
+        slots = ids[assigned] - 1
+        # Velocidade só entre frames seguidos da mesma vaga; vaga que voltou começa parada.
+        # O mesmo horário de novo (frame repetido) não ensina nada: a velocidade fica como estava
+        dt = now - self.last_seen[slots]
+        repeated = alive[slots] & (dt <= 0)
+        tracked = alive[slots] & (dt > 0)
+        velocity = np.zeros((len(slots), 2))
+        velocity[tracked] = (points[assigned][tracked] - self.positions[slots][tracked]) / dt[tracked, None]
+        smoothed = VELOCITY_SMOOTHING * velocity + (1 - VELOCITY_SMOOTHING) * self.velocities[slots]
+        self.velocities[slots] = np.where(tracked[:, None], smoothed,
+                                          np.where(repeated[:, None], self.velocities[slots], 0.0))
+        self.positions[slots] = points[assigned]
+        self.last_seen[slots] = now
+        return ids
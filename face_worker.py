@@ -0,0 +1,245 @@
+import multiprocessing
+import time
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from landmarks import NUM_FACE_LANDMARKS
+
+# Índices do cabeçalho (int64) compartilhado entre o jogo e o processo do FaceMesh.
+# Cada um dos dois buffers tem seu próprio bloco de campos a partir de _BUFFER_FIELDS[b].
+_LATEST = 0          # buffer com o resultado mais recente (-1 = nenhum ainda)
+_HEARTBEAT = 1       # time.monotonic_ns() da última volta do loop do worker
+_STATUS = 2          # 0 = iniciando, 1 = rodando, -1 = falha ao abrir a câmera
+_RATE = 3            # frames/s pedidos pelo jogo, em milésimos (0 = sem limite, -1 = pausado)
+_HEADER_BASE = 4
+_SEQLOCK, _FRAME_SEQ, _TIMESTAMP, _HEIGHT, _WIDTH, _NUM_FACES = range(6)
+_FIELDS_PER_BUFFER = 6
+_BUFFER_FIELDS = (_HEADER_BASE, _HEADER_BASE + _FIELDS_PER_BUFFER)
+_HEADER_SIZE = _HEADER_BASE + 2 * _FIELDS_PER_BUFFER
+
+class _SharedBuffers:
+    """Views NumPy sobre os três blocos de memória compartilhada (cabeçalho, frames, landmarks)."""
+
+    def __init__(self, names, max_frame_shape, max_num_faces, create=False):
+        frames_shape = (2,) + tuple(max_frame_shape)
+        landmarks_shape = (2, max_num_faces, NUM_FACE_LANDMARKS, 3)
+        sizes = (
+            _HEADER_SIZE * 8,
+            int(np.prod(frames_shape)),
+            int(np.prod(landmarks_shape)) * 4,
+        )
+        if create:
+            self.blocks = [shared_memory.SharedMemory(create=True, size=size) for size in sizes]
+        else:
+            self.blocks = [shared_memory.SharedMemory(name=name) for name in names]
+        self.names = [block.name for block in self.blocks]
+
+        self.header = np.ndarray((_HEADER_SIZE,), dtype=np.int64, buffer=self.blocks[0].buf)
+        self.frames = np.ndarray(frames_shape, dtype=np.uint8, buffer=self.blocks[1].buf)
+        self.landmarks = np.ndarray(landmarks_shape, dtype=np.float32, buffer=self.blocks[2].buf)
+        if create:
+            self.header[:] = 0
+            self.header[_LATEST] = -1
+
+    def close(self, unlink=False):
+        # As views precisam sair de escopo antes de fechar os blocos
+        del self.header, self.frames, self.landmarks
+        for block in self.blocks:
+            block.close()
+            if unlink:
+                try:
+                    block.unlink()
+                except FileNotFoundError:
+                    pass
+
+def _worker_main(names, max_frame_shape, max_num_faces, camera_index, face_mesh_options, stop_event):
+    """Loop do processo filho: captura, espelha, roda o FaceMesh e publica nos buffers."""
+    import cv2
+    import mediapipe as mp
+    from frame_sources import frame_source_from_env
+
+    buffers = _SharedBuffers(names, max_frame_shape, max_num_faces)
+    header = buffers.header
+    cap = frame_source_from_env(camera_index)
+    if not cap.isOpened():
+        print("Erro: Não foi possível abrir a câmera no processo do FaceMesh.")
+        header[_STATUS] = -1
+        buffers.close()
+        return
+
+    face_mesh = mp.solutions.face_mesh.FaceMesh(max_num_faces=max_num_faces, **face_mesh_options)
+    # Heartbeat antes do status: o jogo só confere o heartbeat de um worker rodando
+    header[_HEARTBEAT] = time.monotonic_ns()
+    header[_STATUS] = 1
+    max_h, max_w = max_frame_shape[0], max_frame_shape[1]
+    # Continua a numeração de um worker anterior (reinício após falha)
+    frame_seq = int(max(header[base + _FRAME_SEQ] for base in _BUFFER_FIELDS))
+    next_capture = 0.0
+
+    try:
+        while not stop_event.is_set():
+            header[_HEARTBEAT] = time.monotonic_ns()
+            rate_milli = int(header[_RATE])
+            if rate_milli < 0:
+                # Pausado: só mantém o heartbeat (o processo continua vivo para o ensure_alive)
+                stop_event.wait(0.05)
+                continue
+            if rate_milli > 0:
+                now = time.monotonic()
+                if now < next_capture:
+                    stop_event.wait(min(next_capture - now, 0.05))
+                    continue
+                next_capture = now + 1000.0 / rate_milli
+            ret, frame = cap.read()
+            if not ret:
+                time.sleep(0.01)
+                continue
+
+            frame = cv2.flip(frame, 1)
+            if frame.shape[0] > max_h or frame.shape[1] > max_w:
+                scale = min(max_h / frame.shape[0], max_w / frame.shape[1])
+                frame = cv2.resize(frame, (int(frame.shape[1] * scale), int(frame.shape[0] * scale)))
+            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            results = face_mesh.process(rgb_frame)
+
+            # Escreve no buffer que o leitor NÃO está usando e só então o publica
+            target = 1 - header[_LATEST] if header[_LATEST] >= 0 else 0
+            base = _BUFFER_FIELDS[target]
+            h, w = rgb_frame.shape[:2]
+            header[base + _SEQLOCK] += 1  # ímpar = escrita em andamento
+            buffers.frames[target, :h, :w] = rgb_frame
+            num_faces = 0
+            if results.multi_face_landmarks:
+                for face_landmarks in results.multi_face_landmarks[:max_num_faces]:
+                    points = [(p.x, p.y, p.z) for p in face_landmarks.landmark[:NUM_FACE_LANDMARKS]]
+                    buffers.landmarks[target, num_faces, :len(points)] = points
+                    num_faces += 1
+            frame_seq += 1
+            header[base + _FRAME_SEQ] = frame_seq
+            header[base + _TIMESTAMP] = time.monotonic_ns()
+            header[base + _HEIGHT] = h
+            header[base + _WIDTH] = w
+            header[base + _NUM_FACES] = num_faces
+            header[base + _SEQLOCK] += 1  # par = buffer consistente
+            header[_LATEST] = target
+    finally:
+        cap.release()
+        face_mesh.close()
+        buffers.close()
+
+class FaceMeshWorker:
+    """
+    Roda captura + FaceMesh em um processo separado, fora do GIL da interface.
+
+    Frames e landmarks chegam por memória compartilhada em buffer duplo (sem pickle):
+    o worker escreve sempre no buffer que não é o mais recente, protegido por um
+    contador de sequência (seqlock), e o leitor copia do mais recente. Se o processo
+    morrer, ou travar (sem heartbeat há STALE_AFTER segundos), ele é reiniciado
+    automaticamente em `read()`.
+    """
+
+    RESTART_INTERVAL = 1.0  # segundos mínimos entre tentativas de reinício
+    STALE_AFTER = 2.0       # segundos sem heartbeat até considerar o processo travado
+
+    def __init__(self, camera_index=0, max_frame_shape=(720, 1280, 3), max_num_faces=2, **face_mesh_options):
+        self.camera_index = camera_index
+        self.max_frame_shape = tuple(max_frame_shape)
+        self.max_num_faces = max_num_faces
+        self.face_mesh_options = face_mesh_options
+        self.restarts = 0
+
+        # "spawn" evita herdar por fork o estado das threads do Qt
+        self._ctx = multiprocessing.get_context("spawn")
+        self._buffers = _SharedBuffers(None, self.max_frame_shape, max_num_faces, create=True)
+        self._process = None
+        self._stop_event = None
+        self._last_start = 0.0
+        self._closed = False
+        self._start_process()
+
+    def _start_process(self):
+        # Só roda sem nenhum worker escrevendo (primeira vez, ou o anterior já morreu).
+        # Um worker que morreu no meio de uma escrita deixa o seqlock ímpar: sem zerar,
+        # o novo inverteria a paridade e o leitor aceitaria justamente os buffers rasgados
+        header = self._buffers.header
+        for base in _BUFFER_FIELDS:
+            header[base + _SEQLOCK] = 0
+        header[_HEARTBEAT] = 0
+        header[_STATUS] = 0
+        self._stop_event = self._ctx.Event()
+        self._process = self._ctx.Process(
+            target=_worker_main,
+            args=(self._buffers.names, self.max_frame_shape, self.max_num_faces,
+                  self.camera_index, self.face_mesh_options, self._stop_event),
+            name="facemesh-worker",
+            daemon=True,
+        )
+        self._process.start()
+        self._last_start = time.monotonic()
+
+    def ensure_alive(self):
+        """Reinicia o processo do FaceMesh caso ele tenha caído ou travado."""
+        if self._closed:
+            return
+        header = self._buffers.header
+        if self._process.is_alive():
+            if header[_STATUS] != 1:
+                return  # ainda carregando o modelo: o heartbeat começa depois
+            stale = (time.monotonic_ns() - header[_HEARTBEAT]) / 1e9
+            if stale < self.STALE_AFTER:
+                return
+            print(f"Aviso: processo do FaceMesh sem heartbeat há {stale:.1f} s; reiniciando.")
+            self._process.kill()
+            self._process.join()
+        else:
+            if header[_STATUS] == -1:
+                return  # sem câmera: reiniciar não resolve
+            if time.monotonic() - self._last_start < self.RESTART_INTERVAL:
+                return
+            print(f"Aviso: processo do FaceMesh terminou (código {self._process.exitcode}); reiniciando.")
+        self.restarts += 1
+        self._start_process()
+
+    def read(self):
+        """
+        Copia o resultado mais recente: (seq, timestamp, rgb_frame, landmarks) ou None.
+        `landmarks` tem forma (rostos, 478, 3).
+        """
+        self.ensure_alive()
+        header = self._buffers.header
+        for _attempt in range(3):
+            latest = int(header[_LATEST])
+            if latest < 0:
+                return None
+            base = _BUFFER_FIELDS[latest]
+            lock_before = header[base + _SEQLOCK]
+            if lock_before % 2:
+                continue
+            h, w, num_faces = header[base + _HEIGHT], header[base + _WIDTH], header[base + _NUM_FACES]
+            seq, timestamp = int(header[base + _FRAME_SEQ]), header[base + _TIMESTAMP] / 1e9
+            frame = self._buffers.frames[latest, :h, :w].copy()
+            landmarks = self._buffers.landmarks[latest, :num_faces].copy()
+            if header[base + _SEQLOCK] == lock_before:
+                return seq, timestamp, frame, landmarks
+        return None
+
+    def set_rate(self, hz):
+        """Frames/s do processo do FaceMesh: None = sem limite, 0 = pausado."""
+        self._buffers.header[_RATE] = 0 if hz is None else (-1 if hz == 0 else max(1, int(hz * 1000)))
+
+    def latest_seq(self):
+        latest = int(self._buffers.header[_LATEST])
+        return int(self._buffers.header[_BUFFER_FIELDS[latest] + _FRAME_SEQ]) if latest >= 0 else 0
+
+    def close(self, timeout=2.0):
+        """Encerra o processo filho de forma limpa e libera a memória compartilhada."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_event.set()
+        self._process.join(timeout)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout)
+        self._buffers.close(unlink=True)
@@ -0,0 +1,194 @@
+import threading
+import time
+
+class FramePacket:
+    """Um frame capturado e já processado pelo modelo, com número de sequência e horário."""
+
+    def __init__(self, seq, timestamp, rgb_frame, results, captured_at=None):
+        self.seq = seq
+        self.timestamp = timestamp  # time.monotonic() do fim da inferência
+        self.captured_at = captured_at if captured_at is not None else timestamp  # ... e da leitura do frame
+        self.rgb_frame = rgb_frame
+        self.results = results
+
+class LatestResultSlot:
+    """
+    Guarda apenas o resultado mais recente publicado pelo produtor.
+
+    Se um resultado novo chega antes do anterior ser lido, o anterior é descartado
+    (drop-oldest) e contado em `dropped`. Cada pacote lido pela primeira vez
+    conta em `consumed`; leituras repetidas do mesmo pacote não contam.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._packet = None
+        self._last_read_seq = 0
+        self.published = 0
+        self.dropped = 0
+        self.consumed = 0
+
+    def publish(self, packet):
+        with self._cond:
+            if self._packet is not None and self._packet.seq != self._last_read_seq:
+                self.dropped += 1
+            self._packet = packet
+            self.published += 1
+            self._cond.notify_all()
+
+    def latest(self):
+        """Leitura não bloqueante do pacote mais recente (None se ainda não houver)."""
+        with self._cond:
+            packet = self._packet
+            if packet is not None and packet.seq != self._last_read_seq:
+                self._last_read_seq = packet.seq
+                self.consumed += 1
+            return packet
+
+    def discard(self):
+        """Esquece o pacote atual (contadores mantidos): usado quando a captura volta de uma pausa."""
+        with self._cond:
+            self._packet = None
+
+    def wait_newer(self, seq, timeout=None):
+        """Bloqueia até existir um pacote com sequência maior que `seq` (ou até o timeout)."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._packet is not None and self._packet.seq > seq, timeout)
+        return self.latest()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "published": self.published,
+                "consumed": self.consumed,
+                "dropped": self.dropped,
+                "latest_seq": self._packet.seq if self._packet else 0,
+            }
+
+MAX_CONSECUTIVE_ERRORS = 20
+ERROR_BACKOFF = 0.05      # espera depois da 1ª falha seguida; dobra a cada nova falha
+MAX_ERROR_BACKOFF = 1.0
+
+class CaptureThread(threading.Thread):
+    """
+    Produtor em segundo plano: chama `capture_fn` (captura + inferência) sem parar
+    e publica cada resultado no `slot`. `capture_fn` deve retornar
+    (rgb_frame, results, captured_at) ou (None, None, None) quando a leitura falhar;
+    `captured_at` é o time.monotonic() logo depois da leitura do frame.
+
+    set_rate() limita as chamadas a N por segundo ou pausa a thread (0), sem
+    encerrá-la: câmera e modelo continuam abertos para voltar na hora.
+
+    Uma exceção em `capture_fn` não derruba a thread: fica em `error` (até o
+    próximo frame bom), conta em `errors` e a thread espera um pouco mais a cada
+    falha seguida antes de tentar de novo. Só desiste depois de `max_errors`
+    falhas seguidas; aí `error` continua preenchido e `failed` fica True.
+    """
+
+    def __init__(self, capture_fn, name="captura", max_errors=MAX_CONSECUTIVE_ERRORS):
+        super().__init__(name=name, daemon=True)
+        self._capture_fn = capture_fn
+        self._stop_event = threading.Event()
+        self._wake = threading.Event()
+        self._seq = 0
+        self._next_capture = 0.0
+        self.rate = None
+        self.slot = LatestResultSlot()
+        self.failures = 0
+        self.max_errors = max_errors
+        self.errors = 0
+        self.error = None
+        self.failed = False
+        self._exit_lock = threading.Lock()
+        self._exited = False
+        self._on_exit = None
+
+    def set_rate(self, hz):
+        """Capturas por segundo: None = sem limite, 0 = pausada."""
+        if self.rate == 0 and hz != 0:
+            # O último frame pode ser de minutos atrás: o consumidor espera um novo
+            self.slot.discard()
+        self.rate = hz
+        self._wake.set()
+
+    def _wait_turn(self):
+        """Espera a vez da próxima captura conforme `rate`. False se a thread foi parada."""
+        while not self._stop_event.is_set():
+            rate = self.rate
+            if rate is None:
+                return True
+            timeout = None
+            if rate > 0:
+                now = time.monotonic()
+                if now >= self._next_capture:
+                    self._next_capture = now + 1.0 / rate
+                    return True
+                timeout = self._next_capture - now
+            # Acorda antes do prazo se a taxa mudar (ou se stop() for chamado)
+            self._wake.wait(timeout)
+            self._wake.clear()
+        return False
+
+    def run(self):
+        try:
+            self._loop()
+        finally:
+            with self._exit_lock:
+                self._exited = True
+                on_exit, self._on_exit = self._on_exit, None
+            if on_exit is not None:
+                on_exit()
+
+    def _loop(self):
+        consecutive_errors = 0
+        while self._wait_turn():
+            try:
+                rgb_frame, results, captured_at = self._capture_fn()
+            except Exception as e:
+                consecutive_errors += 1
+                self.errors += 1
+                self.error = e
+                if consecutive_errors >= self.max_errors:
+                    print(f"Erro na thread de captura '{self.name}': {e} ({consecutive_errors} falhas seguidas, desistindo)")
+                    self.failed = True
+                    return
+                if consecutive_errors == 1:
+                    print(f"Erro na thread de captura '{self.name}': {e} (tentando de novo)")
+                self._stop_event.wait(min(ERROR_BACKOFF * 2 ** (consecutive_errors - 1), MAX_ERROR_BACKOFF))
+                continue
+            consecutive_errors = 0
+            self.error = None
+
+            if rgb_frame is None:
+                # Câmera sem frame: espera um pouco para não girar em falso
+                self.failures += 1
+                self._stop_event.wait(0.01)
+                continue
+
+            self._seq += 1
+            self.slot.publish(FramePacket(self._seq, time.monotonic(), rgb_frame, results, captured_at))
+
+    def stop(self, timeout=2.0, on_exit=None):
+        """
+        Para a thread. `on_exit` (ex.: fechar câmera e modelo) só roda depois que
+        ela saiu do loop: na hora, se ela terminar dentro do `timeout`, ou pela
+        própria thread ao sair de um capture_fn demorado. Retorna se já terminou.
+        """
+        self._stop_event.set()
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+        with self._exit_lock:
+            exited = self._exited or self.ident is None  # nunca iniciada
+            if not exited:
+                self._on_exit = on_exit
+        if exited and on_exit is not None:
+            on_exit()
+        return exited
+
+    def stats(self):
+        stats = self.slot.stats()
+        stats["failures"] = self.failures
+        stats["errors"] = self.errors
+        stats["rate"] = self.rate
+        return stats
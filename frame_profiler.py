@@ -0,0 +1,148 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QFont
+
+class _Span:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+class _NullSpan:
+    """Span do profiler desligado: não mede nada nem aloca nada."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+_NULL_SPAN = _NullSpan()
+
+class FrameProfiler:
+    """
+    Mede o tempo de cada etapa do frame (captura, inferência, desenho, simulação,
+    paintEvent...) com `with profiler.span("etapa"):`.
+
+    Cada etapa guarda as últimas `window` durações num buffer circular, de onde
+    saem p50/p95/p99; os eventos completos vão para um buffer limitado que pode
+    ser exportado no formato de trace do Chrome (chrome://tracing, Perfetto).
+    Desligado, span() devolve sempre o mesmo objeto vazio.
+    """
+
+    def __init__(self, enabled=False, window=512, max_trace_events=50000):
+        self.enabled = enabled
+        self.hud_visible = enabled
+        self.window = window
+        self.max_trace_events = max_trace_events
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._rings = {}          # etapa -> [durações em ms, total de amostras]
+            self._trace = []          # (etapa, thread, início ns, duração ns)
+            self._thread_names = {}
+            self._trace_start = time.perf_counter_ns()
+
+    def span(self, name):
+        return _Span(self, name) if self.enabled else _NULL_SPAN
+
+    def record(self, name, start_ns, end_ns):
+        thread_id = threading.get_ident()
+        with self._lock:
+            ring = self._rings.get(name)
+            if ring is None:
+                ring = self._rings[name] = [np.zeros(self.window, dtype=np.float64), 0]
+            ring[0][ring[1] % self.window] = (end_ns - start_ns) / 1e6
+            ring[1] += 1
+            if len(self._trace) < self.max_trace_events:
+                self._trace.append((name, thread_id, start_ns, end_ns - start_ns))
+            if thread_id not in self._thread_names:
+                self._thread_names[thread_id] = threading.current_thread().name
+
+    def stats(self):
+        """Por etapa: amostras totais e média/p50/p95/p99 (ms) da janela recente."""
+        with self._lock:
+            rings = {name: (ring[0][:min(ring[1], self.window)].copy(), ring[1]) for name, ring in self._rings.items()}
+        stats = {}
+        for name, (samples, count) in rings.items():
+            p50, p95, p99 = np.percentile(samples, (50, 95, 99))
+            stats[name] = {"count": count, "mean_ms": float(samples.mean()),
+                           "p50_ms": float(p50), "p95_ms": float(p95), "p99_ms": float(p99)}
+        return stats
+
+    def hud_lines(self):
+        lines = [f"{'etapa':<26}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+        for name, s in self.stats().items():
+            lines.append(f"{name[:26]:<26}{s['p50_ms']:7.2f}{s['p95_ms']:7.2f}{s['p99_ms']:7.2f}")
+        return lines
+
+    def draw_hud(self, painter, x=10, y=90):
+        """Desenha a tabela de percentis no canto da tela (só se o HUD estiver visível)."""
+        if not self.hud_visible:
+            return
+        lines = self.hud_lines()
+        font = QFont("Courier New", 10)
+        font.setStyleHint(QFont.Monospace)
+        painter.save()
+        painter.setFont(font)
+        line_height = painter.fontMetrics().height()
+        width = max(painter.fontMetrics().horizontalAdvance(line) for line in lines) + 16
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(0, 0, 0, 170))
+        painter.drawRect(x, y, width, line_height * len(lines) + 12)
+        painter.setPen(QColor(230, 255, 230))
+        for i, line in enumerate(lines):
+            painter.drawText(x + 8, y + 6 + line_height * (i + 1) - painter.fontMetrics().descent(), line)
+        painter.restore()
+
+    def dump_chrome_trace(self, path=None):
+        """Grava os eventos no formato JSON de trace do Chrome e retorna o caminho."""
+        if path is None:
+            path = time.strftime("profile-%Y%m%d-%H%M%S.json")
+        pid = os.getpid()
+        with self._lock:
+            trace = list(self._trace)
+            thread_names = dict(self._thread_names)
+            origin = self._trace_start
+        events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                  for tid, name in thread_names.items()]
+        events.extend({"name": name, "ph": "X", "pid": pid, "tid": tid,
+                       "ts": (start - origin) / 1000.0, "dur": duration / 1000.0}
+                      for name, tid, start, duration in trace)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+        return path
+
+    def handle_key(self, event):
+        """F3 liga/desliga profiler + HUD; F4 exporta o trace. Retorna True se tratou a tecla."""
+        if event.key() == Qt.Key_F3:
+            self.hud_visible = not self.hud_visible
+            self.enabled = self.hud_visible
+            if self.enabled:
+                self.reset()
+            return True
+        if event.key() == Qt.Key_F4:
+            path = self.dump_chrome_trace()
+            print(f"Trace do profiler salvo em {path}")
+            return True
+        return False
+
+# Instância única usada por câmeras e jogos (VISION_GAMES_PROFILE=1 liga desde o início)
+profiler = FrameProfiler(enabled=os.environ.get("VISION_GAMES_PROFILE") == "1")
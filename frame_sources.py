@@ -0,0 +1,284 @@
+"""
+Fontes de frames usadas por Camera e FaceCamera no lugar de cv2.VideoCapture(0).
+
+Todas seguem o pedaço da interface do cv2.VideoCapture que as câmeras usam
+(read() -> (ok, frame BGR), isOpened(), release()), então trocar a webcam por
+um vídeo, uma sequência de imagens, frames sintéticos ou o serviço de captura
+compartilhado não muda nada acima delas.
+
+A fonte é escolhida por VISION_GAMES_SOURCE (ou --source nos jogos):
+    webcam / webcam:1 / 1        webcam (índice 0 por padrão)
+    video:arquivo.mp4            vídeo (um caminho sem prefixo também serve)
+    images:pasta ou images:*.png sequência de imagens, em ordem alfabética
+    synthetic / synthetic:1280x720@60
+    shm / shm:nome               serviço de captura (python -m capture_service)
+VISION_GAMES_SOURCE_PACING=max entrega vídeo/imagens/sintético o mais rápido
+possível; o padrão (realtime) respeita a taxa de quadros da fonte.
+"""
+import argparse
+import glob
+import os
+import threading
+import time
+
+import cv2
+import numpy as np
+
+PACINGS = ("realtime", "max")
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp")
+
+class FrameSource:
+    """
+    Base das fontes: conta os frames entregues e, com pacing="realtime", espera
+    até o horário do próximo frame (1/fps) antes de ler. Subclasses implementam _read().
+    """
+
+    fps = 30.0
+
+    def __init__(self, pacing="realtime"):
+        if pacing not in PACINGS:
+            raise ValueError(f"Pacing '{pacing}' inválido (use {', '.join(PACINGS)}).")
+        self.pacing = pacing
+        self.frames_read = 0
+        self.finished = False
+        self._next = None
+
+    def isOpened(self):
+        return True
+
+    def _wait_next_frame(self):
+        now = time.monotonic()
+        if self._next is None:
+            self._next = now
+        elif self._next > now:
+            time.sleep(self._next - now)
+        # Não acumula atraso: se o leitor demorou, o próximo frame sai já
+        self._next = max(self._next + 1.0 / self.fps, time.monotonic() - 1.0 / self.fps)
+
+    def read(self):
+        if self.finished:
+            return False, None
+        if self.pacing == "realtime":
+            self._wait_next_frame()
+        ok, frame = self._read()
+        if ok:
+            self.frames_read += 1
+        return ok, frame
+
+    def _read(self):
+        raise NotImplementedError
+
+    def stats(self):
+        return {"frames_read": self.frames_read}
+
+    def release(self):
+        pass
+
+class WebcamSource(FrameSource):
+    """Webcam via cv2.VideoCapture; o ritmo é o do próprio dispositivo."""
+
+    def __init__(self, index=0, size=None):
+        super().__init__(pacing="max")
+        self.cap = cv2.VideoCapture(index)
+        if size:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, size[0])
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, size[1])
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def _read(self):
+        return self.cap.read()
+
+    def release(self):
+        self.cap.release()
+
+class VideoFileSource(FrameSource):
+    """Arquivo de vídeo, em loop por padrão. Sem loop, read() falha depois do último frame."""
+
+    def __init__(self, path, loop=True, pacing="realtime"):
+        super().__init__(pacing)
+        self.path = path
+        self.loop = loop
+        self.cap = cv2.VideoCapture(path)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def _read(self):
+        ok, frame = self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        if not ok:
+            self.finished = True
+        return ok, frame
+
+    def release(self):
+        self.cap.release()
+
+class ImageSequenceSource(FrameSource):
+    """
+    Sequência de imagens (uma pasta ou um padrão glob) tocada a `fps` quadros/s.
+    As imagens decodificadas ficam em memória até `max_cached_bytes`, para o
+    modo pacing="max" medir os jogos e não o decodificador de PNG.
+    """
+
+    def __init__(self, pattern, fps=30.0, loop=True, pacing="realtime", max_cached_bytes=256 * 1024 * 1024):
+        super().__init__(pacing)
+        if os.path.isdir(pattern):
+            paths = [os.path.join(pattern, name) for name in os.listdir(pattern)]
+        else:
+            paths = glob.glob(pattern)
+        self.paths = sorted(p for p in paths if p.lower().endswith(IMAGE_EXTENSIONS))
+        self.fps = fps
+        self.loop = loop
+        self.max_cached_bytes = max_cached_bytes
+        self._cache = {}
+        self._cached_bytes = 0
+        self._position = 0
+
+    def isOpened(self):
+        return bool(self.paths)
+
+    def _read(self):
+        if self._position >= len(self.paths):
+            if not self.loop:
+                self.finished = True
+                return False, None
+            self._position = 0
+        i = self._position
+        self._position += 1
+        frame = self._cache.get(i)
+        if frame is None:
+            frame = cv2.imread(self.paths[i], cv2.IMREAD_COLOR)
+            if frame is None:
+                print(f"Erro ao ler a imagem '{self.paths[i]}'")
+                return False, None
+            if self._cached_bytes + frame.nbytes <= self.max_cached_bytes:
+                self._cache[i] = frame
+                self._cached_bytes += frame.nbytes
+        return True, frame
+
+class SyntheticSource(FrameSource):
+    """Fonte sem hardware: gradiente com uma faixa em movimento e o número do frame."""
+
+    def __init__(self, width=640, height=480, fps=30.0, pacing="realtime"):
+        super().__init__(pacing)
+        self.fps = fps
+        gradient = np.linspace(0, 255, width, dtype=np.float32)
+        self._background = np.empty((height, width, 3), dtype=np.uint8)
+        self._background[:] = np.stack([gradient, gradient[::-1], np.full(width, 96.0)], axis=-1).astype(np.uint8)
+
+    def _read(self):
+        frame = self._background.copy()
+        height, width = frame.shape[:2]
+        x = (self.frames_read * 8) % width
+        frame[:, x:x + 40] = 255
+        cv2.putText(frame, str(self.frames_read + 1), (20, height - 30), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 0, 0), 3)
+        return True, frame
+
+def _parse_synthetic(options):
+    """'1280x720@60' -> (1280, 720, 60.0); partes ausentes ficam no padrão."""
+    width, height, fps = 640, 480, 30.0
+    size, _, rate = options.partition("@")
+    if size:
+        width, height = (int(v) for v in size.lower().split("x"))
+    if rate:
+        fps = float(rate)
+    return width, height, fps
+
+def open_frame_source(spec=None, pacing="realtime", loop=True, size=None):
+    """Cria a fonte descrita por `spec` (ver a docstring do módulo); None = webcam 0."""
+    kind, _, options = (spec or "webcam").partition(":")
+    if kind.isdigit():
+        kind, options = "webcam", kind
+    if kind == "webcam":
+        return WebcamSource(int(options or 0), size)
+    if kind == "synthetic":
+        width, height, fps = _parse_synthetic(options)
+        if size:
+            width, height = size
+        return SyntheticSource(width, height, fps, pacing)
+    if kind == "shm":
+        from capture_service import DEFAULT_NAME, SharedCaptureClient
+        return SharedCaptureClient(options or DEFAULT_NAME)
+    if kind == "images":
+        return ImageSequenceSource(options, loop=loop, pacing=pacing)
+    if kind == "video":
+        return VideoFileSource(options, loop=loop, pacing=pacing)
+
+    # Caminho sem prefixo: pasta/glob/imagem -> sequência de imagens, senão vídeo
+    # (o "kind" pode ser a letra de unidade de um caminho do Windows, então usa o spec inteiro)
+    if os.path.isdir(spec) or glob.has_magic(spec) or spec.lower().endswith(IMAGE_EXTENSIONS):
+        return ImageSequenceSource(spec, loop=loop, pacing=pacing)
+    return VideoFileSource(spec, loop=loop, pacing=pacing)
+
+def frame_source_from_env(index=0):
+    """
+    Fonte das câmeras conforme o ambiente: VISION_GAMES_SOURCE (+ _PACING);
+    VISION_GAMES_CAPTURE (serviço compartilhado) continua valendo como atalho
+    para shm. Sem nenhum dos dois, a webcam `index`.
+    """
+    spec = os.environ.get("VISION_GAMES_SOURCE")
+    capture = os.environ.get("VISION_GAMES_CAPTURE")
+    if not spec and capture:
+        spec = "shm" if capture == "shared" else f"shm:{capture}"
+    return open_frame_source(spec or f"webcam:{index}", os.environ.get("VISION_GAMES_SOURCE_PACING", "realtime"))
+
+class SharedSource:
+    """
+    Uma fonte para várias câmeras em sequência (o launcher troca de jogo sem
+    reabrir a webcam). Abre na primeira vez que alguém a usa, normalmente na
+    thread do CameraLoader; o release() das câmeras não faz nada e só close()
+    libera a fonte de verdade. O resto (read, frames_read, fps...) vai direto
+    para a fonte aberta.
+    """
+
+    def __init__(self, open_source=frame_source_from_env):
+        self._open_source = open_source
+        self._source = None
+        self._lock = threading.Lock()
+
+    def _opened(self):
+        with self._lock:
+            if self._source is None:
+                self._source = self._open_source()
+            return self._source
+
+    def __getattr__(self, name):
+        return getattr(self._opened(), name)
+
+    def release(self):
+        pass
+
+    def close(self):
+        with self._lock:
+            if self._source is not None:
+                self._source.release()
+                self._source = None
+
+def parse_source_args(argv):
+    """
+    Lê --source, --pacing, --headless e --duration da linha de comando de um jogo,
+    exporta a fonte para as variáveis de ambiente (as câmeras são criadas bem
+    depois, dentro dos widgets) e devolve (opções, argv restante para o QApplication).
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--source")
+    parser.add_argument("--pacing", choices=PACINGS)
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--duration", type=float, default=10.0)
+    options, rest = parser.parse_known_args(argv[1:])
+    options.headless = options.headless or os.environ.get("VISION_GAMES_HEADLESS") == "1"
+
+    if options.source:
+        os.environ["VISION_GAMES_SOURCE"] = options.source
+    if options.pacing:
+        os.environ["VISION_GAMES_SOURCE_PACING"] = options.pacing
+    if options.headless:
+        # Sem display: o Qt desenha tudo normalmente, só que fora da tela
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return options, argv[:1] + rest
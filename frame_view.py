@@ -0,0 +1,109 @@
+import cv2
+import numpy as np
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QColor, QFont, QImage, QPainter
+from PySide6.QtWidgets import QLabel
+
+from frame_profiler import profiler
+
+def _corner_coverage(radius):
+    """Cobertura antialiasing (0..1) do canto superior esquerdo de um retângulo arredondado."""
+    centers = np.arange(radius, dtype=np.float32) + 0.5
+    dx = radius - centers[None, :]
+    dy = radius - centers[:, None]
+    distance = np.sqrt(dx * dx + dy * dy)
+    return np.clip(radius - distance + 0.5, 0.0, 1.0)[..., None]
+
+class RoundedFrameView(QLabel):
+    """
+    QLabel que mostra os frames da câmera com cantos arredondados sem criar
+    QPixmap/QPainterPath a cada frame.
+
+    O frame é redimensionado com OpenCV direto para um buffer NumPy do tamanho do
+    label, que um QImage fixo embrulha sem cópia. A máscara dos cantos é calculada
+    uma vez por tamanho (e refeita no resize); fora dos cantos o fundo preto do
+    label aparece, como no pixmap arredondado antigo. O texto sobreposto (contagem
+    regressiva) é desenhado no paintEvent, por cima do mesmo QImage.
+    """
+
+    def __init__(self, radius=27, parent=None):
+        super().__init__(parent, alignment=Qt.AlignCenter)
+        self.radius = radius
+        self.overlay_text = ""
+        self.overlay_font = QFont("Arial", 150, QFont.Bold)
+        self.overlay_color = QColor(255, 255, 0, 200)
+
+        self._buffer = None
+        self._image = None
+        self._corners = []
+        self._has_frame = False
+        self._source_height = 0
+        self._scaled_font = (None, None)  # (escala, QFont)
+
+    def _ensure_buffers(self, width, height):
+        if self._buffer is not None and self._buffer.shape[:2] == (height, width):
+            return
+        self._buffer = np.zeros((height, width, 3), dtype=np.uint8)
+        self._image = QImage(self._buffer.data, width, height, 3 * width, QImage.Format_RGB888)
+
+        radius = min(self.radius, width // 2, height // 2)
+        top_left = _corner_coverage(radius)
+        self._corners = [
+            (slice(0, radius), slice(0, radius), top_left),
+            (slice(0, radius), slice(width - radius, width), top_left[:, ::-1]),
+            (slice(height - radius, height), slice(0, radius), top_left[::-1, :]),
+            (slice(height - radius, height), slice(width - radius, width), top_left[::-1, ::-1]),
+        ]
+
+    def resizeEvent(self, event):
+        # Buffer e máscara dependem do tamanho: são recriados no próximo frame
+        self._buffer = None
+        self._image = None
+        self._has_frame = False
+        super().resizeEvent(event)
+
+    def show_frame(self, rgb_frame):
+        area = self.contentsRect()
+        width, height = area.width(), area.height()
+        if width <= 0 or height <= 0:
+            return
+        if self.text():
+            self.clear()
+
+        self._ensure_buffers(width, height)
+        cv2.resize(rgb_frame, (width, height), dst=self._buffer, interpolation=cv2.INTER_LINEAR)
+        for rows, cols, coverage in self._corners:
+            corner = self._buffer[rows, cols]
+            corner[...] = corner * coverage
+
+        self._source_height = rgb_frame.shape[0]
+        self._has_frame = True
+        self.update()
+
+    def show_message(self, text):
+        self._has_frame = False
+        self.setText(text)
+
+    def _overlay_font_for(self, scale):
+        # Mantém o tamanho relativo do texto de quando ele era desenhado no frame original
+        if self._scaled_font[0] != scale:
+            font = QFont(self.overlay_font)
+            font.setPointSizeF(max(1.0, self.overlay_font.pointSizeF() * scale))
+            self._scaled_font = (scale, font)
+        return self._scaled_font[1]
+
+    def paintEvent(self, event):
+        with profiler.span("paintEvent"):
+            super().paintEvent(event)  # borda/fundo do stylesheet e eventual texto
+            if not self._has_frame:
+                return
+
+            area = self.contentsRect()
+            painter = QPainter(self)
+            painter.drawImage(area.topLeft(), self._image)
+            if self.overlay_text:
+                painter.setFont(self._overlay_font_for(area.height() / self._source_height))
+                painter.setPen(self.overlay_color)
+                painter.drawText(area, Qt.AlignCenter, self.overlay_text)
+            profiler.draw_hud(painter, y=10)
+            painter.end()
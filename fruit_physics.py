@@ -0,0 +1,126 @@
+import numpy as np
+
+GRAVITY = 0.15  # mesmo valor de FallingObject.update
+
+class FruitStore:
+    """
+    Armazena as frutas/bombas do Fruit Ninja em arrays NumPy (struct-of-arrays)
+    em vez de um objeto FallingObject por fruta.
+
+    Gravidade, saída da tela e teste de corte com os cursores rodam em lote sobre
+    todas as entidades de uma vez; remoções trocam o removido pelo último
+    elemento (swap-remove), sem deslocar o resto dos arrays.
+    """
+
+    FIELDS = (
+        ("x", np.float64), ("y", np.float64), ("vx", np.float64), ("vy", np.float64),
+        ("prev_x", np.float64), ("prev_y", np.float64),  # posição no passo anterior (interpolação)
+        ("width", np.int32), ("height", np.int32),
+        ("is_bomb", np.bool_), ("sliced", np.bool_), ("sprite", np.int32),
+    )
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.capacity = capacity
+        for name, dtype in self.FIELDS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        self.sprites = []         # índice -> QPixmap
+        self._sprite_index = {}   # caminho -> índice
+
+    def sprite_id(self, image_path, pixmap):
+        """Registra (uma vez) o pixmap de um caminho e retorna seu índice."""
+        index = self._sprite_index.get(image_path)
+        if index is None:
+            index = len(self.sprites)
+            self.sprites.append(pixmap)
+            self._sprite_index[image_path] = index
+        return index
+
+    def clear(self):
+        self.count = 0
+
+    def _grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name, _dtype in self.FIELDS:
+            array = getattr(self, name)
+            grown = np.zeros(capacity, dtype=array.dtype)
+            grown[:self.count] = array[:self.count]
+            setattr(self, name, grown)
+        self.capacity = capacity
+
+    def spawn(self, x, y, vx, vy, size, is_bomb, sprite):
+        if self.count == self.capacity:
+            self._grow(self.count + 1)
+        i = self.count
+        self.x[i], self.y[i], self.vx[i], self.vy[i] = x, y, vx, vy
+        self.prev_x[i], self.prev_y[i] = x, y
+        self.width[i], self.height[i] = size
+        self.is_bomb[i] = is_bomb
+        self.sliced[i] = False
+        self.sprite[i] = sprite
+        self.count += 1
+
+    def step(self):
+        """Integra um passo de movimento + gravidade para as entidades não cortadas."""
+        n = self.count
+        self.prev_x[:n] = self.x[:n]
+        self.prev_y[:n] = self.y[:n]
+        moving = ~self.sliced[:n]
+        self.x[:n] += np.where(moving, self.vx[:n], 0.0)
+        self.y[:n] += np.where(moving, self.vy[:n], 0.0)
+        self.vy[:n] += np.where(moving, GRAVITY, 0.0)
+
+    def offscreen_mask(self, screen_height):
+        """Entidades que caíram abaixo da tela (já descendo)."""
+        n = self.count
+        return (self.y[:n] > screen_height) & (self.vy[:n] > 0)
+
+    def hit_test(self, cursors, exclude=None):
+        """
+        Retorna os índices das entidades não cortadas que contêm algum cursor.
+        Usa a mesma regra de QRect.contains: int(x) <= px <= int(x) + largura - 1.
+        """
+        n = self.count
+        if n == 0 or len(cursors) == 0:
+            return np.empty(0, dtype=np.intp)
+        points = np.asarray(cursors, dtype=np.int64).reshape(-1, 2)
+        left = self.x[:n].astype(np.int64)
+        top = self.y[:n].astype(np.int64)
+        right = left + self.width[:n] - 1
+        bottom = top + self.height[:n] - 1
+
+        px, py = points[:, 0][:, None], points[:, 1][:, None]
+        inside = (px >= left) & (px <= right) & (py >= top) & (py <= bottom)
+        candidates = inside.any(axis=0) & ~self.sliced[:n]
+        if exclude is not None:
+            candidates &= ~exclude
+        return np.flatnonzero(candidates)
+
+    def remove(self, mask):
+        """Remove as entidades marcadas em `mask` preenchendo os buracos com as do fim (swap-remove)."""
+        n = self.count
+        removed = int(np.count_nonzero(mask))
+        if removed == 0:
+            return
+        new_count = n - removed
+        holes = np.flatnonzero(mask[:new_count])
+        tail = np.flatnonzero(~mask[new_count:n]) + new_count
+        for name, _dtype in self.FIELDS:
+            array = getattr(self, name)
+            array[holes] = array[tail]
+        self.count = new_count
+
+    def draw(self, painter, alpha=1.0):
+        """Desenha as entidades não cortadas, interpoladas entre o passo anterior e o atual."""
+        n = self.count
+        if n == 0:
+            return
+        visible = np.flatnonzero(~self.sliced[:n])
+        prev_x, prev_y = self.prev_x[visible], self.prev_y[visible]
+        xs = (prev_x + (self.x[visible] - prev_x) * alpha).astype(np.int64).tolist()
+        ys = (prev_y + (self.y[visible] - prev_y) * alpha).astype(np.int64).tolist()
+        sprites = self.sprites
+        for x, y, sprite in zip(xs, ys, self.sprite[visible].tolist()):
+            painter.drawPixmap(x, y, sprites[sprite])
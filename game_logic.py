@@ -1,6 +1,8 @@
 import random
 import math
 
+import numpy as np
+
 def distancia(p1, p2):
     return math.sqrt((p1.x - p2.x)**2 + (p1.y - p2.y)**2)
 
@@ -32,6 +34,67 @@ def detectar_gesto(hand_landmarks):
     
     return None
 
+FINGER_TIPS = np.array([8, 12, 16, 20])  # Indicador, Médio, Anelar, Mínimo
+GESTOS = (None, "Joinha", "Pedra", "Tesoura", "Papel")
+# Abaixo disso o lote em NumPy perde para o laço em Python: cada operação de array
+# custa alguns µs fixos, e um frame tem 1 ou 2 mãos (2 mãos: ~0,03 ms em NumPy
+# contra ~0,007 ms no laço; empatam perto de 8 mãos)
+LOTE_MINIMO = 8
+
+def _classificar_mao(mao):
+    """As regras de detectar_gesto para uma mão já em lista [[x, y], ...] (21 pontos)."""
+    dedos = [mao[tip][1] < mao[tip - 2][1] for tip in (8, 12, 16, 20)]
+    total = sum(dedos)
+    if total == 0:
+        dx, dy = mao[4][0] - mao[8][0], mao[4][1] - mao[8][1]
+        return "Joinha" if math.sqrt(dx * dx + dy * dy) > 0.1 else "Pedra"
+    if total == 2 and dedos[0] and dedos[1]:
+        return "Tesoura"
+    if total >= 4:
+        return "Papel"
+    return None
+
+def classificar_gestos(points):
+    """
+    Versão em lote de detectar_gesto: recebe os landmarks de todas as mãos como
+    array (mãos, 21, 3) e retorna uma lista com "Pedra", "Papel", "Tesoura",
+    "Joinha" ou None para cada mão, com exatamente as mesmas regras.
+    O NumPy só entra a partir de LOTE_MINIMO mãos (ex.: a janela de votos do
+    RPS ou uma gravação inteira); as mãos de um frame vão pelo laço em Python.
+    """
+    points = np.asarray(points)
+    if len(points) == 0:
+        return []
+    if len(points) < LOTE_MINIMO:
+        # tolist() dá floats de Python (float64), como os do protobuf em distancia()
+        return [_classificar_mao(mao) for mao in points[:, :21, :2].tolist()]
+    dedos = points[:, FINGER_TIPS, 1] < points[:, FINGER_TIPS - 2, 1]
+    total = dedos.sum(axis=1)
+    # Distância em float64, como distancia() faz com os floats do protobuf
+    delta = points[:, 4, :2].astype(np.float64) - points[:, 8, :2].astype(np.float64)
+    polegar_longe = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2) > 0.1
+
+    # Código de cada mão, na mesma prioridade dos ifs de detectar_gesto
+    codigo = np.where(total == 0, np.where(polegar_longe, 1, 2), 0)
+    codigo[(total == 2) & dedos[:, 0] & dedos[:, 1]] = 3
+    codigo[total >= 4] = 4
+    return [GESTOS[c] for c in codigo.tolist()]
+
+def votar_jogada(gestos):
+    """
+    Jogada por maioria entre vários frames: o gesto mais frequente entre Pedra,
+    Papel e Tesoura (Joinha e None não votam). Em caso de empate vence o que
+    apareceu por último. Retorna None se nenhum frame tiver uma jogada válida.
+    """
+    votos = {}
+    for posicao, gesto in enumerate(gestos):
+        if gesto in ("Pedra", "Papel", "Tesoura"):
+            quantidade, _ultima = votos.get(gesto, (0, -1))
+            votos[gesto] = (quantidade + 1, posicao)
+    if not votos:
+        return None
+    return max(votos, key=lambda gesto: votos[gesto])
+
 def decidir_vencedor(jogador, computador):
     if jogador == computador:
         return "Empate"
@@ -0,0 +1,176 @@
+import time
+
+import numpy as np
+from PySide6.QtCore import Qt, QTimer
+
+from frame_profiler import profiler
+
+class FixedStepLoop:
+    """
+    Laço de jogo com passo de simulação fixo, guiado por `clock` (padrão:
+    time.monotonic(); no replay, o horário gravado dos frames).
+
+    A cada tick do QTimer (Qt.PreciseTimer) o tempo real decorrido entra num
+    acumulador e `step()` roda quantas vezes couber um passo de 1/hz segundos.
+    Ticks atrasados (ex.: get_frame lento) são compensados com passos extras,
+    no máximo `max_steps` por tick; o que passar disso é descartado para o jogo
+    não entrar numa espiral tentando recuperar o atraso. Assim a simulação anda
+    a 60 Hz de tempo real tanto numa máquina lenta quanto numa rápida.
+
+    Antes dos passos roda `before_steps()` (entrada: câmera/landmarks) e depois
+    `render(alpha)`, onde `alpha` (0..1) é a fração de passo que sobrou no
+    acumulador: o desenho interpola entre o estado anterior e o atual.
+
+    Os SimulationTimer do laço (spawn, dificuldade...) andam junto com os passos,
+    no mesmo relógio da simulação.
+    """
+
+    def __init__(self, parent, step, render, before_steps=None, hz=60, max_steps=5, history=600, clock=time.monotonic):
+        self.step = step
+        self.render = render
+        self.before_steps = before_steps
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps
+        self.alpha = 1.0
+        self.running = False
+        self.clock = clock
+        self.timers = []
+
+        self.timer = QTimer(parent)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(int(1000 * self.dt))
+        self.timer.timeout.connect(self._tick)
+
+        self._last = 0.0
+        self._expected = 0.0
+        self._accumulator = 0.0
+        self._lateness = np.zeros(history, dtype=np.float64)  # ms, buffer circular
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.ticks = 0
+        self.steps = 0
+        self.catch_up_ticks = 0   # ticks que precisaram de mais de um passo
+        self.capped_ticks = 0     # ticks que bateram em max_steps
+        self.dropped_ms = 0.0     # tempo descartado por causa do limite
+
+    def start(self):
+        self._last = self.clock()
+        self._expected = time.monotonic() + self.timer.interval() / 1000.0
+        self._accumulator = 0.0
+        self.alpha = 1.0
+        self._reset_stats()
+        self.running = True
+        self.timer.start()
+
+    def stop(self):
+        self.running = False
+        self.timer.stop()
+
+    def isActive(self):
+        return self.running
+
+    def _tick(self):
+        now = time.monotonic()
+        self._lateness[self.ticks % len(self._lateness)] = (now - self._expected) * 1000.0
+        self.ticks += 1
+        self._expected = now + self.timer.interval() / 1000.0
+        # O atraso dos ticks é sempre no relógio de parede; o acumulador, no da simulação
+        sim_now = self.clock()
+        self._accumulator += sim_now - self._last
+        self._last = sim_now
+
+        if self.before_steps is not None:
+            with profiler.span("update_game_state"):
+                self.before_steps()
+
+        steps = 0
+        # end_game() pode parar o laço no meio de um passo: não simula depois disso
+        while self.running and self._accumulator >= self.dt and steps < self.max_steps:
+            with profiler.span("simulation_step"):
+                self.step()
+            for timer in self.timers:
+                if self.running: timer.advance(self.dt)
+            self._accumulator -= self.dt
+            steps += 1
+        self.steps += steps
+        if steps > 1:
+            self.catch_up_ticks += 1
+        if self._accumulator >= self.dt:
+            self.capped_ticks += 1
+            dropped = self._accumulator - self._accumulator % self.dt
+            self.dropped_ms += dropped * 1000.0
+            self._accumulator -= dropped
+
+        self.alpha = min(self._accumulator / self.dt, 1.0)
+        self.render(self.alpha)
+
+    def stats(self):
+        """Atraso dos ticks em relação ao horário esperado (ms) e contadores de passos."""
+        count = min(self.ticks, len(self._lateness))
+        lateness = self._lateness[:count]
+        return {
+            "ticks": self.ticks,
+            "steps": self.steps,
+            "catch_up_ticks": self.catch_up_ticks,
+            "capped_ticks": self.capped_ticks,
+            "dropped_ms": self.dropped_ms,
+            "lateness_mean_ms": float(lateness.mean()) if count else 0.0,
+            "lateness_p95_ms": float(np.percentile(lateness, 95)) if count else 0.0,
+            "lateness_max_ms": float(lateness.max()) if count else 0.0,
+        }
+
+class SimulationTimer:
+    """
+    Substituto do QTimer para eventos do jogo (spawn, dificuldade, escudo): conta
+    o tempo dos passos do FixedStepLoop em vez do relógio de parede, então no
+    replay dispara nos mesmos passos em toda execução. Mesma interface usada do
+    QTimer: start([ms]), stop(), isActive(), interval(), setInterval(ms).
+    """
+
+    def __init__(self, loop, callback, single_shot=False):
+        self.callback = callback
+        self.single_shot = single_shot
+        self._interval = 0.0
+        self._elapsed = 0.0
+        self._active = False
+        loop.timers.append(self)
+
+    def start(self, msec=None):
+        if msec is not None:
+            self._interval = msec / 1000.0
+        self._elapsed = 0.0
+        self._active = True
+
+    def stop(self):
+        self._active = False
+
+    def isActive(self):
+        return self._active
+
+    def interval(self):
+        return int(round(self._interval * 1000))
+
+    def setInterval(self, msec):
+        # Como no QTimer: com o timer ativo, a contagem recomeça
+        self._interval = msec / 1000.0
+        self._elapsed = 0.0
+
+    def advance(self, dt):
+        if not self._active:
+            return
+        self._elapsed += dt
+        # Folga de 1 µs: 60 passos de 1/60 s somam um pouco menos que 1 s em float.
+        # Intervalo 0 dispararia sem parar: no máximo uma vez por passo
+        while self._active and self._elapsed >= self._interval - 1e-6:
+            self._elapsed -= self._interval
+            if self.single_shot:
+                self._active = False
+            self.callback()
+            if self._interval <= 0:
+                self._elapsed = 0.0
+                break
+
+def lerp(previous, current, alpha):
+    """Posição interpolada entre o passo anterior e o atual."""
+    return previous + (current - previous) * alpha
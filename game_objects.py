@@ -1,24 +1,42 @@
-from PySide6.QtGui import QPixmap
 from PySide6.QtCore import QRect
 import random
 
+from sprite_cache import get_sprite, sprite_cache
+from game_loop import lerp
+
+def preload_sprites(image_paths, size=(80, 80)):
+    """Decodifica e redimensiona todos os sprites antes do jogo começar."""
+    sprite_cache.preload(image_paths, [size])
+
 class FallingObject:
-    def __init__(self, image_path, settings, size=(80, 80), is_bomb=False): # Adicionado 'settings'
-        self.pixmap = QPixmap(image_path).scaled(size[0], size[1])
+    # Sem __dict__: as frutas vêm de um EntityPool (entity_pool.py) e são reaproveitadas
+    __slots__ = ("pixmap", "size", "is_bomb", "sliced", "x", "y", "prev_x", "prev_y", "vx", "vy")
+
+    def __init__(self, image_path, settings, size=(80, 80), is_bomb=False, rng=random): # Adicionado 'settings'
+        self.reset(image_path, settings, size, is_bomb, rng)
+
+    def reset(self, image_path, settings, size=(80, 80), is_bomb=False, rng=random):
+        """
+        (Re)inicializa a fruta/bomba para um novo lançamento; mesmos sorteios, na mesma
+        ordem, de sempre. `rng` é o do SpawnScheduler do jogo (padrão: o `random` global).
+        """
+        self.pixmap = get_sprite(image_path, size[0], size[1])
         self.size = size
         self.is_bomb = is_bomb
         self.sliced = False
         
-        self.x = random.randint(100, 700)
+        self.x = rng.randint(100, 700)
         self.y = 600
+        self.prev_x, self.prev_y = self.x, self.y # posição no passo anterior (interpolação)
 
         # --- MUDANÇA AQUI ---
         # A velocidade agora é definida pelas configurações do estágio atual do jogo
-        self.vx = random.uniform(-1.5, 1.5)
-        self.vy = random.uniform(settings['min_vy'], settings['max_vy'])
+        self.vx = rng.uniform(-1.5, 1.5)
+        self.vy = rng.uniform(settings['min_vy'], settings['max_vy'])
 
     def update(self):
         """Atualiza a posição do objeto, aplicando gravidade."""
+        self.prev_x, self.prev_y = self.x, self.y
         if not self.sliced:
             self.x += self.vx
             self.y += self.vy
@@ -28,6 +46,11 @@ class FallingObject:
         """Retorna a área de colisão do objeto."""
         return QRect(int(self.x), int(self.y), self.size[0], self.size[1])
 
-    def draw(self, painter):
-        """Desenha o objeto na tela."""
-        painter.drawPixmap(int(self.x), int(self.y), self.pixmap)
\ No newline at end of file
+    def contains(self, px, py):
+        """Mesmo teste de get_rect().contains(QPoint(px, py)), sem criar um QRect por cursor."""
+        left, top = int(self.x), int(self.y)
+        return left <= px < left + self.size[0] and top <= py < top + self.size[1]
+
+    def draw(self, painter, alpha=1.0):
+        """Desenha o objeto na tela, interpolado entre o passo anterior e o atual."""
+        painter.drawPixmap(int(lerp(self.prev_x, self.x, alpha)), int(lerp(self.prev_y, self.y, alpha)), self.pixmap)
\ No newline at end of file
@@ -1,68 +1,105 @@
 import random
 from PySide6.QtCore import QRectF, Qt 
-from PySide6.QtGui import QPixmap, QPainter, QColor, QPen, QFont # Importa QFont
+from PySide6.QtGui import QPainter, QColor, QPen, QFont # Importa QFont
+
+from sprite_cache import get_sprite, sprite_cache
+from game_loop import lerp
+
+# Faixa de tamanhos sorteados para obstáculos e coletáveis (usada também no pré-carregamento)
+OBJECT_SIZE_RANGE = (80, 120)
+PLAYER_SIZE = 120
+
+def preload_sprites(object_paths, player_image_path=None):
+    """
+    Decodifica e redimensiona antecipadamente os sprites de obstáculos/coletáveis
+    em todos os tamanhos possíveis, além do sprite do jogador.
+    """
+    sizes = [(s, s) for s in range(OBJECT_SIZE_RANGE[0], OBJECT_SIZE_RANGE[1] + 1)]
+    sprite_cache.preload(object_paths, sizes)
+    if player_image_path:
+        sprite_cache.preload([player_image_path], [(PLAYER_SIZE, PLAYER_SIZE)], Qt.KeepAspectRatio, Qt.SmoothTransformation)
 
 class Obstacle:
-    def __init__(self, screen_width, screen_height, image_path=None):
+    # Sem __dict__: obstáculos e coletáveis vêm de EntityPools (entity_pool.py) e são reaproveitados
+    __slots__ = ("screen_width", "screen_height", "size", "x", "y", "prev_y", "speed", "image_path", "pixmap")
+
+    def __init__(self, screen_width, screen_height, image_path=None, rng=random):
+        self.reset(screen_width, screen_height, image_path, rng)
+
+    def reset(self, screen_width, screen_height, image_path=None, rng=random):
+        """
+        (Re)inicializa para um novo spawn, com os mesmos sorteios (e na mesma ordem) de
+        antes. `rng` é o do SpawnScheduler do jogo (padrão: o `random` global).
+        """
         self.screen_width = screen_width
         self.screen_height = screen_height
         
-        self.size = random.randint(80, 120) 
-        self.x = random.randint(0, screen_width - self.size)
+        self.size = rng.randint(*OBJECT_SIZE_RANGE) 
+        self.x = rng.randint(0, screen_width - self.size)
         self.y = -self.size
-        self.speed = random.randint(5, 10) 
+        self.prev_y = self.y # posição no passo anterior (interpolação)
+        self.speed = rng.randint(5, 10) 
 
         self.image_path = image_path
         self.pixmap = None
         if self.image_path:
             try:
-                self.pixmap = QPixmap(self.image_path).scaled(self.size, self.size)
+                self.pixmap = get_sprite(self.image_path, self.size, self.size)
             except Exception as e:
                 print(f"Erro ao carregar imagem do obstáculo '{image_path}': {e}")
                 self.pixmap = None
 
     def update(self):
+        self.prev_y = self.y
         self.y += self.speed
 
     def get_rect(self):
         return QRectF(self.x, self.y, self.size, self.size)
 
-    def draw(self, painter, color=None):
+    def draw(self, painter, color=None, alpha=1.0):
+        y = lerp(self.prev_y, self.y, alpha)
         if self.pixmap and not self.pixmap.isNull():
-            painter.drawPixmap(int(self.x), int(self.y), self.pixmap)
+            painter.drawPixmap(int(self.x), int(y), self.pixmap)
         else:
             painter.setBrush(QColor(color if color else "#C0392B"))
             painter.setPen(Qt.NoPen)
-            painter.drawRect(int(self.x), int(self.y), self.size, self.size)
+            painter.drawRect(int(self.x), int(y), self.size, self.size)
 
 class Collectible(Obstacle): # Herda de Obstacle para reusar a lógica de movimento e desenho
-    def __init__(self, screen_width, screen_height, image_path="assets/face-game/astronauta.png"):
-        super().__init__(screen_width, screen_height, image_path)
-        self.size = random.randint(80, 120) 
-        self.pixmap = QPixmap(self.image_path).scaled(self.size, self.size)
-        self.speed = random.randint(6, 11) 
+    __slots__ = ()
 
-    def draw(self, painter):
+    def __init__(self, screen_width, screen_height, image_path="assets/face-game/astronauta.png", rng=random):
+        self.reset(screen_width, screen_height, image_path, rng)
+
+    def reset(self, screen_width, screen_height, image_path="assets/face-game/astronauta.png", rng=random):
+        Obstacle.reset(self, screen_width, screen_height, image_path, rng) # sem criar um objeto super() por spawn
+        self.size = rng.randint(*OBJECT_SIZE_RANGE) 
+        self.pixmap = get_sprite(self.image_path, self.size, self.size)
+        self.speed = rng.randint(6, 11) 
+
+    def draw(self, painter, alpha=1.0):
+        y = lerp(self.prev_y, self.y, alpha)
         if self.pixmap and not self.pixmap.isNull():
-            painter.drawPixmap(int(self.x), int(self.y), self.pixmap)
+            painter.drawPixmap(int(self.x), int(y), self.pixmap)
         else:
             painter.setBrush(QColor("#FFD700")) 
             painter.setPen(Qt.NoPen)
-            painter.drawEllipse(int(self.x), int(self.y), self.size, self.size)
+            painter.drawEllipse(int(self.x), int(y), self.size, self.size)
 
 class Player:
-    def __init__(self, player_id, screen_width, screen_height, colors, image_path=None):
+    def __init__(self, player_id, screen_width, screen_height, colors, image_path=None, num_players=2):
         self.player_id = player_id 
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.colors = colors
+        # Com mais de um jogador, "P<id>" em cima de cada um (todos usam o mesmo sprite)
+        self.show_label = num_players > 1
         
-        self.size = 120 
+        self.size = PLAYER_SIZE 
         
-        if self.player_id == 1:
-            self.x = (screen_width / 4) - (self.size / 2)
-        else: # player_id == 2
-            self.x = (3 * screen_width / 4) - (self.size / 2)
+        # Começa na coluna do seu ID (com 1 ou 2 jogadores: 1/4 e 3/4 da tela, como antes)
+        columns = max(num_players, 2)
+        self.x = ((self.player_id - 0.5) * screen_width / columns) - (self.size / 2)
         
         self.y = screen_height - self.size - 20
         self.speed = 10 
@@ -70,6 +107,7 @@ class Player:
         self.is_jumping = False 
         self.jump_height = 80 
         self.current_jump_offset = 0 
+        self.prev_jump_offset = 0 # altura do pulo no passo anterior (interpolação)
         self.jump_speed = 8 
         self.invincible = False
         self.invincibility_duration = 1.5
@@ -80,7 +118,7 @@ class Player:
         self.pixmap = None
         if self.image_path:
             try:
-                self.pixmap = QPixmap(self.image_path).scaled(self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                self.pixmap = get_sprite(self.image_path, self.size, self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             except Exception as e:
                 print(f"Erro ao carregar imagem do jogador '{image_path}': {e}")
                 self.pixmap = None
@@ -90,6 +128,7 @@ class Player:
             self.x = max(0, min(target_x - self.size / 2, self.screen_width - self.size))
 
     def update_jump(self):
+        self.prev_jump_offset = self.current_jump_offset
         if not self.is_out: 
             if self.is_jumping:
                 if self.current_jump_offset < self.jump_height:
@@ -111,8 +150,13 @@ class Player:
             return QRectF(-1000, -1000, 1, 1) # Retorna um retângulo fora da tela, quase invisível
         return QRectF(self.x, self.y - self.current_jump_offset, self.size, self.size)
 
-    def draw(self, painter):
-        player_y_pos = self.y - self.current_jump_offset
+    def get_bounds(self):
+        """Mesma área de get_rect() como tupla (esquerda, topo, direita, base), sem criar um QRectF."""
+        top = self.y - self.current_jump_offset
+        return (self.x, top, self.x + self.size, top + self.size)
+
+    def draw(self, painter, alpha=1.0):
+        player_y_pos = self.y - lerp(self.prev_jump_offset, self.current_jump_offset, alpha)
 
         if self.is_out: # Desenha o jogador de forma diferente se estiver fora
             painter.setOpacity(0.4) # Transparente
@@ -136,6 +180,11 @@ class Player:
             painter.setPen(Qt.NoPen)
             painter.drawEllipse(int(self.x), int(player_y_pos), self.size, self.size)
         
+        if self.show_label:
+            painter.setFont(QFont("Arial", 16, QFont.Bold))
+            painter.setPen(QColor(self.colors["text_light"]))
+            painter.drawText(int(self.x), int(player_y_pos) - 28, self.size, 24, Qt.AlignCenter, f"P{self.player_id}")
+
         if self.invincible:
             painter.setBrush(QColor(255, 255, 0, 100)) 
             painter.setPen(QPen(QColor(self.colors["text_light"]), 3)) 
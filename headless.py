@@ -0,0 +1,83 @@
+import json
+import time
+
+from PySide6.QtCore import QTimer
+
+from frame_profiler import profiler
+from entity_pool import pool_stats
+
+class ThroughputMeter:
+    """
+    Vazão de um jogo rodando sem janela: frames lidos da fonte, frames
+    processados pela thread da câmera e ticks/passos do laço do jogo por segundo,
+    contados a partir de start().
+    """
+
+    def __init__(self, camera, game_loop=None):
+        self.camera = camera
+        self.game_loop = game_loop
+        self._started = None
+        self._base = {}
+
+    def _counters(self):
+        counters = {}
+        source = getattr(self.camera, "cap", None)
+        if source is not None and hasattr(source, "frames_read"):
+            counters["source_frames"] = source.frames_read
+        pipeline = self.camera.pipeline_stats() if hasattr(self.camera, "pipeline_stats") else None
+        if pipeline:
+            counters["processed_frames"] = pipeline["published"]
+            counters["dropped_frames"] = pipeline["dropped"]
+        return counters
+
+    def start(self):
+        self._started = time.monotonic()
+        self._base = self._counters()
+
+    def report(self):
+        elapsed = time.monotonic() - self._started
+        report = {"seconds": round(elapsed, 3)}
+        for name, value in self._counters().items():
+            count = value - self._base.get(name, 0)
+            report[name] = count
+            if name != "dropped_frames":
+                report[name.replace("_frames", "_fps")] = round(count / elapsed, 2)
+        if self.game_loop is not None:
+            # stats() do laço já conta a partir do start() da partida
+            loop = self.game_loop.stats()
+            report["ticks_per_s"] = round(loop["ticks"] / elapsed, 2)
+            report["steps_per_s"] = round(loop["steps"] / elapsed, 2)
+            report["tick_lateness_p95_ms"] = round(loop["lateness_p95_ms"], 3)
+        pools = pool_stats()
+        if pools:
+            # Entidades criadas x reaproveitadas e o pico em uso, por tipo
+            report["entity_pools"] = pools
+        if profiler.enabled:
+            report["stages"] = {name: round(s["p50_ms"], 3) for name, s in profiler.stats().items()}
+        return report
+
+def run_headless(app, window, start_game, duration, loader, game_loop=None):
+    """
+    Roda o jogo sem display: espera o CameraLoader deixar a câmera pronta, chama
+    `start_game()`, mede por `duration` segundos, imprime a vazão e fecha a janela.
+    A vazão sai como uma linha só de JSON, sem prefixo, e é a última linha do
+    stdout: em CI, `tail -n 1` entrega direto para o parser de JSON.
+    """
+    def begin(camera):
+        meter = ThroughputMeter(camera, game_loop)
+        start_game()
+        meter.start()
+        QTimer.singleShot(int(duration * 1000), lambda: finish(meter))
+
+    def finish(meter):
+        print(json.dumps(meter.report()), flush=True)
+        window.close()
+        app.quit()
+
+    def failed(_message):
+        window.close()
+        app.exit(1)
+
+    loader.ready.connect(begin)
+    loader.failed.connect(failed)
+    return app.exec()
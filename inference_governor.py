@@ -0,0 +1,133 @@
+"""
+Política de captura/inferência por tela, para quiosques que ficam ligados o dia todo.
+
+Cada tela do QStackedWidget tem um modo:
+    off       nada de captura nem inferência (telas estáticas: início, fim de jogo)
+    trigger   detector em taxa baixa, quando só é preciso ver um gesto de início (👍)
+    full      taxa máxima, durante a partida
+A troca de tela do stack aplica o modo da nova tela; fases dentro de uma mesma
+tela (ex.: contagem regressiva do Pedra-Papel-Tesoura) usam enter() direto.
+Câmera e modelo continuam abertos em todos os modos: só a thread de captura
+pausa ou desacelera (Camera.set_capture_rate), então voltar ao jogo é imediato.
+
+O tempo de CPU do processo (todas as threads) é somado por tela. Com
+VISION_GAMES_GOVERNOR_REPORT=1 o relatório sai numa linha JSON ao fechar o jogo;
+benchmarks/bench_idle.py compara com VISION_GAMES_GOVERNOR=0 (sempre full).
+O processo separado do FaceMesh (VISION_GAMES_FACE_WORKER=1) obedece aos modos,
+mas a CPU dele não entra na conta.
+"""
+import json
+import os
+import time
+
+from PySide6.QtCore import QObject, Signal
+
+OFF, TRIGGER, FULL = "off", "trigger", "full"
+MODES = (OFF, TRIGGER, FULL)
+DEFAULT_TRIGGER_HZ = 6.0
+
+class InferenceGovernor(QObject):
+    """
+    Aplica o modo de cada tela à câmera e mede CPU por tela.
+
+    `screens` é {widget do stack: (nome, modo)}. A câmera chega por watch(loader):
+    o modo só passa a valer depois da primeira inferência, que confirma que
+    câmera e modelo funcionam (e mantém a medição de inicialização).
+    `mode_changed(modo)` avisa os jogos que têm timers próprios de câmera.
+    """
+
+    mode_changed = Signal(str)
+
+    def __init__(self, stack, screens, trigger_hz=None, enabled=None, parent=None):
+        super().__init__(parent)
+        if enabled is None:
+            enabled = os.environ.get("VISION_GAMES_GOVERNOR", "1") != "0"
+        if trigger_hz is None:
+            trigger_hz = float(os.environ.get("VISION_GAMES_TRIGGER_HZ", DEFAULT_TRIGGER_HZ))
+        self.enabled = enabled
+        self.trigger_hz = trigger_hz
+        self.camera = None
+        self.screens = screens
+        self.name = None
+        self.mode = None
+        self.usage = {}  # nome -> {"mode", "seconds", "cpu_seconds", "visits"}
+        self._entered = (0.0, 0.0)
+        self._loader = None
+
+        stack.currentChanged.connect(lambda index: self._on_screen_changed(stack.widget(index)))
+        self._on_screen_changed(stack.currentWidget())
+
+    def watch(self, loader):
+        """Passa a controlar a câmera do CameraLoader assim que ela fizer a primeira inferência."""
+        self._loader = loader
+        loader.first_inference.connect(self._on_first_inference)
+
+    def _on_first_inference(self):
+        # Entregue na thread da interface (o sinal sai da thread do loader)
+        self.attach(self._loader.camera)
+
+    def attach(self, camera):
+        self.camera = camera
+        self._apply()
+
+    def _on_screen_changed(self, widget):
+        if widget in self.screens:
+            self.enter(*self.screens[widget])
+
+    def enter(self, name, mode):
+        """Troca a fase atual: fecha a conta de CPU da anterior e aplica o modo da nova."""
+        if mode not in MODES:
+            raise ValueError(f"Modo '{mode}' inválido (use {', '.join(MODES)}).")
+        if name == self.name and mode == self.mode:
+            return
+        self._account()
+        self.name, self.mode = name, mode
+        entry = self.usage.setdefault(name, {"mode": mode, "seconds": 0.0, "cpu_seconds": 0.0, "visits": 0})
+        entry["mode"] = mode
+        entry["visits"] += 1
+        self._apply()
+        self.mode_changed.emit(self.effective_mode())
+
+    def effective_mode(self):
+        return self.mode if self.enabled else FULL
+
+    def capture_rate(self):
+        """Taxa para Camera.set_capture_rate(): None = sem limite, 0 = pausada."""
+        mode = self.effective_mode()
+        if mode == OFF:
+            return 0
+        if mode == TRIGGER:
+            return self.trigger_hz
+        return None
+
+    def _apply(self):
+        if self.camera is not None and hasattr(self.camera, "set_capture_rate"):
+            self.camera.set_capture_rate(self.capture_rate())
+
+    def _account(self):
+        now, cpu = time.monotonic(), time.process_time()
+        if self.name is not None:
+            entry = self.usage[self.name]
+            entry["seconds"] += now - self._entered[0]
+            entry["cpu_seconds"] += cpu - self._entered[1]
+        self._entered = (now, cpu)
+
+    def report(self):
+        """CPU por tela/fase até agora: segundos, CPU e % de um núcleo."""
+        self._account()
+        report = {}
+        for name, entry in self.usage.items():
+            seconds = entry["seconds"]
+            report[name] = {
+                "mode": entry["mode"] if self.enabled else FULL,
+                "visits": entry["visits"],
+                "seconds": round(seconds, 3),
+                "cpu_seconds": round(entry["cpu_seconds"], 3),
+                "cpu_percent": round(100.0 * entry["cpu_seconds"] / seconds, 1) if seconds > 0 else 0.0,
+            }
+        return report
+
+    def print_report(self):
+        """Com VISION_GAMES_GOVERNOR_REPORT=1, imprime report() numa linha JSON."""
+        if os.environ.get("VISION_GAMES_GOVERNOR_REPORT") == "1":
+            print("CPU por tela: " + json.dumps(self.report()), flush=True)
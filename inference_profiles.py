@@ -0,0 +1,138 @@
+"""
+Perfis de inferência por jogo: qual modelo do MediaPipe cada jogo roda e com que custo.
+
+Antes todo jogo usava a configuração mais pesada (Hands com 2 mãos e modelo
+completo; FaceMesh com os 10 pontos das íris). Um perfil declara:
+
+    kind                      "hand" (Hands) ou "face" (FaceMesh)
+    max_items                 máximo de mãos/rostos por frame
+    model_complexity          Hands: 0 (leve) ou 1 (completo)
+    refine_landmarks          FaceMesh: íris (478 pontos) ou não (468); só o desenho usa
+    min_detection_confidence  limiares do detector e do rastreador
+    min_tracking_confidence
+    landmarks                 índices que a jogabilidade lê (None = todos); é neles que
+                              benchmarks/bench_profiles.py mede a qualidade
+
+Cada jogo tem um perfil padrão (GAME_PROFILES); VISION_GAMES_PROFILE_<JOGO>
+(ex.: VISION_GAMES_PROFILE_RPS=rps-lite) troca por outro de PROFILES. O ModelPool
+guarda modelos por nome de perfil: só perfis iguais compartilham o modelo.
+
+A Esquiva Facial troca de perfil conforme o número de jogadores da partida
+(FACE_PROFILES_BY_PLAYERS): enquanto acha menos rostos que max_num_faces, o
+FaceMesh roda o detector de rosto de novo a cada frame, e cada rosto achado
+ganha a malha inteira. Com o limite de 6, uma partida solo pagaria o detector
+em todo frame e a malha de quem passasse atrás do jogador.
+"""
+import os
+
+import numpy as np
+
+from landmarks import MAX_FACES, NUM_FACE_LANDMARKS, NUM_HAND_LANDMARKS
+
+HAND, FACE = "hand", "face"
+NUM_FACE_LANDMARKS_NO_IRIS = 468
+
+# Pontos lidos pelos jogos
+FINGERTIP = (8,)  # Fruit Ninja: ponta do indicador
+GESTURE_LANDMARKS = (4, 6, 8, 10, 12, 14, 16, 18, 20)  # classificar_gestos: pontas e articulações
+FACE_GAMEPLAY_LANDMARKS = (1, 13, 14, 33, 263)  # nariz, lábios (escudo) e cantos dos olhos (rastreio)
+
+class InferenceProfile:
+    def __init__(self, name, kind, max_items, model_complexity=1, refine_landmarks=False,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5, landmarks=None):
+        if kind not in (HAND, FACE):
+            raise ValueError(f"Tipo de perfil inválido: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_items = max_items
+        self.model_complexity = model_complexity
+        self.refine_landmarks = refine_landmarks
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.landmarks = landmarks
+
+    @property
+    def num_landmarks(self):
+        if self.kind == HAND:
+            return NUM_HAND_LANDMARKS
+        return NUM_FACE_LANDMARKS if self.refine_landmarks else NUM_FACE_LANDMARKS_NO_IRIS
+
+    def landmark_indices(self):
+        return np.arange(self.num_landmarks) if self.landmarks is None else np.array(self.landmarks)
+
+    def model_options(self):
+        """Argumentos do construtor do Hands/FaceMesh."""
+        if self.kind == HAND:
+            return dict(max_num_hands=self.max_items, model_complexity=self.model_complexity,
+                        min_detection_confidence=self.min_detection_confidence,
+                        min_tracking_confidence=self.min_tracking_confidence)
+        return dict(max_num_faces=self.max_items, refine_landmarks=self.refine_landmarks, static_image_mode=False,
+                    min_detection_confidence=self.min_detection_confidence,
+                    min_tracking_confidence=self.min_tracking_confidence)
+
+    def create_model(self):
+        """
+        Modelo do MediaPipe já aquecido. O import fica aqui (leva ~1 s) para os jogos
+        mostrarem a tela inicial antes; ver camera_loader.py.
+        """
+        import mediapipe as mp
+        if self.kind == HAND:
+            model = mp.solutions.hands.Hands(**self.model_options())
+        else:
+            model = mp.solutions.face_mesh.FaceMesh(**self.model_options())
+        # Inferência de aquecimento num frame preto: o primeiro process() inicializa o
+        # grafo e é bem mais lento que os seguintes; melhor pagar isso antes da partida
+        model.process(np.zeros((480, 640, 3), dtype=np.uint8))
+        return model
+
+    def describe(self):
+        options = self.model_options()
+        options["landmarks"] = "todos" if self.landmarks is None else list(self.landmarks)
+        return options
+
+    def __repr__(self):
+        return f"InferenceProfile({self.name!r})"
+
+PROFILES = {profile.name: profile for profile in (
+    # Configurações de antes: referência de qualidade nos benchmarks
+    InferenceProfile("hand-full", HAND, 2, model_complexity=1, min_detection_confidence=0.7),
+    InferenceProfile("face-full", FACE, MAX_FACES, refine_landmarks=True),
+
+    # Fruit Ninja: duas mãos cortando, ponta do indicador em movimento rápido
+    InferenceProfile("ninja", HAND, 2, model_complexity=1, min_detection_confidence=0.7, landmarks=FINGERTIP),
+    InferenceProfile("ninja-lite", HAND, 2, model_complexity=0, min_detection_confidence=0.7, landmarks=FINGERTIP),
+    # Pedra-Papel-Tesoura: um jogador, uma mão
+    InferenceProfile("rps", HAND, 1, model_complexity=1, min_detection_confidence=0.7, landmarks=GESTURE_LANDMARKS),
+    InferenceProfile("rps-lite", HAND, 1, model_complexity=0, min_detection_confidence=0.7, landmarks=GESTURE_LANDMARKS),
+    # Esquiva Facial: nariz e boca não precisam das íris; um perfil por tamanho de partida
+    InferenceProfile("face-solo", FACE, 1, refine_landmarks=False, landmarks=FACE_GAMEPLAY_LANDMARKS),
+    InferenceProfile("face-duo", FACE, 2, refine_landmarks=False, landmarks=FACE_GAMEPLAY_LANDMARKS),
+    InferenceProfile("face-group", FACE, MAX_FACES, refine_landmarks=False, landmarks=FACE_GAMEPLAY_LANDMARKS),
+)}
+
+# Perfil com que a câmera de cada jogo abre
+GAME_PROFILES = {"ninja": "ninja", "rps": "rps", "face": "face-solo"}
+# Esquiva Facial: perfil da partida pelo número de jogadores (3 ou mais: "face-group")
+FACE_PROFILES_BY_PLAYERS = {1: "face-solo", 2: "face-duo"}
+
+def profile_for(game, players=None):
+    """
+    Perfil do jogo: VISION_GAMES_PROFILE_<JOGO> ou o padrão de GAME_PROFILES. Com
+    `players` (Esquiva Facial), o padrão é o de FACE_PROFILES_BY_PLAYERS; um perfil
+    do ambiente que não comporta tantos rostos é ignorado nessa partida.
+    """
+    expected = FACE if game == "face" else HAND
+    default = GAME_PROFILES[game]
+    if players is not None and expected == FACE:
+        default = FACE_PROFILES_BY_PLAYERS.get(players, "face-group")
+    name = os.environ.get(f"VISION_GAMES_PROFILE_{game.upper()}") or default
+    if name not in PROFILES:
+        raise ValueError(f"Perfil de inferência desconhecido: '{name}' (use {', '.join(PROFILES)}).")
+    profile = PROFILES[name]
+    if profile.kind != expected:
+        raise ValueError(f"O perfil '{name}' é de {profile.kind}, mas o jogo '{game}' usa {expected}.")
+    if players is not None and profile.max_items < players:
+        print(f"Aviso: o perfil '{name}' acha no máximo {profile.max_items} rosto(s); usando '{default}' "
+              f"para {players} jogadores.")
+        profile = PROFILES[default]
+    return profile
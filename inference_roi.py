@@ -0,0 +1,118 @@
+import os
+
+import cv2
+import numpy as np
+
+class InferenceRegion:
+    """
+    Escolhe o que é enviado ao MediaPipe: um recorte em volta das últimas
+    mãos/rostos detectados (modo ROI) e/ou uma versão reduzida do frame
+    (`inference_width`), independente da resolução mostrada na tela.
+
+    Depois da inferência, `finish()` converte os landmarks de volta para
+    coordenadas normalizadas do frame inteiro, então o código dos jogos não muda.
+    Sem detecções o recorte é abandonado e o próximo frame volta a ser inteiro;
+    com menos detecções que o máximo, um frame inteiro é usado a cada
+    `full_frame_interval` frames para achar quem acabou de entrar na câmera.
+    """
+
+    def __init__(self, inference_width=None, roi=False, margin=0.35, min_size=0.3,
+                 max_items=2, full_frame_interval=15):
+        self.inference_width = inference_width
+        self.roi = roi
+        self.margin = margin
+        self.min_size = min_size
+        self.max_items = max_items
+        self.full_frame_interval = full_frame_interval
+
+        self.crop = None  # (x0, y0, x1, y1) em pixels do frame inteiro; None = frame inteiro
+        self._frames_since_full = 0
+        self._missing_items = True
+        self.full_frame_runs = 0
+        self.roi_runs = 0
+
+    def prepare(self, rgb_frame):
+        """Retorna (imagem para o modelo, recorte usado)."""
+        crop = self.crop if self.roi else None
+        if crop is not None and self._missing_items and self._frames_since_full >= self.full_frame_interval:
+            crop = None
+
+        if crop is None:
+            self._frames_since_full = 0
+            self.full_frame_runs += 1
+            image = rgb_frame
+        else:
+            self._frames_since_full += 1
+            self.roi_runs += 1
+            x0, y0, x1, y1 = crop
+            image = rgb_frame[y0:y1, x0:x1]
+
+        if self.inference_width and image.shape[1] > self.inference_width:
+            scale = self.inference_width / image.shape[1]
+            size = (self.inference_width, max(1, int(round(image.shape[0] * scale))))
+            image = cv2.resize(image, size, interpolation=cv2.INTER_LINEAR)
+        elif crop is not None:
+            image = np.ascontiguousarray(image)
+        return image, crop
+
+    def finish(self, landmark_lists, crop, frame_shape):
+        """Remapeia os landmarks (in-place) para o frame inteiro e atualiza o próximo recorte."""
+        frame_h, frame_w = frame_shape[:2]
+        if crop is not None and landmark_lists:
+            x0, y0, x1, y1 = crop
+            sx, sy = (x1 - x0) / frame_w, (y1 - y0) / frame_h
+            ox, oy = x0 / frame_w, y0 / frame_h
+            for landmark_list in landmark_lists:
+                for point in landmark_list.landmark:
+                    point.x = point.x * sx + ox
+                    point.y = point.y * sy + oy
+                    point.z = point.z * sx  # z usa a mesma escala de x no MediaPipe
+
+        if not self.roi:
+            return
+        if not landmark_lists:
+            self.crop = None  # rastreamento perdido: volta ao frame inteiro
+            return
+        self._missing_items = len(landmark_lists) < self.max_items
+        self._update_crop(landmark_lists, frame_w, frame_h)
+
+    def _update_crop(self, landmark_lists, frame_w, frame_h):
+        xs = [p.x for landmark_list in landmark_lists for p in landmark_list.landmark]
+        ys = [p.y for landmark_list in landmark_lists for p in landmark_list.landmark]
+        left, right = min(xs), max(xs)
+        top, bottom = min(ys), max(ys)
+
+        # Com histerese: o recorte só muda quando os pontos se aproximam da borda,
+        # para não mudar a cada frame o referencial do rastreamento interno do MediaPipe
+        if self.crop is not None:
+            x0, y0, x1, y1 = self.crop
+            edge_x, edge_y = 0.1 * (x1 - x0), 0.1 * (y1 - y0)
+            if (left * frame_w >= x0 + edge_x and right * frame_w <= x1 - edge_x and
+                    top * frame_h >= y0 + edge_y and bottom * frame_h <= y1 - edge_y):
+                return
+
+        width = max(right - left, self.min_size)
+        height = max(bottom - top, self.min_size)
+        center_x, center_y = (left + right) / 2, (top + bottom) / 2
+        half_w = width * (0.5 + self.margin)
+        half_h = height * (0.5 + self.margin)
+        x0 = int(max(0.0, center_x - half_w) * frame_w)
+        x1 = int(min(1.0, center_x + half_w) * frame_w)
+        y0 = int(max(0.0, center_y - half_h) * frame_h)
+        y1 = int(min(1.0, center_y + half_h) * frame_h)
+        if x1 - x0 < 2 or y1 - y0 < 2 or (x1 - x0 >= frame_w and y1 - y0 >= frame_h):
+            self.crop = None
+        else:
+            self.crop = (x0, y0, x1, y1)
+
+def inference_region_from_env(max_items):
+    """
+    Região de inferência configurada por variáveis de ambiente (None = desligado):
+      VISION_GAMES_INFERENCE_WIDTH=320   largura máxima da imagem enviada ao modelo
+      VISION_GAMES_INFERENCE_ROI=1       recorta em volta das últimas detecções
+    """
+    width = os.environ.get("VISION_GAMES_INFERENCE_WIDTH")
+    roi = os.environ.get("VISION_GAMES_INFERENCE_ROI") == "1"
+    if not width and not roi:
+        return None
+    return InferenceRegion(inference_width=int(width) if width else None, roi=roi, max_items=max_items)
@@ -0,0 +1,206 @@
+import math
+import os
+import threading
+
+import numpy as np
+
+from landmarks import (LandmarkResults, NUM_FACE_LANDMARKS, NUM_HAND_LANDMARKS,
+                       array_to_landmark_lists, landmarks_to_array)
+
+class ConstantVelocityPredictor:
+    """
+    Prevê os landmarks entre duas inferências assumindo velocidade constante,
+    para todos os pontos (detecções, pontos, 3) de uma vez.
+
+    O estado (pontos, velocidade, horário) é trocado inteiro a cada update, então
+    a thread de captura pode atualizar enquanto a thread da interface chama predict().
+    """
+
+    def __init__(self, smoothing=0.5, max_horizon=0.15, max_jump=0.25):
+        self.smoothing = smoothing      # peso da velocidade nova na média móvel
+        self.max_horizon = max_horizon  # segundos máximos de extrapolação
+        self.max_jump = max_jump        # deslocamento (normalizado) tratado como troca de detecção
+        self._state = None
+
+    def reset(self):
+        self._state = None
+
+    def _jumped(self, points, previous):
+        # Detecções que "pularam" (MediaPipe trocou a ordem ou perdeu/achou alguém) recomeçam paradas
+        return np.abs(points - previous).max(axis=(1, 2)) > self.max_jump
+
+    def update(self, points, timestamp):
+        state = self._state
+        if state is None or state[0].shape != points.shape:
+            self._state = (points, np.zeros_like(points), timestamp)
+            return
+        previous, velocity, previous_time = state
+        dt = max(timestamp - previous_time, 1e-6)
+        new_velocity = (points - previous) / dt
+        velocity = self.smoothing * new_velocity + (1.0 - self.smoothing) * velocity
+        velocity[self._jumped(points, previous)] = 0.0
+        self._state = (points, velocity, timestamp)
+
+    def predict(self, timestamp):
+        """Landmarks previstos para `timestamp` (None antes da primeira observação)."""
+        state = self._state
+        if state is None:
+            return None
+        points, velocity, observed_at = state
+        horizon = min(max(timestamp - observed_at, 0.0), self.max_horizon)
+        return points + velocity * horizon
+
+def _smoothing_factor(cutoff, dt):
+    tau = 1.0 / (2.0 * math.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+class OneEuroPredictor(ConstantVelocityPredictor):
+    """
+    Filtro One Euro (Casiez et al.) vetorizado: suaviza o tremor quando a mão/rosto
+    está parado e acompanha rápido quando se move. A derivada filtrada é usada
+    para extrapolar até o horário pedido em predict().
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=30.0, d_cutoff=3.0, max_horizon=0.15, max_jump=0.25):
+        super().__init__(max_horizon=max_horizon, max_jump=max_jump)
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+
+    def update(self, points, timestamp):
+        state = self._state
+        if state is None or state[0].shape != points.shape:
+            self._state = (points, np.zeros_like(points), timestamp)
+            return
+        filtered, derivative, previous_time = state
+        dt = max(timestamp - previous_time, 1e-6)
+
+        alpha_d = _smoothing_factor(self.d_cutoff, dt)
+        derivative = alpha_d * (points - filtered) / dt + (1.0 - alpha_d) * derivative
+        cutoff = self.min_cutoff + self.beta * np.abs(derivative)
+        alpha = 1.0 / (1.0 + 1.0 / (2.0 * np.pi * cutoff * dt))
+        new_filtered = (alpha * points + (1.0 - alpha) * filtered).astype(np.float32)
+
+        jumped = self._jumped(points, filtered)
+        new_filtered[jumped] = points[jumped]
+        derivative[jumped] = 0.0
+        self._state = (new_filtered, derivative.astype(np.float32), timestamp)
+
+PREDICTORS = {
+    "velocity": ConstantVelocityPredictor,
+    "one_euro": OneEuroPredictor,
+}
+
+class InferenceSchedule:
+    """
+    Decide em quais frames o modelo roda.
+
+    - `every_n`: roda em 1 de cada N frames capturados.
+    - `budget`: fração (0..1) do tempo que a inferência pode ocupar; com o tempo
+      médio medido de cada inferência, espera o suficiente antes da próxima
+      (numa máquina mais lenta a taxa de inferência cai sozinha).
+    """
+
+    def __init__(self, every_n=None, budget=None):
+        self.every_n = every_n
+        self.budget = budget
+        self._frame = 0
+        self._next_allowed = 0.0
+        self.average_duration = None
+
+    def should_infer(self, now):
+        self._frame += 1
+        if self.every_n and (self._frame - 1) % self.every_n:
+            return False
+        if self.budget and now < self._next_allowed:
+            return False
+        return True
+
+    def record(self, started, duration):
+        if self.average_duration is None:
+            self.average_duration = duration
+        else:
+            self.average_duration = 0.8 * self.average_duration + 0.2 * duration
+        if self.budget:
+            self._next_allowed = started + self.average_duration / self.budget
+
+class FrameSkipper:
+    """
+    Liga o InferenceSchedule ao preditor para uma câmera: nos frames sem inferência
+    (e, com thread, a cada leitura do jogo) entrega landmarks previstos no mesmo
+    formato dos resultados do MediaPipe.
+
+    observe()/skip() rodam na thread de captura e predict() na do jogo: um lock
+    mantém pontos previstos e lateralidade da mesma inferência. Em stats(),
+    `predicted` conta só os frames capturados sem inferência (skip()), não as
+    leituras do jogo.
+    """
+
+    def __init__(self, kind, every_n=None, budget=None, predictor=None):
+        if kind == "hand":
+            self.attribute, self.num_landmarks = "multi_hand_landmarks", NUM_HAND_LANDMARKS
+        else:
+            self.attribute, self.num_landmarks = "multi_face_landmarks", NUM_FACE_LANDMARKS
+        self.schedule = InferenceSchedule(every_n=every_n, budget=budget)
+        self.predictor = predictor or OneEuroPredictor()
+        self._handedness = None
+        self._lock = threading.Lock()
+        self.inferred = 0
+        self.predicted = 0
+
+    def should_infer(self, now):
+        return self.schedule.should_infer(now)
+
+    def observe(self, results, timestamp, duration):
+        """Alimenta o preditor com o resultado de uma inferência real."""
+        self.inferred += 1
+        self.schedule.record(timestamp, duration)
+        landmark_lists = getattr(results, self.attribute, None)
+        points = landmarks_to_array(landmark_lists, self.num_landmarks) if landmark_lists else None
+        with self._lock:
+            if points is None:
+                # Ninguém na câmera: nada para prever até a próxima detecção
+                self.predictor.reset()
+                self._handedness = None
+                return
+            self._handedness = getattr(results, "multi_handedness", None)
+            self.predictor.update(points, timestamp)
+
+    def skip(self, timestamp):
+        """Frame capturado sem inferência: conta em `predicted` e devolve a previsão."""
+        self.predicted += 1
+        return self.predict(timestamp)
+
+    def predict(self, timestamp):
+        """LandmarkResults previstos para `timestamp` (listas vazias viram None, como no MediaPipe)."""
+        with self._lock:
+            points = self.predictor.predict(timestamp)
+            handedness = self._handedness
+        landmark_lists = array_to_landmark_lists(points) if points is not None else None
+        if self.attribute == "multi_hand_landmarks":
+            return LandmarkResults(multi_hand_landmarks=landmark_lists,
+                                   multi_handedness=handedness if landmark_lists else None)
+        return LandmarkResults(multi_face_landmarks=landmark_lists)
+
+    def stats(self):
+        average = self.schedule.average_duration
+        return {
+            "inferred": self.inferred,
+            "predicted": self.predicted,
+            "inference_ms": average * 1000.0 if average is not None else None,
+        }
+
+def frame_skipper_from_env(kind):
+    """
+    Pulo de frames configurado por variáveis de ambiente (None = inferência em todo frame):
+      VISION_GAMES_INFERENCE_EVERY=3       roda o modelo em 1 de cada 3 frames
+      VISION_GAMES_INFERENCE_BUDGET=0.4    ou: inferência ocupa no máximo 40% do tempo
+      VISION_GAMES_PREDICTOR=one_euro      preditor dos frames pulados (one_euro ou velocity)
+    """
+    every_n = os.environ.get("VISION_GAMES_INFERENCE_EVERY")
+    budget = os.environ.get("VISION_GAMES_INFERENCE_BUDGET")
+    if not every_n and not budget:
+        return None
+    predictor = PREDICTORS[os.environ.get("VISION_GAMES_PREDICTOR", "one_euro")]()
+    return FrameSkipper(kind, every_n=int(every_n) if every_n else None,
+                        budget=float(budget) if budget else None, predictor=predictor)
@@ -0,0 +1,60 @@
+import threading
+
+import numpy as np
+
+from landmarks import NUM_HAND_LANDMARKS
+
+class LandmarkHistory:
+    """
+    Buffer circular com os landmarks dos últimos frames e o horário
+    (time.monotonic()) de captura de cada um.
+
+    A thread de captura chama push() a cada frame; a interface pede uma janela
+    de tempo com window() sem precisar capturar/inferir de novo. Tudo fica em
+    arrays pré-alocados, então push() não aloca memória.
+    """
+
+    def __init__(self, capacity=90, max_items=2, num_landmarks=NUM_HAND_LANDMARKS):
+        self.capacity = capacity
+        self.max_items = max_items
+        self._lock = threading.Lock()
+        self._timestamps = np.zeros(capacity, dtype=np.float64)
+        self._counts = np.zeros(capacity, dtype=np.int32)
+        self._points = np.zeros((capacity, max_items, num_landmarks, 3), dtype=np.float32)
+        self._handedness = np.full((capacity, max_items), -1, dtype=np.int8)
+        self._next = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def push(self, timestamp, points, handedness=None):
+        count = min(len(points), self.max_items)
+        with self._lock:
+            i = self._next
+            self._timestamps[i] = timestamp
+            self._counts[i] = count
+            self._points[i, :count] = points[:count]
+            self._points[i, count:] = 0.0
+            self._handedness[i] = -1
+            if handedness is not None:
+                self._handedness[i, :count] = handedness[:count]
+            self._next = (i + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def window(self, start, end):
+        """
+        Cópia dos frames capturados entre `start` e `end` (inclusive), do mais
+        antigo para o mais novo: (horários, nº de detecções, pontos, lateralidade).
+        """
+        with self._lock:
+            # Ordem cronológica: do slot mais antigo até o último escrito
+            order = (np.arange(self._size) + self._next - self._size) % self.capacity
+            timestamps = self._timestamps[order]
+            keep = order[(timestamps >= start) & (timestamps <= end)]
+            return (self._timestamps[keep], self._counts[keep],
+                    self._points[keep], self._handedness[keep])
+
+    def latest_timestamp(self):
+        with self._lock:
+            return self._timestamps[(self._next - 1) % self.capacity] if self._size else None
@@ -0,0 +1,139 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+from landmarks import NUM_FACE_LANDMARKS, NUM_HAND_LANDMARKS, landmarks_to_array
+
+# Cores/espessuras dos DrawingSpec usados antes com o mp_drawing
+HAND_CONNECTION_STYLE = ((224, 224, 224), 2)
+HAND_POINT_STYLE = ((0, 0, 255), 2, 2)  # (cor, raio, espessura)
+POINT_BORDER_COLOR = (224, 224, 224)
+FACE_TESSELATION_STYLE = ((220, 220, 220), 1)
+FACE_CONTOUR_STYLE = ((255, 255, 255), 1)
+FACE_IRIS_STYLE = ((255, 255, 255), 1)
+
+LEVELS_OF_DETAIL = ("full", "contours", "none")
+
+class LandmarkOverlay:
+    """
+    Desenha conexões de landmarks sobre o frame sem passar ponto a ponto pelo Python.
+
+    Os índices de cada conjunto de conexões viram um array (m, 2) uma única vez;
+    a cada frame os landmarks de todas as detecções são convertidos para pixels
+    numa operação NumPy e cada camada é desenhada com um só cv2.polylines.
+    Como o mp_drawing, conexões com alguma ponta fora da imagem são ignoradas.
+
+    `levels` diz quais camadas cada nível de detalhe desenha; os pontos
+    (`point_style`) só aparecem no nível "full".
+    """
+
+    def __init__(self, layers, levels, num_landmarks, point_style=None, lod="full"):
+        self.layers = {
+            name: (np.array(sorted(connections), dtype=np.intp).reshape(-1, 2), color, thickness)
+            for name, (connections, color, thickness) in layers.items()
+        }
+        self.levels = levels
+        self.num_landmarks = num_landmarks
+        self.point_style = point_style
+        self.set_lod(lod)
+
+        self.frames = 0
+        self.segments = 0
+        self.total_ms = 0.0
+        self.last_ms = 0.0
+        self.max_ms = 0.0
+
+    def set_lod(self, lod):
+        if lod not in self.levels:
+            raise ValueError(f"Nível de detalhe desconhecido: {lod}")
+        self.lod = lod
+
+    def draw(self, image, landmarks):
+        """
+        Desenha sobre `image` (in-place). `landmarks` pode ser a lista de
+        NormalizedLandmarkList do MediaPipe ou um array (detecções, pontos, 3).
+        """
+        if self.lod == "none" or landmarks is None or len(landmarks) == 0:
+            return
+        started = time.perf_counter()
+
+        if not isinstance(landmarks, np.ndarray):
+            landmarks = landmarks_to_array(landmarks, self.num_landmarks)
+        height, width = image.shape[:2]
+        xy = landmarks[..., :2]
+        # Mesma conversão do mp_drawing: floor(coordenada * tamanho), limitado à borda
+        visible = ((xy >= 0.0) & (xy <= 1.0)).all(axis=-1)
+        pixels = np.floor(xy * (width, height)).astype(np.int32)
+        np.minimum(pixels, (width - 1, height - 1), out=pixels)
+
+        drawn = 0
+        for name in self.levels[self.lod]:
+            edges, color, thickness = self.layers[name]
+            segments = pixels[:, edges]                              # (detecções, m, 2, 2)
+            keep = visible[:, edges[:, 0]] & visible[:, edges[:, 1]]
+            segments = segments[keep]
+            if len(segments):
+                cv2.polylines(image, segments, False, color, thickness)
+                drawn += len(segments)
+
+        if self.lod == "full" and self.point_style is not None:
+            color, radius, thickness = self.point_style
+            border = max(radius + 1, int(radius * 1.2))
+            for x, y in pixels[visible].tolist():
+                cv2.circle(image, (x, y), border, POINT_BORDER_COLOR, thickness)
+                cv2.circle(image, (x, y), radius, color, thickness)
+
+        elapsed = (time.perf_counter() - started) * 1000.0
+        self.frames += 1
+        self.segments += drawn
+        self.total_ms += elapsed
+        self.last_ms = elapsed
+        self.max_ms = max(self.max_ms, elapsed)
+
+    def stats(self):
+        """Custo do desenho: média/último/pior tempo em ms e segmentos por frame."""
+        frames = max(self.frames, 1)
+        return {
+            "lod": self.lod,
+            "frames": self.frames,
+            "mean_ms": self.total_ms / frames,
+            "last_ms": self.last_ms,
+            "max_ms": self.max_ms,
+            "segments_per_frame": self.segments / frames,
+        }
+
+def _lod_from_env(lod):
+    return lod or os.environ.get("VISION_GAMES_OVERLAY", "full")
+
+def hand_overlay(lod=None):
+    """Mãos: conexões + pontos (full), só conexões (contours) ou nada (none)."""
+    import mediapipe as mp  # só as tabelas de conexões; o import é adiado como nas câmeras
+    connections = mp.solutions.hands.HAND_CONNECTIONS
+    return LandmarkOverlay(
+        layers={"connections": (connections, *HAND_CONNECTION_STYLE)},
+        levels={"full": ["connections"], "contours": ["connections"], "none": []},
+        num_landmarks=NUM_HAND_LANDMARKS,
+        point_style=HAND_POINT_STYLE,
+        lod=_lod_from_env(lod),
+    )
+
+def face_mesh_overlay(lod=None, irises=True):
+    """
+    Rosto: malha + contornos + íris (full), contornos + íris (contours) ou nada (none).
+    Sem `irises` (FaceMesh sem refine_landmarks), a camada das íris fica de fora.
+    """
+    import mediapipe as mp
+    face_mesh = mp.solutions.face_mesh
+    iris_layer = ["irises"] if irises else []
+    return LandmarkOverlay(
+        layers={
+            "tesselation": (face_mesh.FACEMESH_TESSELATION, *FACE_TESSELATION_STYLE),
+            "contours": (face_mesh.FACEMESH_CONTOURS, *FACE_CONTOUR_STYLE),
+            "irises": (face_mesh.FACEMESH_IRISES, *FACE_IRIS_STYLE),
+        },
+        levels={"full": ["tesselation", "contours"] + iris_layer, "contours": ["contours"] + iris_layer, "none": []},
+        num_landmarks=NUM_FACE_LANDMARKS,
+        lod=_lod_from_env(lod),
+    )
@@ -0,0 +1,88 @@
+import numpy as np
+
+# Quantidade de pontos por detecção em cada modelo
+NUM_HAND_LANDMARKS = 21
+NUM_FACE_LANDMARKS = 478  # FaceMesh com refine_landmarks=True (468 sem as íris)
+MAX_FACES = 6  # rostos por frame no FaceMesh (jogadores da Esquiva Facial, ver face_tracker.py)
+HANDEDNESS_LABELS = ("Left", "Right")  # índices usados nos arrays de lateralidade (-1 = desconhecida)
+
+class LandmarkResults:
+    """
+    Substituto leve para o objeto de resultados do MediaPipe, usado quando os
+    landmarks não vêm direto de `process()` (outro processo, gravação, etc.).
+    Expõe os mesmos atributos que o código dos jogos lê.
+    """
+
+    def __init__(self, multi_hand_landmarks=None, multi_handedness=None, multi_face_landmarks=None):
+        self.multi_hand_landmarks = multi_hand_landmarks
+        self.multi_handedness = multi_handedness
+        self.multi_face_landmarks = multi_face_landmarks
+
+# Um NormalizedLandmark serializado com x, y e z tem sempre 17 bytes:
+# tag/tamanho do item repetido + (tag, float32) para cada coordenada
+_LANDMARK_RECORD = np.dtype([
+    ("item_tag", "u1"), ("item_size", "u1"),
+    ("x_tag", "u1"), ("x", "<f4"), ("y_tag", "u1"), ("y", "<f4"), ("z_tag", "u1"), ("z", "<f4"),
+])
+
+def _parse_records(landmark_list):
+    """Lê x, y, z direto dos bytes serializados (None se a lista tiver outros campos, ex. visibility)."""
+    data = landmark_list.SerializeToString()
+    if len(data) != len(landmark_list.landmark) * _LANDMARK_RECORD.itemsize:
+        return None
+    records = np.frombuffer(data, dtype=_LANDMARK_RECORD)
+    layout_ok = ((records["item_tag"] == 0x0A) & (records["item_size"] == _LANDMARK_RECORD.itemsize - 2) &
+                 (records["x_tag"] == 0x0D) & (records["y_tag"] == 0x15) & (records["z_tag"] == 0x1D))
+    return records if layout_ok.all() else None
+
+def landmarks_to_array(landmark_lists, num_landmarks):
+    """Converte uma lista de NormalizedLandmarkList em um array (detecções, pontos, 3) float32."""
+    array = np.zeros((len(landmark_lists), num_landmarks, 3), dtype=np.float32)
+    for i, landmark_list in enumerate(landmark_lists):
+        records = _parse_records(landmark_list)
+        if records is not None:
+            records = records[:num_landmarks]
+            count = len(records)
+            array[i, :count, 0], array[i, :count, 1], array[i, :count, 2] = records["x"], records["y"], records["z"]
+            continue
+        points = [(p.x, p.y, p.z) for p in landmark_list.landmark[:num_landmarks]]
+        array[i, :len(points)] = points
+    return array
+
+def handedness_to_array(multi_handedness, count):
+    """Lateralidade de cada mão como int8: índice em HANDEDNESS_LABELS ou -1."""
+    handedness = np.full(count, -1, dtype=np.int8)
+    for i, classification_list in enumerate((multi_handedness or [])[:count]):
+        if classification_list.classification:
+            handedness[i] = HANDEDNESS_LABELS.index(classification_list.classification[0].label)
+    return handedness
+
+def hand_arrays(results):
+    """
+    Resultados de mãos como arrays: pontos (mãos, 21, 3) float32 e lateralidade
+    (mãos,) int8. Sem mãos, os dois arrays vêm vazios.
+    """
+    hands = (results.multi_hand_landmarks if results is not None else None) or []
+    points = landmarks_to_array(hands, NUM_HAND_LANDMARKS)
+    return points, handedness_to_array(results.multi_handedness if hands else None, len(hands))
+
+def array_to_landmark_lists(array):
+    """
+    Operação inversa: cria um NormalizedLandmarkList por detecção, aceito pelo mp_drawing.
+    Monta os bytes serializados com NumPy e faz um único ParseFromString por
+    detecção, bem mais rápido que adicionar os 478 pontos do rosto um a um.
+    """
+    # Import local: carregar os protos importa o pacote mediapipe inteiro (~1 s)
+    from mediapipe.framework.formats.landmark_pb2 import NormalizedLandmarkList
+
+    records = np.empty(array.shape[:2], dtype=_LANDMARK_RECORD)
+    records["item_tag"], records["item_size"] = 0x0A, _LANDMARK_RECORD.itemsize - 2
+    records["x_tag"], records["y_tag"], records["z_tag"] = 0x0D, 0x15, 0x1D
+    records["x"], records["y"], records["z"] = array[..., 0], array[..., 1], array[..., 2]
+
+    landmark_lists = []
+    for row in records:
+        landmark_list = NormalizedLandmarkList()
+        landmark_list.ParseFromString(row.tobytes())
+        landmark_lists.append(landmark_list)
+    return landmark_lists
@@ -0,0 +1,227 @@
+"""
+Launcher único para o estande: os três jogos como telas de uma só janela.
+
+A webcam abre uma vez (SharedSource) e os modelos do MediaPipe ficam num
+ModelPool: trocar de jogo só para o jogo atual, devolve o Hands/FaceMesh ao
+pool e monta o próximo jogo com a mesma fonte e um modelo já aquecido. O pool
+guarda um modelo por perfil de inferência (inference_profiles.py): Fruit Ninja
+e Pedra-Papel-Tesoura só dividem o Hands se usarem o mesmo perfil.
+
+Cada troca é medida (desmontar o jogo anterior, montar as telas do novo,
+câmera pronta, primeira inferência) e impressa numa linha JSON.
+
+Uso: python launcher.py [--source ...] [--headless [--duration s]]
+Com --headless, passa por todos os jogos duas vezes (a segunda com tudo
+quente), ficando --duration segundos em cada, e imprime o resumo das trocas.
+"""
+import importlib
+import json
+import statistics
+import sys
+import time
+
+from PySide6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QStackedWidget
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QFont, QKeySequence, QShortcut
+
+from frame_sources import SharedSource, parse_source_args
+from model_pool import ModelPool
+from inference_profiles import profile_for
+from leaderboard import shared_leaderboard
+
+# Jogos disponíveis: módulo (importado só na primeira vez que o jogo abre),
+# como criar a janela do jogo e onde fica o CameraLoader dela. O modelo é o do
+# perfil do jogo (profile_for)
+GAMES = {
+    "ninja": {
+        "title": "Fruit Ninja", "module": "ninja_game",
+        "create": lambda module, camera_kwargs: module.MainWindow(camera_kwargs),
+        "loader": lambda window: window.game_widget.camera_loader,
+    },
+    "face": {
+        "title": "Esquiva Facial", "module": "face_game",
+        "create": lambda module, camera_kwargs: module.MainWindow(camera_kwargs),
+        "loader": lambda window: window.game_widget.camera_loader,
+    },
+    "rps": {
+        "title": "Pedra, Papel & Tesoura", "module": "rps_game",
+        "create": lambda module, camera_kwargs: module.RPSGame(camera_kwargs),
+        "loader": lambda window: window.camera_loader,
+    },
+}
+
+class Launcher(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.setWindowTitle("Vision Games")
+        self.setGeometry(100, 100, 1000, 750)
+
+        self.colors = {
+            "bg_dark": "#F0F4F7",
+            "bg_medium": "#CAD3DB",
+            "primary": "#A5C4D4",
+            "accent_green": "#8EB897",
+            "text_dark": "#333C4A",
+        }
+        self.setStyleSheet(f"background-color: {self.colors['bg_dark']}; color: {self.colors['text_dark']};")
+
+        # Uma fonte e um pool para todos os jogos; nada abre antes do primeiro jogo
+        self.source = SharedSource()
+        self.model_pool = ModelPool()
+        self.leaderboard = shared_leaderboard()
+
+        self.current_key = None
+        self.current_game = None
+        self.switches = []  # uma medição por troca de jogo
+        self._pending_switch = None
+
+        self.stack = QStackedWidget()
+        self.menu_screen = self._create_menu_screen()
+        self.stack.addWidget(self.menu_screen)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(0)
+        layout.addWidget(self._create_top_bar())
+        layout.addWidget(self.stack, stretch=1)
+
+        # Ctrl+0: menu; Ctrl+1..3: jogos (F3/F4 continuam com o profiler)
+        QShortcut(QKeySequence("Ctrl+0"), self, activated=self.show_menu)
+        for i, key in enumerate(GAMES, start=1):
+            QShortcut(QKeySequence(f"Ctrl+{i}"), self, activated=lambda key=key: self.switch_to(key))
+
+    def _create_top_bar(self):
+        bar = QWidget()
+        bar.setStyleSheet(f"background-color: {self.colors['bg_medium']};")
+        layout = QHBoxLayout(bar)
+        layout.setContentsMargins(10, 5, 10, 5)
+        menu_btn = QPushButton("☰ Menu")
+        menu_btn.clicked.connect(self.show_menu)
+        layout.addWidget(menu_btn)
+        for key, spec in GAMES.items():
+            btn = QPushButton(spec["title"])
+            btn.clicked.connect(lambda _checked=False, key=key: self.switch_to(key))
+            layout.addWidget(btn)
+        layout.addStretch()
+        self.switch_label = QLabel("")
+        layout.addWidget(self.switch_label)
+        return bar
+
+    def _create_menu_screen(self):
+        widget = QWidget()
+        layout = QVBoxLayout(widget, alignment=Qt.AlignCenter, spacing=25)
+        title = QLabel("Vision Games", alignment=Qt.AlignCenter)
+        title.setFont(QFont("Arial", 50, QFont.Bold))
+        layout.addWidget(title)
+        for key, spec in GAMES.items():
+            btn = QPushButton(f"▶ {spec['title']}")
+            btn.setFixedSize(400, 70)
+            btn.setFont(QFont("Arial", 20))
+            btn.setStyleSheet(f"background-color: {self.colors['accent_green']}; border-radius: 15px;")
+            btn.clicked.connect(lambda _checked=False, key=key: self.switch_to(key))
+            layout.addWidget(btn, alignment=Qt.AlignCenter)
+        return widget
+
+    def _close_current(self):
+        """Para o jogo atual: a câmera devolve o modelo ao pool e a fonte continua aberta."""
+        if self.current_game is None:
+            return
+        self.current_game.shutdown()
+        self.stack.removeWidget(self.current_game)
+        self.current_game.deleteLater()
+        self.current_game = None
+        self.current_key = None
+
+    def show_menu(self):
+        self._close_current()
+        self.stack.setCurrentWidget(self.menu_screen)
+        self.setWindowTitle("Vision Games")
+
+    def switch_to(self, key):
+        if key == self.current_key:
+            return
+        spec = GAMES[key]
+        started = time.monotonic()
+        record = {"game": key, "previous": self.current_key}
+        self._close_current()
+        record["teardown_ms"] = _ms(started)
+
+        created_before = self.model_pool.created(profile_for(key))
+        window = spec["create"](importlib.import_module(spec["module"]),
+                                {"source": self.source, "model_pool": self.model_pool})
+        self.stack.addWidget(window)
+        self.stack.setCurrentWidget(window)
+        self.setWindowTitle(f"Vision Games - {window.windowTitle()}")
+        record["build_ms"] = _ms(started)
+
+        self.current_key, self.current_game = key, window
+        loader = spec["loader"](window)
+        self._pending_switch = (window, loader, record, started, created_before)
+        loader.ready.connect(self._on_switch_camera_ready)
+        loader.first_inference.connect(self._on_switch_first_inference)
+
+    def _on_switch_camera_ready(self, _camera):
+        window, loader, record, started, _created = self._pending_switch
+        self.switch_label.setText(f"{GAMES[record['game']]['title']}: câmera em "
+                                  f"{(loader.timings['camera_ready'] - started) * 1000:.0f} ms")
+
+    def _on_switch_first_inference(self):
+        if self._pending_switch is None or self._pending_switch[0] is not self.current_game:
+            return  # o jogo já foi trocado antes da primeira inferência
+        window, loader, record, started, created_before = self._pending_switch
+        self._pending_switch = None
+        spec = GAMES[record["game"]]
+        record["camera_ready_ms"] = round((loader.timings["camera_ready"] - started) * 1000.0, 1)
+        record["first_inference_ms"] = round((loader.timings["first_inference"] - started) * 1000.0, 1)
+        record["model"] = "novo" if self.model_pool.created(profile_for(record["game"])) > created_before else "do pool"
+        self.switches.append(record)
+        self.switch_label.setText(f"{spec['title']}: 1ª inferência em {record['first_inference_ms']:.0f} ms "
+                                  f"(modelo {record['model']})")
+        print("Troca de jogo: " + json.dumps(record), flush=True)
+
+    def switch_report(self):
+        """Latência até a primeira inferência: trocas com modelo novo x com modelo do pool."""
+        report = {}
+        for model in ("novo", "do pool"):
+            values = [s["first_inference_ms"] for s in self.switches if s["model"] == model]
+            if values:
+                report[model] = {"switches": len(values), "mean_ms": round(statistics.fmean(values), 1),
+                                 "max_ms": max(values)}
+        report["pool"] = self.model_pool.stats()
+        return report
+
+    def closeEvent(self, event):
+        self._close_current()
+        self.model_pool.close()
+        self.source.close()
+        self.leaderboard.close()
+        event.accept()
+
+def _ms(since):
+    return round((time.monotonic() - since) * 1000.0, 1)
+
+def run_switch_cycle(app, launcher, dwell, rounds=2):
+    """Headless: abre cada jogo `rounds` vezes, `dwell` segundos em cada, e imprime o resumo das trocas."""
+    order = list(GAMES) * rounds
+
+    def next_game():
+        if not order:
+            print("Trocas (headless): " + json.dumps(launcher.switch_report()), flush=True)
+            launcher.close()
+            app.quit()
+            return
+        launcher.switch_to(order.pop(0))
+        GAMES[launcher.current_key]["loader"](launcher.current_game).first_inference.connect(
+            lambda: QTimer.singleShot(int(dwell * 1000), next_game))
+
+    QTimer.singleShot(0, next_game)
+    return app.exec()
+
+if __name__ == "__main__":
+    options, qt_argv = parse_source_args(sys.argv)
+    app = QApplication(qt_argv)
+    launcher = Launcher()
+    launcher.show()
+    if options.headless:
+        sys.exit(run_switch_cycle(app, launcher, options.duration))
+    sys.exit(app.exec())
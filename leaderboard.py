@@ -0,0 +1,194 @@
+"""
+Placar local em SQLite (modo WAL) compartilhado por todos os jogos.
+
+Cada partida vira uma linha em `sessions` (jogo, início, duração, nº de
+jogadores) e uma linha por jogador em `scores`. As gravações vão para uma fila
+e uma thread própria as grava em lotes, numa transação só, então o fim de jogo
+nunca espera o disco. As leituras (top-N, recorde pessoal) usam índices e uma
+conexão separada; com WAL elas não bloqueiam nem são bloqueadas pelo escritor.
+
+Na primeira abertura, os recordes antigos de highscore.txt / highscore_face.txt
+são importados como sessões do jogador LEGACY_PLAYER.
+"""
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_PATH = "leaderboard.db"
+LEGACY_FILES = {"ninja": "highscore.txt", "face": "highscore_face.txt"}
+LEGACY_PLAYER = "legado"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id         INTEGER PRIMARY KEY,
+    game       TEXT NOT NULL,
+    started_at REAL NOT NULL,      -- horário Unix do início
+    duration   REAL,               -- segundos (NULL = desconhecida)
+    players    INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS scores (
+    session_id INTEGER NOT NULL REFERENCES sessions(id),
+    game       TEXT NOT NULL,      -- repetido de sessions para os índices abaixo
+    player     TEXT NOT NULL,
+    score      INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS scores_top ON scores (game, score DESC);
+CREATE INDEX IF NOT EXISTS scores_player_best ON scores (game, player, score DESC);
+CREATE INDEX IF NOT EXISTS sessions_game_time ON sessions (game, started_at);
+"""
+
+_STOP = object()
+
+def _connect(path):
+    connection = sqlite3.connect(path, timeout=5.0)
+    connection.execute("PRAGMA journal_mode=WAL")
+    # Em WAL, synchronous=NORMAL só arrisca a última transação numa queda de energia
+    connection.execute("PRAGMA synchronous=NORMAL")
+    return connection
+
+class Leaderboard:
+    """
+    Placar de todos os jogos. record_session() só enfileira; a thread escritora
+    junta o que chegar em até `linger` segundos (no máximo `batch_size` partidas)
+    e grava tudo numa transação.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, batch_size=256, linger=0.05):
+        self.path = path
+        self.batch_size = batch_size
+        self.linger = linger
+        self.sessions_written = 0
+        self.batches_written = 0
+        self.error = None
+
+        self._reader = _connect(path)
+        self._reader.executescript(_SCHEMA)
+        self._migrate_legacy_files()
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="placar", daemon=True)
+        self._writer.start()
+        self._closed = False
+
+    def _migrate_legacy_files(self):
+        if self._reader.execute("SELECT 1 FROM meta WHERE key = 'legacy_migrated'").fetchone():
+            return
+        with self._reader:
+            for game, filename in LEGACY_FILES.items():
+                try:
+                    with open(filename) as f:
+                        score = int(f.read())
+                    played_at = os.path.getmtime(filename)
+                except (FileNotFoundError, ValueError):
+                    continue
+                if score > 0:
+                    self._insert_session(self._reader, (game, played_at, None, 1, [(LEGACY_PLAYER, score)]))
+            self._reader.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('legacy_migrated', ?)",
+                                 (time.strftime("%Y-%m-%d %H:%M:%S"),))
+
+    @staticmethod
+    def _insert_session(connection, session):
+        game, started_at, duration, players, scores = session
+        cursor = connection.execute(
+            "INSERT INTO sessions (game, started_at, duration, players) VALUES (?, ?, ?, ?)",
+            (game, started_at, duration, players))
+        connection.executemany(
+            "INSERT INTO scores (session_id, game, player, score) VALUES (?, ?, ?, ?)",
+            [(cursor.lastrowid, game, player, int(score)) for player, score in scores])
+
+    def record_session(self, game, scores, duration=None, started_at=None):
+        """
+        Enfileira uma partida. `scores` é {jogador: pontos}; o nº de jogadores é
+        len(scores). Retorna na hora, sem tocar no disco.
+        """
+        if self._closed:
+            raise RuntimeError("Placar já foi fechado.")
+        if started_at is None:
+            started_at = time.time() - (duration or 0.0)
+        self._queue.put((game, started_at, duration, len(scores), list(scores.items())))
+
+    def _write_loop(self):
+        connection = _connect(self.path)
+        try:
+            while True:
+                item = self._queue.get()
+                batch = [item]
+                # Espera um pouco por mais partidas para gravar tudo de uma vez
+                deadline = time.monotonic() + self.linger
+                while item is not _STOP and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    batch.append(item)
+
+                sessions = [session for session in batch if session is not _STOP]
+                try:
+                    if sessions:
+                        with connection:
+                            for session in sessions:
+                                self._insert_session(connection, session)
+                        self.sessions_written += len(sessions)
+                        self.batches_written += 1
+                except sqlite3.Error as e:
+                    print(f"Erro ao gravar o placar: {e}")
+                    self.error = e
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+                if len(sessions) < len(batch):
+                    return
+        finally:
+            connection.close()
+
+    def flush(self):
+        """Espera a fila de gravação esvaziar."""
+        self._queue.join()
+
+    def top_scores(self, game, limit=10):
+        """Melhores pontuações do jogo: [(jogador, pontos, horário Unix da partida)]."""
+        return self._reader.execute(
+            "SELECT scores.player, scores.score, sessions.started_at FROM scores "
+            "JOIN sessions ON sessions.id = scores.session_id "
+            "WHERE scores.game = ? ORDER BY scores.score DESC LIMIT ?", (game, limit)).fetchall()
+
+    def best_score(self, game):
+        """Recorde do jogo (0 se ainda não houver partidas)."""
+        row = self._reader.execute(
+            "SELECT score FROM scores WHERE game = ? ORDER BY score DESC LIMIT 1", (game,)).fetchone()
+        return row[0] if row else 0
+
+    def personal_best(self, game, player):
+        row = self._reader.execute(
+            "SELECT score FROM scores WHERE game = ? AND player = ? ORDER BY score DESC LIMIT 1",
+            (game, player)).fetchone()
+        return row[0] if row else 0
+
+    def session_count(self, game=None):
+        if game is None:
+            return self._reader.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        return self._reader.execute("SELECT COUNT(*) FROM sessions WHERE game = ?", (game,)).fetchone()[0]
+
+    def close(self):
+        """Grava o que estiver na fila e fecha as conexões."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._writer.join()
+        self._reader.close()
+
+_shared = None
+
+def shared_leaderboard():
+    """Placar único do processo (caminho em VISION_GAMES_LEADERBOARD, padrão leaderboard.db)."""
+    global _shared
+    if _shared is None or _shared._closed:
+        _shared = Leaderboard(os.environ.get("VISION_GAMES_LEADERBOARD", DEFAULT_PATH))
+    return _shared
@@ -0,0 +1,77 @@
+"""
+Pool de modelos do MediaPipe (Hands, FaceMesh) para o launcher.
+
+Construir um modelo custa ~1 s na primeira vez (import + grafo + aquecimento) e
+algumas centenas de ms nas seguintes. Com o pool, cada perfil de inferência
+(inference_profiles.py) é criado só quando um jogo pede pela primeira vez; ao
+trocar de jogo, a câmera devolve o modelo em vez de fechá-lo, e o próximo jogo
+com o mesmo perfil o recebe já aquecido.
+"""
+import threading
+import time
+
+class ModelPool:
+    """
+    Guarda até `max_idle` modelos ociosos por perfil (pelo nome). acquire() entrega
+    um ocioso ou cria um novo com profile.create_model() (fora do lock, pode levar
+    ~1 s); release() devolve, e o que passar do limite é fechado. Seguro para chamar
+    das threads do CameraLoader.
+    """
+
+    def __init__(self, max_idle=1):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = {}
+        self._stats = {}
+        self._closed = False
+
+    def acquire(self, profile):
+        key = profile.name
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Pool de modelos já foi fechado.")
+            stats = self._stats.setdefault(key, {"created": 0, "reused": 0, "in_use": 0, "create_ms": None})
+            idle = self._idle.setdefault(key, [])
+            stats["in_use"] += 1
+            if idle:
+                stats["reused"] += 1
+                return idle.pop()
+        started = time.monotonic()
+        try:
+            model = profile.create_model()
+        except Exception:
+            with self._lock:
+                stats["in_use"] -= 1
+            raise
+        with self._lock:
+            stats["created"] += 1
+            stats["create_ms"] = round((time.monotonic() - started) * 1000.0, 1)
+        return model
+
+    def release(self, profile, model):
+        key = profile.name
+        with self._lock:
+            self._stats[key]["in_use"] -= 1
+            if not self._closed and len(self._idle[key]) < self.max_idle:
+                self._idle[key].append(model)
+                return
+        model.close()
+
+    def stats(self):
+        """Por nome de perfil: criados, reaproveitados, em uso, ociosos e tempo da última criação."""
+        with self._lock:
+            return {key: dict(stats, idle=len(self._idle[key])) for key, stats in self._stats.items()}
+
+    def created(self, profile):
+        with self._lock:
+            return self._stats.get(profile.name, {}).get("created", 0)
+
+    def close(self):
+        """Fecha os modelos ociosos; os que estiverem em uso fecham quando voltarem."""
+        with self._lock:
+            self._closed = True
+            idle = [model for models in self._idle.values() for model in models]
+            for models in self._idle.values():
+                models.clear()
+        for model in idle:
+            model.close()
@@ -1,14 +1,30 @@
 # ninja_game.py
 
 import sys
-import random
+import time
+import numpy as np
 from PySide6.QtWidgets import QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QStackedWidget
 from PySide6.QtCore import Qt, QTimer, QPoint, Signal
 from PySide6.QtGui import QPixmap, QPainter, QPen, QFont, QImage, QColor
 
 # Certifique-se de que os arquivos camera.py e game_objects.py estão na mesma pasta
 from camera import Camera
-from game_objects import FallingObject
+from game_objects import FallingObject, preload_sprites
+from entity_pool import EntityPool
+from spawn_scheduler import SpawnScheduler
+from fruit_physics import FruitStore
+from sprite_cache import get_sprite
+from session_recording import camera_from_env
+from game_loop import FixedStepLoop, SimulationTimer
+from frame_profiler import profiler
+from inference_roi import inference_region_from_env
+from landmark_filters import frame_skipper_from_env
+from frame_sources import parse_source_args
+from headless import run_headless
+from leaderboard import shared_leaderboard
+from inference_profiles import profile_for
+from camera_loader import CameraLoader, report_startup
+from inference_governor import InferenceGovernor, OFF, FULL
 
 # --- TELA 2: O JOGO EM SI ---
 class GameWidget(QWidget):
@@ -22,15 +38,39 @@ class GameWidget(QWidget):
         {'duration': 999, 'spawn_rate': 400, 'min_vy': -19, 'max_vy': -16, 'bomb_chance': 0.30}
     ]
 
-    def __init__(self, colors):
+    # Modo Frenesi: centenas de frutas ao mesmo tempo, simuladas em lote pelo FruitStore.
+    # Frutas perdidas não custam vidas; só uma bomba encerra antes do tempo.
+    FRENZY_STAGES = [
+        {'duration': 999, 'spawn_rate': 150, 'burst': 6, 'min_vy': -19, 'max_vy': -13, 'bomb_chance': 0.05}
+    ]
+    FRENZY_DURATION = 45 # segundos
+    OBJECT_SIZE = (80, 80)
+    POOL_RESERVE = 16 # frutas simultâneas na fase mais rápida, com folga
+
+    def __init__(self, colors, camera_kwargs=None):
         super().__init__()
         self.colors = colors
-        self.camera = Camera()
+        # Câmera + modelo abrem numa thread depois que a janela aparece (ver camera_loader.py).
+        # `camera_kwargs` vem do launcher (fonte e pool de modelos compartilhados)
+        self.camera = None
+        camera_kwargs = camera_kwargs or {}
+        # Modelo e limites de mãos do perfil do jogo (VISION_GAMES_PROFILE_NINJA; ver inference_profiles.py)
+        self.inference_profile = profile_for("ninja")
+        self.camera_loader = CameraLoader(lambda: camera_from_env("hand", lambda: Camera(
+            threaded=True, inference_region=inference_region_from_env(self.inference_profile.max_items),
+            frame_skip=frame_skipper_from_env("hand"), profile=self.inference_profile, **camera_kwargs)), self)
+        self.camera_loader.ready.connect(self._on_camera_ready)
+        QTimer.singleShot(0, self.camera_loader.start)
         self.camera_pixmap = QPixmap()
         
         self.game_objects = []
+        self.object_pool = EntityPool(FallingObject) # frutas/bombas reaproveitadas entre lançamentos
+        self.fruit_store = FruitStore()
+        self.frenzy = False
         self.trail_points_hand1 = []
         self.trail_points_hand2 = []
+        self.active_hands_cursors = []
+        self.camera_message = ""
         
         self.score = 0
         self.lives = 3
@@ -40,67 +80,126 @@ class GameWidget(QWidget):
 
         self.fruit_images = ["assets/ninja-game/apple.png", "assets/ninja-game/banana.png", "assets/ninja-game/uva.png", "assets/ninja-game/melancia.png"]
         self.bomb_image = "assets/ninja-game/bomb.png"
+        # RNG próprio dos lançamentos, tabela de sorteio das frutas e fins dos estágios (ver spawn_scheduler.py)
+        self.spawner = SpawnScheduler()
+        self.fruit_table = self.spawner.uniform_table(self.fruit_images)
+        self.stage_schedule = self.spawner.stages(self.DIFFICULTY_STAGES)
         
-        self.game_timer = QTimer(self)
-        self.game_timer.timeout.connect(self.update_game_state)
-        self.spawn_timer = QTimer(self)
-        self.spawn_timer.timeout.connect(self.spawn_object)
-        self.difficulty_timer = QTimer(self)
-        self.difficulty_timer.timeout.connect(self._update_difficulty)
-
-    def start_game(self):
+        # Entrada (câmera) uma vez por tick, física em passos fixos de 1/60 s, desenho interpolado
+        self.game_loop = FixedStepLoop(self, step=self._step_simulation, render=lambda alpha: self.update(),
+                                       before_steps=self.update_game_state)
+        # Spawn e dificuldade contam passos da simulação (iguais em todo replay), não o relógio de parede
+        self.spawn_timer = SimulationTimer(self.game_loop, self.spawn_object)
+        self.difficulty_timer = SimulationTimer(self.game_loop, self._update_difficulty)
+
+    def _on_camera_ready(self, camera):
+        self.camera = camera
+
+    def _stages(self):
+        return self.FRENZY_STAGES if self.frenzy else self.DIFFICULTY_STAGES
+
+    def start_game(self, frenzy=False):
+        self.frenzy = frenzy
+        preload_sprites(self.fruit_images + [self.bomb_image])
+        # Ao gravar/reproduzir uma sessão, o RNG usa a semente da gravação
+        self.spawner.seed(self.camera.begin_session())
+        self.stage_schedule = self.spawner.stages(self._stages())
         self.score = 0
         self.lives = 3
         self.game_over = False
-        self.game_objects.clear()
+        self.object_pool.release_all(self.game_objects)
+        # Objetos suficientes para a fase mais rápida: a partida não cria mais nenhum
+        self.object_pool.reserve(self.POOL_RESERVE)
+        self.fruit_store.clear()
         self.trail_points_hand1.clear()
         self.trail_points_hand2.clear()
+        self.active_hands_cursors = []
         self.game_time_elapsed = 0
         self.current_stage = 0
-        initial_settings = self.DIFFICULTY_STAGES[0]
+        self.session_start = time.monotonic()
+        self.session_duration = 0.0
+        initial_settings = self._stages()[0]
         self.spawn_timer.start(initial_settings['spawn_rate'])
-        self.game_timer.start(16)
+        self.game_loop.clock = self.camera.game_clock
+        self.game_loop.start()
         self.difficulty_timer.start(1000)
 
     def end_game(self):
         self.game_over = True
-        self.game_timer.stop()
+        self.session_duration = time.monotonic() - self.session_start
+        self.game_loop.stop()
         self.spawn_timer.stop()
         self.difficulty_timer.stop()
         self.game_finished.emit(self.score)
 
     def _update_difficulty(self):
         self.game_time_elapsed += 1
-        if self.current_stage < len(self.DIFFICULTY_STAGES) - 1:
-            stage_end_time = sum(s['duration'] for s in self.DIFFICULTY_STAGES[:self.current_stage + 1])
-            if self.game_time_elapsed >= stage_end_time:
-                self.current_stage += 1
-                new_settings = self.DIFFICULTY_STAGES[self.current_stage]
-                self.spawn_timer.setInterval(new_settings['spawn_rate'])
+        if self.frenzy and self.game_time_elapsed >= self.FRENZY_DURATION:
+            self.end_game()
+            return
+        stage = self.stage_schedule.stage_at(self.game_time_elapsed)
+        if stage != self.current_stage:
+            self.current_stage = stage
+            self.spawn_timer.setInterval(self.stage_schedule.stages[stage]['spawn_rate'])
 
     def spawn_object(self):
         if self.game_over: return
-        settings = self.DIFFICULTY_STAGES[self.current_stage]
-        if random.random() < settings['bomb_chance']:
-            obj = FallingObject(self.bomb_image, settings, is_bomb=True)
+        settings = self._stages()[self.current_stage]
+        if self.frenzy:
+            for _ in range(settings['burst']):
+                self._spawn_into_store(settings)
+            return
+        spawner = self.spawner
+        if spawner.chance(settings['bomb_chance']):
+            obj = self.object_pool.acquire(self.bomb_image, settings, self.OBJECT_SIZE, True, spawner.rng)
         else:
-            image_path = random.choice(self.fruit_images)
-            obj = FallingObject(image_path, settings)
+            image_path = spawner.pick(self.fruit_table)
+            obj = self.object_pool.acquire(image_path, settings, self.OBJECT_SIZE, False, spawner.rng)
         if not obj.pixmap.isNull():
             self.game_objects.append(obj)
+        else:
+            self.object_pool.release(obj)
+
+    def _spawn_into_store(self, settings, size=(80, 80)):
+        # Mesmos sorteios do FallingObject, mas gravados direto nos arrays do FruitStore
+        rng = self.spawner.rng
+        is_bomb = self.spawner.chance(settings['bomb_chance'])
+        image_path = self.bomb_image if is_bomb else self.spawner.pick(self.fruit_table)
+        pixmap = get_sprite(image_path, size[0], size[1])
+        if pixmap.isNull(): return
+        self.fruit_store.spawn(
+            rng.randint(100, 700), 600,
+            rng.uniform(-1.5, 1.5), rng.uniform(settings['min_vy'], settings['max_vy']),
+            size, is_bomb, self.fruit_store.sprite_id(image_path, pixmap)
+        )
+
+    def _update_fruit_store(self, cursors):
+        """Versão em lote do laço de update_game_state para o modo Frenesi."""
+        store = self.fruit_store
+        store.step()
+        offscreen = store.offscreen_mask(self.height())
+        hits = store.hit_test([(c.x(), c.y()) for c in cursors], exclude=offscreen)
+        if len(hits):
+            store.sliced[hits] = True
+            bombs = store.is_bomb[hits]
+            self.score += int(np.count_nonzero(~bombs))
+            if bombs.any(): self.end_game()
+        # Frutas cortadas não são mais desenhadas: saem junto com as que deixaram a tela
+        store.remove(offscreen | store.sliced[:store.count])
 
     def update_game_state(self):
         if self.game_over: return
         rgb_frame, results = self.camera.get_frame()
+        # Com a thread de captura em erro, o frame é o último bom: avisa em vez de congelar calado
+        self.camera_message = "Falha na Câmera" if self.camera.capture_error is not None else ""
         if rgb_frame is None: return
 
-        self.camera_pixmap = self._convert_frame_to_pixmap(rgb_frame)
-        active_hands_cursors = []
-        if results and results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                pt = hand_landmarks.landmark[8]
-                cursor_pos = QPoint(int(pt.x * self.width()), int(pt.y * self.height()))
-                active_hands_cursors.append(cursor_pos)
+        with profiler.span("convert_frame_to_pixmap"):
+            self.camera_pixmap = self._convert_frame_to_pixmap(rgb_frame)
+        # Ponta do indicador (landmark 8) de todas as mãos de uma vez, a partir do array da câmera
+        points, _handedness = self.camera.get_landmarks()
+        tips = (points[:, 8, :2].astype(np.float64) * (self.width(), self.height())).astype(np.int64)
+        active_hands_cursors = [QPoint(x, y) for x, y in tips.tolist()]
 
         if len(active_hands_cursors) > 0:
             self.trail_points_hand1.append(active_hands_cursors[0])
@@ -112,28 +211,55 @@ class GameWidget(QWidget):
             if len(self.trail_points_hand2) > 15: self.trail_points_hand2.pop(0)
         else: self.trail_points_hand2.clear()
 
-        for obj in list(self.game_objects):
+        self.active_hands_cursors = active_hands_cursors
+
+    def _step_simulation(self):
+        """Um passo fixo de física e cortes, com os cursores da última leitura da câmera."""
+        if self.game_over: return
+        if self.frenzy:
+            self._update_fruit_store(self.active_hands_cursors)
+            return
+
+        # Compacta a lista no lugar (sem cópia por passo) e devolve ao pool o que saiu da tela
+        objects = self.game_objects
+        height = self.height()
+        kept = 0
+        for obj in objects:
             obj.update()
-            if obj.y > self.height() and obj.vy > 0:
-                if not obj.is_bomb and not obj.sliced:
+            if obj.y > height and obj.vy > 0:
+                if not obj.is_bomb: # (as cortadas já saíram da lista)
                     self.lives -= 1
                     if self.lives <= 0: self.end_game()
-                self.game_objects.remove(obj)
+                self.object_pool.release(obj)
+                continue
+            hit = False
+            for cursor in self.active_hands_cursors:
+                if obj.contains(cursor.x(), cursor.y()):
+                    hit = True
+                    break
+            if hit:
+                # Cortada: não é mais desenhada nem cai (update para de movê-la),
+                # então volta direto ao pool em vez de ficar na lista até o fim da partida
+                if obj.is_bomb: self.end_game()
+                else: self.score += 1
+                self.object_pool.release(obj)
                 continue
-            for cursor in active_hands_cursors:
-                if obj.get_rect().contains(cursor) and not obj.sliced:
-                    obj.sliced = True
-                    if obj.is_bomb: self.end_game()
-                    else: self.score += 1
-                    break 
-        self.update()
+            objects[kept] = obj
+            kept += 1
+        del objects[kept:]
 
     def paintEvent(self, event):
+        with profiler.span("paintEvent"):
+            self._paint_scene()
+
+    def _paint_scene(self):
         painter = QPainter(self)
         if not self.camera_pixmap.isNull(): painter.drawPixmap(self.rect(), self.camera_pixmap)
         
+        alpha = self.game_loop.alpha
         for obj in self.game_objects:
-            if not obj.sliced: obj.draw(painter)
+            if not obj.sliced: obj.draw(painter, alpha)
+        self.fruit_store.draw(painter, alpha)
 
         if len(self.trail_points_hand1) > 1:
             pen = QPen(QColor(self.colors["primary"]), 5, Qt.SolidLine)
@@ -148,13 +274,22 @@ class GameWidget(QWidget):
         painter.setFont(QFont("Arial", 24, QFont.Bold))
         painter.setPen(QColor(self.colors["text_light"])) # Texto branco para contraste com a câmera
         painter.drawText(20, 40, f"Score: {self.score}")
-        painter.drawText(self.width() - 150, 40, f"Vidas: {self.lives}")
+        if self.frenzy:
+            painter.drawText(self.width() - 150, 40, f"Tempo: {max(0, self.FRENZY_DURATION - self.game_time_elapsed)}")
+        else:
+            painter.drawText(self.width() - 150, 40, f"Vidas: {self.lives}")
         
+        if self.camera_message and not self.game_over:
+            painter.setFont(QFont("Arial", 28, QFont.Bold))
+            painter.setPen(QColor(self.colors["accent_red"]))
+            painter.drawText(self.rect(), Qt.AlignCenter, self.camera_message)
+
         if self.game_over:
             painter.setFont(QFont("Arial", 50, QFont.Bold))
             painter.setPen(QColor(self.colors["accent_red"]))
             painter.drawText(self.rect(), Qt.AlignCenter, "GAME OVER")
         
+        profiler.draw_hud(painter)
         painter.end()
 
     def _convert_frame_to_pixmap(self, frame):
@@ -164,7 +299,7 @@ class GameWidget(QWidget):
 
 # --- JANELA PRINCIPAL: Gerenciador das Telas ---
 class MainWindow(QWidget):
-    def __init__(self):
+    def __init__(self, camera_kwargs=None):
         super().__init__()
         self.setWindowTitle("Fruit Ninja")
         self.setGeometry(100, 100, 800, 600)
@@ -183,11 +318,14 @@ class MainWindow(QWidget):
         }
         self.setStyleSheet(f"background-color: {self.colors['bg_dark']}; color: {self.colors['text_dark']};")
 
-        self.highscore = self._load_highscore()
+        # Recorde vem do placar SQLite (consulta indexada; migra o highscore.txt antigo)
+        self.leaderboard = shared_leaderboard()
+        # O Frenesi tem placar próprio: partidas de 30 s não competem com o modo normal
+        self.highscores = {game: self.leaderboard.best_score(game) for game in ("ninja", "ninja-frenzy")}
         self.stack = QStackedWidget()
         
         self.home_screen = self._create_home_screen()
-        self.game_widget = GameWidget(self.colors) # Passa as cores para a tela do jogo
+        self.game_widget = GameWidget(self.colors, camera_kwargs) # Passa as cores para a tela do jogo
         self.game_over_screen = self._create_game_over_screen()
         
         self.stack.addWidget(self.home_screen)
@@ -195,20 +333,21 @@ class MainWindow(QWidget):
         self.stack.addWidget(self.game_over_screen)
         
         self.game_widget.game_finished.connect(self.show_game_over_screen)
+        self.game_widget.camera_loader.ready.connect(self._on_camera_ready)
+        self.game_widget.camera_loader.failed.connect(self._on_camera_failed)
+        # Início e fim de jogo são telas estáticas: captura pausada fora da partida
+        self.governor = InferenceGovernor(self.stack, {
+            self.home_screen: ("inicio", OFF),
+            self.game_widget: ("jogo", FULL),
+            self.game_over_screen: ("fim", OFF),
+        }, parent=self)
+        self.governor.watch(self.game_widget.camera_loader)
 
         layout = QVBoxLayout()
         layout.setContentsMargins(0,0,0,0)
         layout.addWidget(self.stack)
         self.setLayout(layout)
 
-    def _load_highscore(self):
-        try:
-            with open("highscore.txt", "r") as f: return int(f.read())
-        except (FileNotFoundError, ValueError): return 0
-
-    def _save_highscore(self):
-        with open("highscore.txt", "w") as f: f.write(str(self.highscore))
-
     def _create_home_screen(self):
         widget = QWidget()
         layout = QVBoxLayout(widget, alignment=Qt.AlignCenter, spacing=20)
@@ -223,20 +362,41 @@ class MainWindow(QWidget):
         except Exception as e:
             image_label.setText("Imagem não encontrada")
         
-        self.highscore_label = QLabel(f"RECORDE: {self.highscore}", alignment=Qt.AlignCenter)
+        self.highscore_label = QLabel(self._highscore_text(), alignment=Qt.AlignCenter)
         self.highscore_label.setFont(QFont("Arial", 20))
         
         start_btn = QPushButton("▶ Iniciar Jogo")
         start_btn.setFixedSize(250, 70)
         start_btn.setFont(QFont("Arial", 22))
         start_btn.setStyleSheet(f"background-color: {self.colors['accent_green']}; border-radius: 15px; color: {self.colors['text_light']};")
-        start_btn.clicked.connect(self.start_game)
+        start_btn.clicked.connect(lambda: self.start_game(False))
+
+        frenzy_btn = QPushButton("⚡ Modo Frenesi")
+        frenzy_btn.setFixedSize(250, 60)
+        frenzy_btn.setFont(QFont("Arial", 20))
+        frenzy_btn.setStyleSheet(f"background-color: {self.colors['primary']}; border-radius: 15px; color: {self.colors['text_light']};")
+        frenzy_btn.clicked.connect(lambda: self.start_game(True))
         
+        # Os botões só liberam quando a câmera e o modelo estiverem prontos
+        self.start_buttons = [start_btn, frenzy_btn]
+        for btn in self.start_buttons: btn.setEnabled(False)
+        self.camera_status_label = QLabel("Preparando a câmera...", alignment=Qt.AlignCenter)
+        self.camera_status_label.setFont(QFont("Arial", 16))
+
         layout.addWidget(title)
         layout.addWidget(image_label)
         layout.addWidget(self.highscore_label)
         layout.addWidget(start_btn, alignment=Qt.AlignCenter)
+        layout.addWidget(frenzy_btn, alignment=Qt.AlignCenter)
+        layout.addWidget(self.camera_status_label)
         return widget
+
+    def _on_camera_ready(self, camera):
+        for btn in self.start_buttons: btn.setEnabled(True)
+        self.camera_status_label.setText("")
+
+    def _on_camera_failed(self, message):
+        self.camera_status_label.setText(f"Câmera indisponível: {message}")
         
     def _create_game_over_screen(self):
         widget = QWidget()
@@ -254,7 +414,7 @@ class MainWindow(QWidget):
         home_btn = QPushButton("Voltar ao Início")
         
         for btn, color, action in [
-            (restart_btn, self.colors['primary'], self.start_game),
+            (restart_btn, self.colors['primary'], lambda: self.start_game(self.game_widget.frenzy)),
             (home_btn, self.colors['accent_red'], self.show_home_screen)
         ]:
             btn.setFixedSize(220, 60)
@@ -268,32 +428,59 @@ class MainWindow(QWidget):
         layout.addLayout(btn_layout)
         return widget
 
-    def start_game(self):
+    def start_game(self, frenzy=False):
         self.stack.setCurrentWidget(self.game_widget)
-        self.game_widget.start_game()
+        self.game_widget.start_game(frenzy)
+
+    def _highscore_text(self):
+        return f"RECORDE: {self.highscores['ninja']}  |  FRENESI: {self.highscores['ninja-frenzy']}"
 
     def show_home_screen(self):
-        self.highscore_label.setText(f"RECORDE: {self.highscore}")
+        self.highscore_label.setText(self._highscore_text())
         self.final_score_label.setStyleSheet(f"color: {self.colors['text_dark']};") # Reseta cor do score
         self.stack.setCurrentWidget(self.home_screen)
 
     def show_game_over_screen(self, final_score):
         self.final_score_label.setText(f"Sua pontuação: {final_score}")
-        if final_score > self.highscore:
-            self.highscore = final_score
-            self._save_highscore()
+        # Só enfileira: a gravação acontece na thread do placar
+        game = "ninja-frenzy" if self.game_widget.frenzy else "ninja"
+        self.leaderboard.record_session(game, {"P1": final_score}, self.game_widget.session_duration)
+        if final_score > self.highscores[game]:
+            self.highscores[game] = final_score
             self.final_score_label.setText(f"NOVO RECORDE: {final_score}!")
             self.final_score_label.setStyleSheet(f"color: {self.colors['text_gold']};")
         
         self.stack.setCurrentWidget(self.game_over_screen)
 
+    def keyPressEvent(self, event):
+        # F3: HUD do profiler por etapa; F4: exporta o trace (ver frame_profiler.py)
+        if not profiler.handle_key(event):
+            super().keyPressEvent(event)
+
+    def shutdown(self):
+        """Para o jogo e libera a câmera (ao fechar, ou quando o launcher troca de jogo)."""
+        # Para o laço do jogo antes de liberar a câmera
+        self.game_widget.game_loop.stop()
+        self.game_widget.spawn_timer.stop()
+        self.game_widget.difficulty_timer.stop()
+        self.governor.print_report()
+        camera = self.game_widget.camera_loader.cancel()
+        if camera is not None: camera.release()
+
     def closeEvent(self, event):
-        self.game_widget.camera.release()
+        self.shutdown()
+        self.leaderboard.close()
         event.accept()
 
 # --- Bloco para executar o jogo ---
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # --source/--pacing escolhem a fonte de frames; --headless [--duration s] mede a vazão sem display
+    options, qt_argv = parse_source_args(sys.argv)
+    app = QApplication(qt_argv)
     window = MainWindow()
     window.show()
+    report_startup(window.game_widget.camera_loader)
+    if options.headless:
+        widget = window.game_widget
+        sys.exit(run_headless(app, window, window.start_game, options.duration, widget.camera_loader, widget.game_loop))
     sys.exit(app.exec())
\ No newline at end of file
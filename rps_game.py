@@ -1,14 +1,34 @@
 import sys
+import random
+import time
 
 from PySide6.QtWidgets import (QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QHBoxLayout, QFrame, QStackedWidget)
 from PySide6.QtCore import Qt, QTimer
-from PySide6.QtGui import (QImage, QPixmap, QFont, QColor, QPainter, QPainterPath, QBrush)
-
-from camera import Camera, mp_hands, mp_drawing
-from game_logic import GameLogic, detectar_gesto
+from PySide6.QtGui import (QPixmap, QFont)
+
+from camera import Camera
+from game_logic import GameLogic, classificar_gestos, votar_jogada
+from session_recording import camera_from_env
+from inference_roi import inference_region_from_env
+from landmark_filters import frame_skipper_from_env
+from frame_sources import parse_source_args
+from headless import run_headless
+from leaderboard import shared_leaderboard
+from inference_profiles import profile_for
+from camera_loader import CameraLoader, report_startup
+from inference_governor import InferenceGovernor, OFF, TRIGGER, FULL
+from frame_view import RoundedFrameView
+from landmark_overlay import hand_overlay
+from frame_profiler import profiler
 
 class RPSGame(QWidget):
-    def __init__(self):
+    # Janela (em segundos, em volta do "JOGUE!") cujos frames votam na jogada
+    MOVE_WINDOW_BEFORE = 0.1
+    MOVE_WINDOW_AFTER = 0.5
+    MOVE_VOTE_FRAMES = 15  # no máximo os N frames mais recentes da janela com mão
+    MOVE_SETTLE_TIMEOUT = 0.25  # espera máxima, depois da janela, pelos frames ainda em inferência
+
+    def __init__(self, camera_kwargs=None):
         super().__init__()
         
         # --- Configurações Iniciais ---
@@ -16,8 +36,22 @@ class RPSGame(QWidget):
         self.setGeometry(100, 100, 800, 750)
         self.setMinimumSize(600, 700)
 
-        self.camera = Camera()
+        # Câmera + modelo abrem numa thread depois que a janela aparece (ver camera_loader.py).
+        # `camera_kwargs` vem do launcher (fonte e pool de modelos compartilhados)
+        self.camera = None
+        self.overlay = None
+        self._shown_frame = (None, None)  # (nº do frame, landmarks) já desenhados no camera_label
+        camera_kwargs = camera_kwargs or {}
+        # Modelo e limites de mãos do perfil do jogo (VISION_GAMES_PROFILE_RPS; ver inference_profiles.py)
+        self.inference_profile = profile_for("rps")
+        self.camera_loader = CameraLoader(lambda: camera_from_env("hand", lambda: Camera(
+            threaded=True, inference_region=inference_region_from_env(self.inference_profile.max_items),
+            frame_skip=frame_skipper_from_env("hand"), profile=self.inference_profile, **camera_kwargs)), self)
+        self.camera_loader.ready.connect(self._on_camera_ready)
+        self.camera_loader.failed.connect(self._on_camera_failed)
         self.logic = GameLogic()
+        self.leaderboard = shared_leaderboard()
+        self.match_start = time.monotonic()
 
         # --- Paleta de Cores e Fontes ---
         self.colors = {
@@ -44,6 +78,8 @@ class RPSGame(QWidget):
         self.is_waiting_for_thumb = False
         self.countdown_value = 0
         self.player_move = None
+        self.throw_time = None
+        self.last_move_capture = None  # horários/gestos usados na última jogada (análise de latência)
 
         # --- Estrutura da UI ---
         self.stack = QStackedWidget(self)
@@ -53,19 +89,28 @@ class RPSGame(QWidget):
         self._create_screens()
 
         # --- Timers ---
+        # O feed só roda na tela do jogo, acompanhando o modo de inferência da fase atual
         self.camera_timer = QTimer(self)
         self.camera_timer.timeout.connect(self._update_camera_feed)
-        self.camera_timer.start(30)
+        QTimer.singleShot(0, self.camera_loader.start)
+
+        # Início: nada de inferência; esperando o 👍: detector em taxa baixa; jogada: taxa máxima
+        self.governor = InferenceGovernor(self.stack, {
+            self.home_screen: ("inicio", OFF),
+            self.game_screen: ("aguardando_joinha", TRIGGER),
+        }, parent=self)
+        self.governor.mode_changed.connect(self._on_inference_mode)
+        self.governor.watch(self.camera_loader)
 
         self.countdown_timer = QTimer(self)
         self.countdown_timer.timeout.connect(self._update_countdown)
 
     def _create_screens(self):
-        home_screen = self._create_home_screen()
-        game_screen = self._create_game_screen()
+        self.home_screen = self._create_home_screen()
+        self.game_screen = self._create_game_screen()
 
-        self.stack.addWidget(home_screen)
-        self.stack.addWidget(game_screen)
+        self.stack.addWidget(self.home_screen)
+        self.stack.addWidget(self.game_screen)
 
     def _create_home_screen(self):
         widget = QWidget()
@@ -90,6 +135,10 @@ class RPSGame(QWidget):
             QPushButton:hover {{ background-color: #5cb85c; }}
         """)
         start_btn.clicked.connect(self._start_game)
+        # Liberado quando a câmera e o modelo estiverem prontos
+        start_btn.setEnabled(False)
+        start_btn.setText("Preparando a câmera...")
+        self.start_btn = start_btn
 
         layout.addStretch()
         layout.addWidget(title)
@@ -117,7 +166,7 @@ class RPSGame(QWidget):
         top_layout.addWidget(self.status_label, 1)
         top_layout.addWidget(score_frame)
         
-        self.camera_label = QLabel(alignment=Qt.AlignCenter)
+        self.camera_label = RoundedFrameView(radius=27)
         self.camera_label.setStyleSheet("border: 3px solid #333C4A; border-radius: 20px; background-color: black;")
         
         info_layout = QHBoxLayout(spacing=20)
@@ -164,9 +213,30 @@ class RPSGame(QWidget):
         
         return frame, value_label
 
+    def _on_camera_ready(self, camera):
+        self.camera = camera
+        self.overlay = hand_overlay()
+        self.start_btn.setText("▶ Iniciar Jogo")
+        self.start_btn.setEnabled(True)
+
+    def _on_camera_failed(self, message):
+        self.start_btn.setText("Câmera indisponível")
+
+    def _on_inference_mode(self, mode):
+        if mode == OFF or self.camera is None:
+            self.camera_timer.stop()
+        elif not self.camera_timer.isActive():
+            self.camera_timer.start(30)
+
     def _start_game(self):
+        # Ao gravar/reproduzir uma sessão, a escolha do PC usa a semente da gravação
+        seed = self.camera.begin_session()
+        if seed is not None:
+            random.seed(seed)
+
         self.logic.reset_scores()
         self._update_score_display()
+        self.match_start = time.monotonic()
         
         self.stack.setCurrentIndex(1)
         self.is_game_running = True
@@ -187,66 +257,53 @@ class RPSGame(QWidget):
         
         self.actions_widget.hide()
         self.is_waiting_for_thumb = True
-
-    def _create_rounded_pixmap(self, source_pixmap, radius):        
-        rounded = QPixmap(source_pixmap.size())
-        rounded.fill(Qt.transparent)
-
-        painter = QPainter(rounded)
-        painter.setRenderHint(QPainter.Antialiasing) 
-        painter.setPen(Qt.NoPen)
-
-        texture_brush = QBrush(source_pixmap)
-        painter.setBrush(texture_brush)
-
-        path = QPainterPath()
-        path.addRoundedRect(rounded.rect(), radius, radius)
-
-        painter.drawPath(path)
-        painter.end()
-
-        return rounded
+        self.governor.enter("aguardando_joinha", TRIGGER)
 
     def _update_camera_feed(self):
-        rgb_frame, results = self.camera.get_frame()
+        with profiler.span("get_frame"):
+            rgb_frame, results = self.camera.get_frame()
         
         if not self.is_game_running or rgb_frame is None:
-            if self.is_game_running:
-                self.camera_label.setText("Falha na Câmera")
+            # Sem frame novo (ex.: captura voltando de uma pausa) não é falha; só se a thread de captura caiu
+            if self.is_game_running and self.camera.capture_error is not None:
+                self.camera_label.show_message("Falha na Câmera")
             return
 
         detected_gesture = "---"
-        if results and results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                mp_drawing.draw_landmarks(rgb_frame, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-                gesture = detectar_gesto(hand_landmarks)
-                if gesture:
-                    detected_gesture = gesture
-                    if self.is_waiting_for_thumb and gesture == "Joinha":
-                        self.is_waiting_for_thumb = False
-                        self._start_countdown()
+        # Landmarks convertidos uma vez para array: servem ao desenho e aos gestos
+        points, _handedness = self.camera.get_landmarks()
+        for gesture in classificar_gestos(points):
+            if gesture:
+                detected_gesture = gesture
+                if self.is_waiting_for_thumb and gesture == "Joinha":
+                    self.is_waiting_for_thumb = False
+                    self._start_countdown()
         if detected_gesture == "Joinha":
             detected_gesture = "👍 Joinha"
         
         self.signal_value_label.setText(detected_gesture)
-        pixmap = self._convert_frame_to_pixmap(rgb_frame)
-        
-        if self.countdown_value > 0:
-            painter = QPainter(pixmap)
-            painter.setFont(QFont("Arial", 150, QFont.Bold))
-            painter.setPen(QColor(255, 255, 0, 200))
-            painter.drawText(pixmap.rect(), Qt.AlignCenter, str(self.countdown_value))
-            painter.end()
-        
-        scaled_pixmap = pixmap.scaled(self.camera_label.size(), Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
-
-        rounded_scaled_pixmap = self._create_rounded_pixmap(scaled_pixmap, 27)
-
-        self.camera_label.setPixmap(rounded_scaled_pixmap)
+        # O frame vai direto para o buffer do RoundedFrameView (sem QPixmap por frame);
+        # a contagem regressiva é desenhada por cima no paintEvent do próprio label
+        overlay_text = str(self.countdown_value) if self.countdown_value > 0 else ""
+        if overlay_text != self.camera_label.overlay_text:
+            self.camera_label.overlay_text = overlay_text
+            self.camera_label.update()
+        frame_key = (self.camera.last_frame[0], results)
+        if frame_key == self._shown_frame:
+            return
+        # Com thread, o mesmo array da câmera volta em vários ticks: desenha as mãos numa
+        # cópia, e só quando frame ou landmarks mudam, para não empilhar desenhos
+        self._shown_frame = frame_key
+        frame = rgb_frame.copy()
+        with profiler.span("mesh_drawing"):
+            self.overlay.draw(frame, points)
+        with profiler.span("show_frame"):
+            self.camera_label.show_frame(frame)
 
     def _start_countdown(self):
         self.countdown_value = 3
         self.status_label.setText("Prepare-se...")
+        self.governor.enter("contagem", TRIGGER)
         self.countdown_timer.start(1000)
 
         
@@ -254,19 +311,48 @@ class RPSGame(QWidget):
         if self.countdown_value > 0:
             self.status_label.setText(f"{self.countdown_value}...")
         self.countdown_value -= 1
+        if self.countdown_value == 0:
+            # Último segundo antes do "JOGUE!": taxa máxima para a janela de votação da jogada
+            self.governor.enter("jogada", FULL)
         
         if self.countdown_value < 0:
             self.countdown_timer.stop()
             self.countdown_value = 0
             self.status_label.setText("JOGUE!")
-            QTimer.singleShot(500, self._process_player_move)
+            self.throw_time = time.monotonic()
+            QTimer.singleShot(int(self.MOVE_WINDOW_AFTER * 1000), self._await_move_window)
+
+    def _await_move_window(self):
+        # Quando o timer dispara, os últimos frames da janela ainda podem estar na
+        # inferência (fora do histórico): vota quando o histórico passar do fim da
+        # janela, ou depois de MOVE_SETTLE_TIMEOUT com o que houver
+        window_end = self.throw_time + self.MOVE_WINDOW_AFTER
+        latest = self.camera.history.latest_timestamp()
+        if (latest is None or latest < window_end) and time.monotonic() < window_end + self.MOVE_SETTLE_TIMEOUT:
+            QTimer.singleShot(10, self._await_move_window)
+            return
+        self._process_player_move()
 
     def _process_player_move(self):
-        _frame, results = self.camera.get_frame()
-        
-        self.player_move = "---"
-        if results and results.multi_hand_landmarks:
-            self.player_move = detectar_gesto(results.multi_hand_landmarks[0])
+        # Sem captura extra: a jogada sai dos frames que o feed já processou
+        # na janela em volta do "JOGUE!", por maioria entre eles
+        window = (self.throw_time - self.MOVE_WINDOW_BEFORE, self.throw_time + self.MOVE_WINDOW_AFTER)
+        timestamps, counts, points, _handedness = self.camera.history.window(*window)
+        with_hand = counts > 0
+        timestamps = timestamps[with_hand][-self.MOVE_VOTE_FRAMES:]
+        gestures = classificar_gestos(points[with_hand, 0][-self.MOVE_VOTE_FRAMES:])
+
+        self.player_move = votar_jogada(gestures) or "---"
+        self.last_move_capture = {
+            "throw_time": self.throw_time,
+            "window": window,
+            "timestamps": timestamps.tolist(),
+            "gestures": gestures,
+            "move": self.player_move,
+            "decided_at": time.monotonic(),
+        }
+        # Resultado na tela: o feed continua, mas nenhum gesto é esperado até a próxima rodada
+        self.governor.enter("resultado", TRIGGER)
         
         if self.player_move in ["---", "Joinha", None]:
             self.status_label.setText("Jogada inválida! Tente de novo.")
@@ -283,6 +369,9 @@ class RPSGame(QWidget):
         QTimer.singleShot(3000, self._start_new_round)
 
     def _end_match(self):
+        # Pontuação = rodadas ganhas pelo jogador; a gravação acontece na thread do placar
+        self.leaderboard.record_session("rps", {"Jogador": self.logic.player_score}, time.monotonic() - self.match_start)
+        self.governor.enter("fim", OFF)
         winner_text = self.logic.get_match_winner()
         self.status_label.setText(f"{winner_text}")
         self.actions_widget.show()
@@ -290,25 +379,39 @@ class RPSGame(QWidget):
     def _reset_game(self):
         self.logic.reset_scores()
         self._update_score_display()
+        self.match_start = time.monotonic()
         self._start_new_round()
 
     def _update_score_display(self):
         self.score_label.setText(f"Jogador {self.logic.player_score} x {self.logic.computer_score} PC")
 
-    def _convert_frame_to_pixmap(self, frame):
-        h, w, ch = frame.shape
-        bytes_per_line = ch * w
-        qt_image = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888)
-        
-        return QPixmap.fromImage(qt_image)
+    def keyPressEvent(self, event):
+        # F3: HUD do profiler por etapa; F4: exporta o trace (ver frame_profiler.py)
+        if not profiler.handle_key(event):
+            super().keyPressEvent(event)
+
+    def shutdown(self):
+        """Para o jogo e libera a câmera (ao fechar, ou quando o launcher troca de jogo)."""
+        self.is_game_running = False
+        self.camera_timer.stop()
+        self.countdown_timer.stop()
+        self.governor.print_report()
+        camera = self.camera_loader.cancel()
+        if camera is not None: camera.release()
 
     def closeEvent(self, event):
-        self.camera.release()
+        self.shutdown()
+        self.leaderboard.close()
         event.accept()
 
 # --- Executar ---
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    # --source/--pacing escolhem a fonte de frames; --headless [--duration s] mede a vazão sem display
+    options, qt_argv = parse_source_args(sys.argv)
+    app = QApplication(qt_argv)
     game = RPSGame()
     game.show()
+    report_startup(game.camera_loader)
+    if options.headless:
+        sys.exit(run_headless(app, game, game._start_game, options.duration, game.camera_loader))
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,306 @@
+import json
+import os
+import random
+import time
+
+import cv2
+import numpy as np
+
+from landmark_history import LandmarkHistory
+from landmarks import (HANDEDNESS_LABELS, LandmarkResults, MAX_FACES, NUM_FACE_LANDMARKS, NUM_HAND_LANDMARKS,
+                       array_to_landmark_lists, handedness_to_array, landmarks_to_array)
+
+# Formato de uma gravação (um diretório):
+#   meta.json      -> tipo ("hand"/"face"), semente e formas; escrito já ao criar o gravador
+#   index.bin      -> um registro _index_dtype() por frame (horário, nº de detecções, lateralidade)
+#   landmarks.f32  -> float32 com passo fixo: (frames, max_items, pontos, 3)
+#   frames.u8      -> opcional, frames RGB reduzidos com passo fixo: (frames, h, w, 3)
+# Todos os arquivos binários podem ser abertos com np.memmap sem leitura prévia. O
+# número de frames vem do tamanho dos arquivos (o "count" do meta.json é só informativo):
+# uma gravação interrompida por um crash continua legível até o último frame completo.
+#
+# No replay, os passos fixos e os timers dos jogos (spawn, dificuldade, escudo)
+# andam pelo horário gravado dos frames (ReplayCamera.game_clock), não pelo relógio
+# de parede. Com speed="max" cada tick recebe o frame seguinte, então a mesma
+# gravação dá a mesma pontuação em toda execução. Com speed="original" o frame de
+# cada tick depende do relógio de parede e o resultado pode variar um pouco.
+# O pedra-papel-tesoura continua com timers de parede.
+FORMAT_VERSION = 1
+KIND_SETTINGS = {
+    "hand": {"max_items": 2, "num_landmarks": NUM_HAND_LANDMARKS},
+    "face": {"max_items": MAX_FACES, "num_landmarks": NUM_FACE_LANDMARKS},
+}
+
+def _index_dtype(max_items):
+    return np.dtype([("timestamp", "<f8"), ("count", "<i4"), ("handedness", "i1", (max_items,))])
+
+def _results_items(kind, results):
+    if results is None:
+        return []
+    if kind == "hand":
+        return results.multi_hand_landmarks or []
+    return results.multi_face_landmarks or []
+
+class SessionRecorder:
+    """
+    Grava, frame a frame, o horário e os landmarks de mãos/rostos (e, se pedido,
+    uma cópia reduzida do frame) em arquivos NumPy de passo fixo.
+    """
+
+    def __init__(self, path, kind, frame_size=None, seed=None):
+        settings = KIND_SETTINGS[kind]
+        self.path = path
+        self.kind = kind
+        self.max_items = settings["max_items"]
+        self.num_landmarks = settings["num_landmarks"]
+        self.frame_size = tuple(frame_size) if frame_size else None  # (largura, altura)
+        self.seed = seed if seed is not None else random.SystemRandom().randrange(2**31)
+        self.count = 0
+        self.recording = False
+        self._frame_shape = None
+        self._start_time = None
+        self._index_dtype = _index_dtype(self.max_items)
+
+        os.makedirs(path, exist_ok=True)
+        self._index_file = open(os.path.join(path, "index.bin"), "wb")
+        self._landmarks_file = open(os.path.join(path, "landmarks.f32"), "wb")
+        self._frames_file = open(os.path.join(path, "frames.u8"), "wb") if self.frame_size else None
+        self._write_meta()
+
+    def _write_meta(self):
+        meta = {
+            "version": FORMAT_VERSION,
+            "kind": self.kind,
+            "seed": self.seed,
+            "count": self.count,
+            "max_items": self.max_items,
+            "num_landmarks": self.num_landmarks,
+            "frame_shape": list(self._frame_shape) if self._frame_shape else None,
+            "thumbnail_size": list(self.frame_size) if self.frame_size else None,
+        }
+        # Arquivo temporário + rename: um crash no meio não deixa um meta.json pela metade
+        temp_path = os.path.join(self.path, "meta.json.tmp")
+        with open(temp_path, "w") as f:
+            json.dump(meta, f, indent=2)
+        os.replace(temp_path, os.path.join(self.path, "meta.json"))
+
+    def start(self):
+        """Começa a gravar (chamado no início da partida). Chamadas repetidas são ignoradas."""
+        self.recording = True
+
+    def record(self, timestamp, rgb_frame, results):
+        if not self.recording or self._index_file is None:
+            return
+        if self._start_time is None:
+            self._start_time = timestamp
+            self._frame_shape = rgb_frame.shape
+            self._write_meta()
+
+        items = _results_items(self.kind, results)[:self.max_items]
+        entry = np.zeros((), dtype=self._index_dtype)
+        entry["timestamp"] = timestamp - self._start_time
+        entry["count"] = len(items)
+        entry["handedness"] = -1
+        if self.kind == "hand" and items:
+            entry["handedness"][:len(items)] = handedness_to_array(results.multi_handedness, len(items))
+
+        points = np.zeros((self.max_items, self.num_landmarks, 3), dtype=np.float32)
+        if items:
+            points[:len(items)] = landmarks_to_array(items, self.num_landmarks)
+
+        # Dados antes do índice, e tudo já no arquivo: se o processo morrer, o
+        # índice nunca aponta para um frame que não foi escrito
+        self._landmarks_file.write(points.tobytes())
+        self._landmarks_file.flush()
+        if self._frames_file is not None:
+            small = cv2.resize(rgb_frame, self.frame_size, interpolation=cv2.INTER_AREA)
+            self._frames_file.write(small.tobytes())
+            self._frames_file.flush()
+        self._index_file.write(entry.tobytes())
+        self._index_file.flush()
+        self.count += 1
+
+    def close(self):
+        if self._index_file is None:
+            return
+        for f in (self._index_file, self._landmarks_file, self._frames_file):
+            if f is not None:
+                f.close()
+        self._index_file = None
+        self._write_meta()
+
+def _recorded_frames(path, meta):
+    """Frames completos no disco: o menor número de registros inteiros entre os arquivos."""
+    max_items, num_landmarks = meta["max_items"], meta["num_landmarks"]
+    record_sizes = {
+        "index.bin": _index_dtype(max_items).itemsize,
+        "landmarks.f32": max_items * num_landmarks * 3 * 4,
+    }
+    if meta["thumbnail_size"]:
+        width, height = meta["thumbnail_size"]
+        record_sizes["frames.u8"] = height * width * 3
+    return min(os.path.getsize(os.path.join(path, name)) // size for name, size in record_sizes.items())
+
+class ReplayCamera:
+    """
+    Fonte de frames que reproduz uma gravação no lugar de Camera/FaceCamera,
+    com o mesmo contrato de get_frame() -> (rgb_frame, results).
+
+    speed="original" respeita os horários gravados; speed="max" entrega um frame
+    novo a cada chamada. Nos dois casos a semente gravada é usada para o RNG do jogo
+    e game_clock() devolve o horário gravado do frame (ver o topo do módulo).
+    """
+
+    capture_error = None  # sem thread de captura
+
+    def set_profile(self, profile):
+        """A gravação já tem os landmarks: não há modelo para trocar."""
+
+    def __init__(self, path, speed="original", loop=False):
+        with open(os.path.join(path, "meta.json")) as f:
+            self.meta = json.load(f)
+        self.kind = self.meta["kind"]
+        self.speed = speed
+        self.loop = loop
+        self.finished = False
+        max_items, num_landmarks = self.meta["max_items"], self.meta["num_landmarks"]
+        count = _recorded_frames(path, self.meta)
+        if count == 0:
+            raise ValueError(f"A gravação '{path}' não tem nenhum frame.")
+
+        self.index = np.memmap(os.path.join(path, "index.bin"), dtype=_index_dtype(max_items), mode="r", shape=(count,))
+        self.landmarks = np.memmap(os.path.join(path, "landmarks.f32"), dtype=np.float32, mode="r",
+                                   shape=(count, max_items, num_landmarks, 3))
+        self.frames = None
+        if self.meta["thumbnail_size"]:
+            width, height = self.meta["thumbnail_size"]
+            self.frames = np.memmap(os.path.join(path, "frames.u8"), dtype=np.uint8, mode="r",
+                                    shape=(count, height, width, 3))
+        self._blank_shape = tuple(self.meta["frame_shape"] or (480, 640, 3))
+
+        if self.kind != "face":
+            # Como Camera.history, com o horário em que cada frame foi entregue
+            self.history = LandmarkHistory(max_items=max_items, num_landmarks=num_landmarks)
+
+        self._position = 0
+        self._start_time = None
+        self._cache = (-1, None)
+        self._clock_offset = 0.0  # soma das durações já reproduzidas (com loop)
+        self.last_frame = (0, None)  # como em Camera: (nº do frame entregue, horário da entrega)
+
+    def begin_session(self):
+        """Volta ao início da gravação e retorna a semente do RNG usada ao gravar."""
+        self._position = 0
+        self._start_time = None
+        self.finished = False
+        self._cache = (-1, None)
+        self._clock_offset = 0.0
+        return self.meta["seed"]
+
+    def game_clock(self):
+        """Horário gravado do último frame entregue: o relógio do jogo durante o replay."""
+        i = self._cache[0]
+        if i < 0:
+            return self._clock_offset
+        return self._clock_offset + float(self.index["timestamp"][i])
+
+    def _next_index(self):
+        count = len(self.index)
+        if self.speed == "max":
+            i = self._position
+            self._position += 1
+        else:
+            now = time.monotonic()
+            if self._start_time is None:
+                self._start_time = now
+            elapsed = now - self._start_time
+            timestamps = self.index["timestamp"]
+            i = count if elapsed > timestamps[-1] else max(int(np.searchsorted(timestamps, elapsed, side="right")) - 1, 0)
+
+        if i >= count:
+            if not self.loop:
+                self.finished = True
+                return None
+            self._position = 1
+            self._start_time = time.monotonic()
+            self._clock_offset += float(self.index["timestamp"][-1])
+            i = 0
+        return i
+
+    def _results_for(self, i):
+        entry = self.index[i]
+        points = np.asarray(self.landmarks[i, :entry["count"]])
+        if len(points) == 0:
+            return LandmarkResults()
+        landmark_lists = array_to_landmark_lists(points)
+        if self.kind == "face":
+            return LandmarkResults(multi_face_landmarks=landmark_lists)
+
+        from mediapipe.framework.formats import classification_pb2  # import pesado, só na reprodução
+        handedness = []
+        for label_index in entry["handedness"][:entry["count"]]:
+            classification_list = classification_pb2.ClassificationList()
+            if label_index >= 0:
+                classification_list.classification.add(label=HANDEDNESS_LABELS[label_index], score=1.0)
+            handedness.append(classification_list)
+        return LandmarkResults(multi_hand_landmarks=landmark_lists, multi_handedness=handedness)
+
+    def get_frame(self):
+        i = self._next_index()
+        if i is None:
+            return None, None
+
+        if self._cache[0] != i:
+            self._cache = (i, self._results_for(i))
+            self.last_frame = (self.last_frame[0] + 1, self.game_clock())
+            if self.kind == "hand":
+                count = self.index[i]["count"]
+                self.history.push(time.monotonic(), self.landmarks[i, :count], self.index[i]["handedness"])
+        # Sempre um array novo: os jogos desenham por cima do frame
+        if self.frames is not None:
+            rgb_frame = np.array(self.frames[i])
+        else:
+            rgb_frame = np.zeros(self._blank_shape, dtype=np.uint8)
+        return rgb_frame, self._cache[1]
+
+    def get_landmarks(self):
+        """
+        Landmarks do último frame entregue direto da gravação, sem passar por
+        protobuf: (detecções, pontos, 3) float32 e lateralidade int8 (None no rosto).
+        """
+        i = self._cache[0]
+        if i < 0:
+            points = np.zeros((0, self.meta["num_landmarks"], 3), dtype=np.float32)
+            return points, np.zeros(0, dtype=np.int8) if self.kind == "hand" else None
+        count = self.index[i]["count"]
+        points = np.array(self.landmarks[i, :count])
+        return points, np.array(self.index[i]["handedness"][:count]) if self.kind == "hand" else None
+
+    def pipeline_stats(self):
+        return None
+
+    def release(self):
+        self.index = self.landmarks = self.frames = None
+
+def _parse_size(text):
+    width, height = text.lower().split("x")
+    return int(width), int(height)
+
+def camera_from_env(kind, make_camera):
+    """
+    Cria a câmera de um jogo levando em conta as variáveis de ambiente:
+      VISION_GAMES_REPLAY=<dir>          reproduz uma gravação em vez de abrir a webcam
+      VISION_GAMES_REPLAY_SPEED=max      reproduz o mais rápido possível (padrão: original)
+      VISION_GAMES_RECORD=<dir>          grava a sessão da webcam nesse diretório
+      VISION_GAMES_RECORD_FRAMES=160x120 também grava frames reduzidos
+    """
+    replay_path = os.environ.get("VISION_GAMES_REPLAY")
+    if replay_path:
+        return ReplayCamera(replay_path, speed=os.environ.get("VISION_GAMES_REPLAY_SPEED", "original"))
+
+    camera = make_camera()
+    record_path = os.environ.get("VISION_GAMES_RECORD")
+    if record_path:
+        frames = os.environ.get("VISION_GAMES_RECORD_FRAMES")
+        camera.attach_recorder(SessionRecorder(record_path, kind, frame_size=_parse_size(frames) if frames else None))
+    return camera
@@ -0,0 +1,187 @@
+"""
+Sorteios de spawn dos jogos num RNG próprio e com semente.
+
+Antes cada spawn usava o `random` global: o Esquiva Facial remontava as listas
+de caminhos/pesos e chamava random.choices a cada obstáculo, e o Fruit Ninja
+somava as durações dos estágios a cada segundo. Aqui:
+
+- SpawnScheduler tem um random.Random privado, semeado pela gravação/replay da
+  sessão, por VISION_GAMES_SEED (testes de carga e benchmarks reproduzíveis) ou,
+  sem nenhum dos dois, pelo sistema. Nada mais no processo mexe na sequência;
+- AliasTable (método de Vose) é montada uma vez por lista de (item, peso) e
+  sorteia em O(1) com um único random(), qualquer que seja o número de itens;
+- StageSchedule guarda os fins acumulados dos estágios de dificuldade e acha o
+  estágio de um instante por bissecção;
+- timeline() gera de uma vez, em arrays NumPy, todos os lançamentos de uma
+  partida do Fruit Ninja (instante, estágio, imagem/bomba, posição e velocidade).
+  Usa um Generator do NumPy com a mesma semente: é reproduzível, mas não é a
+  mesma sequência dos sorteios feitos spawn a spawn durante o jogo.
+"""
+import bisect
+import os
+import random
+
+import numpy as np
+
+class AliasTable:
+    """Sorteio ponderado em O(1) (alias de Vose) sobre `items` com pesos `weights`."""
+
+    def __init__(self, items, weights):
+        items, weights = list(items), [float(w) for w in weights]
+        total = sum(weights)
+        if not items or len(items) != len(weights) or total <= 0 or min(weights) < 0:
+            raise ValueError("AliasTable precisa de itens com pesos não negativos e soma positiva.")
+        n = len(items)
+        scaled = [w * n / total for w in weights]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # O que sobrar (só por arredondamento) fica com probabilidade 1
+
+        self.items = items
+        self.weights = weights
+        self.prob = prob
+        self.alias = alias
+        self._prob_array = np.array(prob)
+        self._alias_array = np.array(alias, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.items)
+
+    def sample_index(self, rng):
+        # Parte inteira escolhe a coluna, parte fracionária decide entre ela e o alias
+        u = rng.random() * len(self.items)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+    def sample(self, rng):
+        return self.items[self.sample_index(rng)]
+
+    def sample_indices(self, generator, count):
+        """`count` índices de uma vez com um np.random.Generator."""
+        u = generator.random(count) * len(self.items)
+        i = u.astype(np.int64)
+        return np.where(u - i < self._prob_array[i], i, self._alias_array[i])
+
+class StageSchedule:
+    """
+    Estágios de dificuldade com `duration` em segundos; o último vale até o fim da
+    partida. stage_at(t) dá o mesmo estágio que avançar um por vez quando o tempo
+    passa da soma das durações até o estágio atual.
+    """
+
+    def __init__(self, stages):
+        self.stages = stages
+        self.ends = []
+        elapsed = 0
+        for stage in stages[:-1]:
+            elapsed += stage["duration"]
+            self.ends.append(elapsed)
+
+    def stage_at(self, seconds):
+        return bisect.bisect_right(self.ends, seconds)
+
+    def settings_at(self, seconds):
+        return self.stages[self.stage_at(seconds)]
+
+def seed_from_env():
+    """Semente fixa de VISION_GAMES_SEED (ou None)."""
+    value = os.environ.get("VISION_GAMES_SEED")
+    return int(value) if value else None
+
+class SpawnScheduler:
+    """
+    RNG e tabelas de sorteio de um jogo. `rng` tem a interface de random.Random
+    (random, randint, uniform, choice) e é o que as entidades recebem em reset().
+    """
+
+    def __init__(self, seed=None):
+        self.rng = random.Random()
+        self._tables = {}
+        self._schedules = {}
+        self.seed(seed)
+
+    def seed(self, seed=None):
+        """Reinicia a sequência; sem `seed`, usa VISION_GAMES_SEED ou uma do sistema. Retorna a semente."""
+        if seed is None:
+            seed = seed_from_env()
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**31)
+        self.current_seed = seed
+        self.rng.seed(seed)
+        return seed
+
+    def table(self, specs):
+        """AliasTable de uma lista de (item, peso), montada na primeira vez que é pedida."""
+        key = tuple(specs)
+        table = self._tables.get(key)
+        if table is None:
+            table = self._tables[key] = AliasTable([s[0] for s in specs], [s[1] for s in specs])
+        return table
+
+    def uniform_table(self, items):
+        return self.table([(item, 1) for item in items])
+
+    def stages(self, stages):
+        """StageSchedule de uma lista de estágios (a mesma lista devolve o mesmo objeto)."""
+        schedule = self._schedules.get(id(stages))
+        if schedule is None or schedule.stages is not stages:
+            schedule = self._schedules[id(stages)] = StageSchedule(stages)
+        return schedule
+
+    def pick(self, table):
+        return table.sample(self.rng)
+
+    def chance(self, probability):
+        return self.rng.random() < probability
+
+    def timeline(self, schedule, duration, table, x_range=(100, 700), vx_range=(-1.5, 1.5)):
+        """
+        Todos os lançamentos de `duration` segundos de partida, em arrays NumPy.
+
+        Segue os timers do Fruit Ninja: no estágio que começa em `início`, o timer
+        de spawn (`spawn_rate` ms) dispara em início + k*spawn_rate, e a troca de
+        estágio reinicia o timer. Cada disparo lança `burst` objetos (padrão 1).
+        `x_range`/`vx_range` e `min_vy`/`max_vy` são os sorteios do FallingObject.
+
+        Retorna {"t": segundos, "stage", "item": índice em `table.items` (-1 = bomba),
+        "is_bomb", "x", "vx", "vy"}, ordenados por instante.
+        """
+        stages = schedule.stages
+        starts = [0] + schedule.ends
+        limit = int(round(duration * 1000))
+        times, stage_ids = [], []
+        for index, stage in enumerate(stages):
+            start = starts[index] * 1000
+            end = min(schedule.ends[index] * 1000 if index < len(schedule.ends) else limit, limit)
+            if start >= limit:
+                break
+            fired = np.arange(start + stage["spawn_rate"], end, stage["spawn_rate"], dtype=np.int64)
+            fired = np.repeat(fired, stage.get("burst", 1))
+            times.append(fired)
+            stage_ids.append(np.full(len(fired), index, dtype=np.int64))
+        t_ms = np.concatenate(times) if times else np.zeros(0, dtype=np.int64)
+        stage = np.concatenate(stage_ids) if stage_ids else np.zeros(0, dtype=np.int64)
+
+        count = len(t_ms)
+        generator = np.random.default_rng(self.current_seed)
+        bomb_chance = np.array([s.get("bomb_chance", 0.0) for s in stages])[stage]
+        min_vy = np.array([s["min_vy"] for s in stages], dtype=np.float64)[stage]
+        max_vy = np.array([s["max_vy"] for s in stages], dtype=np.float64)[stage]
+        is_bomb = generator.random(count) < bomb_chance
+        item = np.where(is_bomb, -1, table.sample_indices(generator, count))
+        return {
+            "t": t_ms / 1000.0,
+            "stage": stage,
+            "item": item,
+            "is_bomb": is_bomb,
+            "x": generator.integers(x_range[0], x_range[1] + 1, count),
+            "vx": generator.uniform(vx_range[0], vx_range[1], count),
+            "vy": min_vy + (max_vy - min_vy) * generator.random(count),
+        }
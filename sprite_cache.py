@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QPixmap
+
+class SpriteCache:
+    """
+    Cache de sprites já decodificados e redimensionados, compartilhado pelo processo.
+
+    A chave é (caminho, largura, altura, modo de proporção, modo de transformação).
+    Quando a memória dos sprites passa de `max_bytes`, os menos usados são
+    descartados (LRU). Os PNGs originais (alguns com dezenas de MB decodificados)
+    só ficam em memória durante o `preload`.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._sources = {}            # caminho -> QPixmap original (apenas durante o preload)
+        self._scaled = OrderedDict()  # chave -> QPixmap redimensionado (ordem = uso)
+        self.hits = 0
+        self.misses = 0
+        self.decodes = 0
+        self.evictions = 0
+        self.bytes = 0
+        self.source_bytes = 0  # total decodificado do disco (acumulado)
+
+    @staticmethod
+    def _pixmap_bytes(pixmap):
+        if pixmap.isNull():
+            return 0
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def _source(self, path):
+        source = self._sources.get(path)
+        if source is None:
+            source = QPixmap(path)
+            self.decodes += 1
+            self.source_bytes += self._pixmap_bytes(source)
+            if source.isNull():
+                print(f"Erro ao carregar sprite '{path}'")
+        return source
+
+    def get(self, path, width, height, aspect_mode=Qt.IgnoreAspectRatio, transform_mode=Qt.FastTransformation):
+        """Retorna o sprite redimensionado; só decodifica/redimensiona no primeiro pedido."""
+        key = (path, width, height, aspect_mode, transform_mode)
+        pixmap = self._scaled.get(key)
+        if pixmap is not None:
+            self.hits += 1
+            self._scaled.move_to_end(key)
+            return pixmap
+
+        self.misses += 1
+        source = self._source(path)
+        pixmap = source if source.isNull() else source.scaled(width, height, aspect_mode, transform_mode)
+        self._scaled[key] = pixmap
+        self.bytes += self._pixmap_bytes(pixmap)
+        self._evict()
+        return pixmap
+
+    def _evict(self):
+        # Nunca descarta o sprite que acabou de entrar (o último da fila)
+        while self.bytes > self.max_bytes and len(self._scaled) > 1:
+            _key, pixmap = self._scaled.popitem(last=False)
+            self.bytes -= self._pixmap_bytes(pixmap)
+            self.evictions += 1
+
+    def preload(self, paths, sizes, aspect_mode=Qt.IgnoreAspectRatio, transform_mode=Qt.FastTransformation):
+        """Decodifica e redimensiona antecipadamente cada caminho em cada tamanho (largura, altura)."""
+        sizes = list(sizes)
+        for path in paths:
+            if all((path, w, h, aspect_mode, transform_mode) in self._scaled for w, h in sizes):
+                continue
+            # Decodifica o PNG uma única vez para todos os tamanhos
+            self._sources[path] = self._source(path)
+            try:
+                for width, height in sizes:
+                    self.get(path, width, height, aspect_mode, transform_mode)
+            finally:
+                del self._sources[path]
+
+    def clear(self):
+        self._scaled.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "decodes": self.decodes,
+            "evictions": self.evictions,
+            "entries": len(self._scaled),
+            "bytes": self.bytes,
+            "decoded_bytes": self.source_bytes,
+        }
+
+# Instância única usada por game_objects e game_objects_face
+sprite_cache = SpriteCache()
+
+def get_sprite(path, width, height, aspect_mode=Qt.IgnoreAspectRatio, transform_mode=Qt.FastTransformation):
+    return sprite_cache.get(path, width, height, aspect_mode, transform_mode)
@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from collision import group_pairs, overlap_pairs
+
+def random_boxes(rng, count, max_size=80.0, extent=600.0):
+    corner = rng.uniform(0, extent, (count, 2))
+    size = rng.uniform(1.0, max_size, (count, 1))
+    return np.hstack((corner, corner + size))
+
+@pytest.mark.parametrize("n,m", [(1, 1), (3, 50), (50, 3), (64, 64), (200, 300)])
+def test_grid_matches_dense(n, m):
+    rng = np.random.default_rng(n * 1000 + m)
+    a = random_boxes(rng, n)
+    b = random_boxes(rng, m, max_size=200.0)
+    dense_i, dense_j = overlap_pairs(a, b, use_grid=False)
+    grid_i, grid_j = overlap_pairs(a, b, use_grid=True)
+    assert len(dense_i) > 0 or n == 1
+    np.testing.assert_array_equal(grid_i, dense_i)
+    np.testing.assert_array_equal(grid_j, dense_j)
+
+def test_grid_matches_dense_on_shared_edges():
+    # Caixas numa grade exata: bordas encostadas não colidem (como QRectF.intersects)
+    corners = np.array([(x, y) for x in range(0, 500, 50) for y in range(0, 500, 50)], dtype=np.float64)
+    a = np.hstack((corners, corners + 50))
+    b = np.hstack((corners + 25, corners + 75))
+    dense = overlap_pairs(a, b, use_grid=False)
+    grid = overlap_pairs(a, b, use_grid=True)
+    for dense_part, grid_part in zip(dense, grid):
+        np.testing.assert_array_equal(grid_part, dense_part)
+    assert not overlap_pairs(a[:1], a[1:2], use_grid=False)[0].size
+
+def test_empty_inputs():
+    empty = np.empty((0, 4))
+    boxes = np.array([[0.0, 0.0, 10.0, 10.0]])
+    for use_grid in (False, True):
+        assert overlap_pairs(empty, boxes, use_grid=use_grid)[0].size == 0
+        assert overlap_pairs(boxes, empty, use_grid=use_grid)[0].size == 0
+
+def test_group_pairs():
+    assert group_pairs(np.array([0, 0, 2]), np.array([1, 3, 0])) == [(0, [1, 3]), (2, [0])]
+    assert group_pairs(np.array([], dtype=int), np.array([], dtype=int)) == []
@@ -0,0 +1,83 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from face_tracker import FaceTracker, hungarian
+
+FRAME_DT = 1 / 30
+
+def brute_force_cost(cost):
+    n, m = cost.shape
+    if n <= m:
+        return min(sum(cost[i, cols[i]] for i in range(n)) for cols in itertools.permutations(range(m), n))
+    return min(sum(cost[rows[j], j] for j in range(m)) for rows in itertools.permutations(range(n), m))
+
+@pytest.mark.parametrize("n,m", [(n, m) for n in range(1, 7) for m in range(1, 7)])
+def test_hungarian_matches_brute_force(n, m):
+    rng = np.random.default_rng(n * 10 + m)
+    for _ in range(10):
+        cost = rng.random((n, m))
+        rows, cols = hungarian(cost)
+        assert len(rows) == len(cols) == min(n, m)
+        assert list(rows) == sorted(set(rows.tolist()))
+        assert len(set(cols.tolist())) == len(cols)
+        assert cost[rows, cols].sum() == pytest.approx(brute_force_cost(cost))
+
+def test_hungarian_empty():
+    rows, cols = hungarian(np.zeros((0, 3)))
+    assert len(rows) == len(cols) == 0
+
+def test_crossing_faces_keep_their_ids():
+    tracker = FaceTracker(num_slots=2)
+    for frame in range(61):
+        now = frame * FRAME_DT
+        # P1 vai da esquerda para a direita e P2 ao contrário, cruzando no meio
+        p1 = (0.25 + 0.5 * frame / 60, 0.50)
+        p2 = (0.75 - 0.5 * frame / 60, 0.53)
+        # O detector não garante ordem: alterna a ordem dos rostos a cada frame
+        if frame % 2:
+            assert tracker.update([p2, p1], now).tolist() == [2, 1]
+        else:
+            assert tracker.update([p1, p2], now).tolist() == [1, 2]
+
+def test_short_dropout_keeps_the_id():
+    tracker = FaceTracker(num_slots=2, max_missed_s=0.5)
+    now = 0.0
+    for _ in range(10):
+        tracker.update([(0.25, 0.5), (0.75, 0.5)], now)
+        now += FRAME_DT
+    # P2 some por 0.3 s: continua presente pela tolerância
+    for _ in range(9):
+        assert tracker.update([(0.25, 0.5)], now).tolist() == [1]
+        assert tracker.present(2, now)
+        now += FRAME_DT
+    assert tracker.missing(now) == []
+    assert tracker.update([(0.74, 0.5), (0.25, 0.5)], now).tolist() == [2, 1]
+
+def test_long_dropout_frees_the_slot():
+    tracker = FaceTracker(num_slots=2, max_missed_s=0.5)
+    tracker.update([(0.25, 0.5), (0.75, 0.5)], 0.0)
+    tracker.update([(0.25, 0.5)], 0.6)
+    assert tracker.missing(0.6) == [2]
+
+def test_extra_face_gets_no_id():
+    tracker = FaceTracker(num_slots=2)
+    tracker.update([(0.25, 0.5), (0.75, 0.5)], 0.0)
+    ids = tracker.update([(0.25, 0.5), (0.5, 0.9), (0.75, 0.5)], FRAME_DT)
+    assert ids.tolist() == [1, 0, 2]
+
+def test_repeated_frame_changes_nothing():
+    tracker = FaceTracker(num_slots=2)
+    for frame in range(5):
+        tracker.update([(0.25 + 0.01 * frame, 0.5), (0.75 - 0.01 * frame, 0.5)], frame * FRAME_DT)
+    velocities = tracker.velocities.copy()
+    positions = tracker.positions.copy()
+    now = 4 * FRAME_DT
+    # O jogo leu o mesmo pacote em mais dois ticks: mesmo frame, mesmo horário de captura
+    for _ in range(2):
+        assert tracker.update([(0.29, 0.5), (0.71, 0.5)], now).tolist() == [1, 2]
+    np.testing.assert_array_equal(tracker.velocities, velocities)
+    np.testing.assert_array_equal(tracker.positions, positions)
+    assert tracker.update([(0.30, 0.5), (0.70, 0.5)], 5 * FRAME_DT).tolist() == [1, 2]
+    assert tracker.velocities[0, 0] > 0 > tracker.velocities[1, 0]
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from game_logic import LOTE_MINIMO, classificar_gestos, detectar_gesto
+from landmarks import array_to_landmark_lists
+
+def random_hands(rng, count):
+    points = rng.uniform(0.0, 1.0, (count, 21, 3)).astype(np.float32)
+    # Parte das mãos com os dedos fechados, para cair em Pedra/Joinha
+    points[::3, [8, 12, 16, 20], 1] = points[::3, [6, 10, 14, 18], 1] + 0.05
+    points[::6, 4, :2] = points[::6, 8, :2] + 0.01  # polegar colado no indicador: Pedra
+    return points
+
+@pytest.mark.parametrize("count", [1, 2, LOTE_MINIMO - 1, LOTE_MINIMO, 300])
+def test_both_paths_match_detectar_gesto(count):
+    points = random_hands(np.random.default_rng(count), count)
+    expected = [detectar_gesto(hand) for hand in array_to_landmark_lists(points)]
+    assert classificar_gestos(points) == expected
+
+def test_same_hands_same_gestures_in_any_batch_size():
+    points = random_hands(np.random.default_rng(7), 40)
+    batched = classificar_gestos(points)
+    assert batched == [gesture for i in range(0, 40, 2) for gesture in classificar_gestos(points[i:i + 2])]
+    assert set(batched) == {None, "Joinha", "Pedra", "Tesoura", "Papel"}
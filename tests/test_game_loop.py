@@ -0,0 +1,57 @@
+from game_loop import SimulationTimer
+
+class StepLoop:
+    """Só a lista de timers do FixedStepLoop: os testes avançam os passos à mão."""
+
+    dt = 1.0 / 60
+
+    def __init__(self):
+        self.timers = []
+
+    def run(self, steps):
+        for _ in range(steps):
+            for timer in self.timers:
+                timer.advance(self.dt)
+
+def test_fires_once_per_interval_of_steps():
+    loop = StepLoop()
+    fired = []
+    timer = SimulationTimer(loop, lambda: fired.append(len(fired)))
+    timer.start(1000)
+    loop.run(59)
+    assert fired == []
+    loop.run(1)
+    assert len(fired) == 1
+    loop.run(600)
+    assert len(fired) == 11
+
+def test_single_shot_stops_after_firing():
+    loop = StepLoop()
+    fired = []
+    timer = SimulationTimer(loop, lambda: fired.append(True), single_shot=True)
+    timer.start(500)
+    loop.run(120)
+    assert fired == [True]
+    assert not timer.isActive()
+
+def test_set_interval_restarts_the_count():
+    loop = StepLoop()
+    fired = []
+    timer = SimulationTimer(loop, lambda: fired.append(True))
+    timer.start(1000)
+    loop.run(50)
+    timer.setInterval(500)
+    assert timer.interval() == 500
+    loop.run(29)
+    assert fired == []
+    loop.run(1)
+    assert fired == [True]
+
+def test_stopped_timer_does_not_fire():
+    loop = StepLoop()
+    fired = []
+    timer = SimulationTimer(loop, lambda: fired.append(True))
+    timer.start(100)
+    timer.stop()
+    loop.run(60)
+    assert fired == []